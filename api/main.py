@@ -1,6 +1,9 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import sys
@@ -9,18 +12,107 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from utils.config import SCREENSHOT_DIR
-from api.routers import test, pages
+from utils.config import (
+    ARTIFACT_DIR,
+    HEADLESS,
+    BROWSER_POOL_ENABLED,
+    BROWSER_POOL_SIZE,
+    BROWSER_POOL_MAX_CONTEXTS,
+    BROWSER_POOL_HEALTH_INTERVAL,
+    HISTORY_ENABLED,
+    RUN_CONCURRENCY,
+    RUN_QUEUE_MAX,
+    RUN_DEADLINE,
+    TEAMS_DIGEST_ENABLED,
+)
+from utils.artifacts import artifact_store
+from utils.browser_pool import BrowserPool
+from utils.run_history import run_history
+from utils import metrics
+from utils.screencast import screencast_hub
+from utils.teams_notifier import teams_digest
+from utils.teams_outbox import teams_outbox
+from api.runs import RunManager
+from api.routers import history, test, pages
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("perso-auto-tester")
 
+
+async def _browser_pool_health_loop(pool: BrowserPool):
+    """주기적으로 브라우저 풀 헬스 체크"""
+    while True:
+        await asyncio.sleep(BROWSER_POOL_HEALTH_INTERVAL)
+        try:
+            await pool.check_health()
+        except Exception as e:
+            logger.error(f"Browser pool health check failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 브라우저 풀/run 워커/Teams 알림 전송기/run 기록기 실행, 종료 시 정리"""
+    app.state.browser_pool = None
+    health_task = None
+
+    # Teams 알림 outbox 전송기 (재시작 전에 못 보낸 알림부터 전송)
+    await teams_outbox.start()
+    if TEAMS_DIGEST_ENABLED:
+        await teams_digest.start()
+
+    # run 기록 저장소 (SQLite, 일괄 기록)
+    if HISTORY_ENABLED:
+        try:
+            await run_history.start()
+        except Exception as e:
+            logger.error(f"Run history start failed: {e}")
+
+    if BROWSER_POOL_ENABLED:
+        pool = BrowserPool(
+            size=BROWSER_POOL_SIZE,
+            max_contexts=BROWSER_POOL_MAX_CONTEXTS,
+            headless=HEADLESS,
+        )
+        try:
+            await pool.start()
+            app.state.browser_pool = pool
+            health_task = asyncio.create_task(_browser_pool_health_loop(pool))
+        except Exception as e:
+            # 풀 없이도 테스트는 동작 (테스트마다 브라우저 실행)
+            logger.error(f"Browser pool start failed: {e}")
+            await pool.stop()
+
+    # run 작업 큐 (동시 실행 수 제한)
+    run_manager = RunManager(
+        concurrency=RUN_CONCURRENCY,
+        max_queue=RUN_QUEUE_MAX,
+        browser_pool=app.state.browser_pool,
+        deadline=RUN_DEADLINE or None,
+    )
+    await run_manager.start()
+    app.state.run_manager = run_manager
+
+    yield
+
+    await run_manager.stop()
+    if HISTORY_ENABLED:
+        await run_history.stop()
+    if TEAMS_DIGEST_ENABLED:
+        await teams_digest.stop()
+    await teams_outbox.stop()
+    if health_task:
+        health_task.cancel()
+    if app.state.browser_pool:
+        await app.state.browser_pool.stop()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="PERSO Auto Tester",
     description="🤖 PERSO AI 자동화 테스트",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -32,22 +124,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 스크린샷 디렉토리를 정적 파일로 서빙
-app.mount("/screenshots", StaticFiles(directory=str(SCREENSHOT_DIR)), name="screenshots")
+class ArtifactFiles(StaticFiles):
+    """아티팩트 정적 파일 서빙 (조회 시 run의 사용 시각 갱신 -> LRU 정리 기준)"""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200 and "/" in path:
+            artifact_store.touch(path.split("/", 1)[0])
+        return response
+
+
+# 아티팩트 디렉토리(run ID별 스크린샷/trace/로그)를 정적 파일로 서빙
+app.mount("/screenshots", ArtifactFiles(directory=str(ARTIFACT_DIR)), name="screenshots")
 
 # 헬스 체크
 @app.get("/health")
 def health_check():
     """헬스 체크 엔드포인트"""
     logger.info("Health check called")
+    pool = getattr(app.state, "browser_pool", None)
+    run_manager = getattr(app.state, "run_manager", None)
     return {
         "status": "ok",
         "service": "PERSO Auto Tester",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "browser_pool": pool.stats() if pool else None,
+        "runs": run_manager.stats() if run_manager else None,
+        "artifacts": artifact_store.stats(),
+        "teams_outbox": teams_outbox.stats(),
+        "screencast": screencast_hub.stats(),
+        "history": run_history.stats() if HISTORY_ENABLED else None,
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus 메트릭 (단계/구간 소요 시간, run/실패/재시도 수, 대기열, 브라우저)"""
+    run_manager = getattr(app.state, "run_manager", None)
+    if run_manager:
+        queue = run_manager.stats()
+        metrics.queue_depth.set(queue["queued"])
+        metrics.runs_running.set(queue["running"])
+    pool = getattr(app.state, "browser_pool", None)
+    if pool:
+        browsers = pool.stats()["browsers"]
+        metrics.browsers_active.set(sum(1 for b in browsers if b["alive"]))
+        metrics.browser_contexts_active.set(sum(b["active"] for b in browsers))
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 # 라우터 등록
 app.include_router(pages.router, tags=["pages"])
 app.include_router(test.router, prefix="/test", tags=["test"])
+app.include_router(history.router, prefix="/history", tags=["history"])
 
 logger.info("PERSO Auto Tester API initialized")
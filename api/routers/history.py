@@ -0,0 +1,85 @@
+"""
+api/routers/history.py
+
+run 기록 조회 라우터 (utils.run_history, SQLite).
+
+엔드포인트 (공통 쿼리: hours=조회 기간(시간, 기본 168 = 7일), test_type=테스트 종류):
+- GET /history/runs: 최근 run 목록 (status, limit 필터, 단계/아티팩트/페이지 성능 포함)
+- GET /history/steps: 단계별 소요 시간 p50/p95/p99 (통과한 단계만)
+- GET /history/vitals: 측정 지점별 PERSO 페이지 성능 p50/p95 (LCP, CLS, TTFB 등)
+- GET /history/failure-rate: 테스트 종류별 실패율 (취소 제외)
+- GET /history/slowest: 가장 오래 걸린 run
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from utils.config import HISTORY_ENABLED
+from utils.run_history import run_history
+
+router = APIRouter()
+
+DEFAULT_HOURS = 24 * 7
+
+
+def _check_enabled() -> None:
+    if not HISTORY_ENABLED:
+        raise HTTPException(status_code=404, detail="run 기록이 꺼져 있습니다 (HISTORY_ENABLED)")
+
+
+@router.get("/runs")
+async def list_history_runs(
+    hours: float = Query(DEFAULT_HOURS, gt=0),
+    test_type: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    """최근 run 목록"""
+    _check_enabled()
+    runs = await run_history.recent_runs(hours, test_type=test_type, status=status, limit=limit)
+    return {"hours": hours, "runs": runs}
+
+
+@router.get("/steps")
+async def step_percentiles(
+    hours: float = Query(DEFAULT_HOURS, gt=0),
+    test_type: Optional[str] = None,
+):
+    """단계별 소요 시간 백분위수 (초)"""
+    _check_enabled()
+    steps = await run_history.step_percentiles(hours, test_type=test_type)
+    return {"hours": hours, "steps": steps}
+
+
+@router.get("/vitals")
+async def vitals_percentiles(
+    hours: float = Query(DEFAULT_HOURS, gt=0),
+    test_type: Optional[str] = None,
+):
+    """측정 지점별 페이지 성능 백분위수 (ms, CLS는 점수, JS 힙은 MB)"""
+    _check_enabled()
+    vitals = await run_history.vitals_percentiles(hours, test_type=test_type)
+    return {"hours": hours, "vitals": vitals}
+
+
+@router.get("/failure-rate")
+async def failure_rates(
+    hours: float = Query(DEFAULT_HOURS, gt=0),
+    test_type: Optional[str] = None,
+):
+    """테스트 종류별 실패율"""
+    _check_enabled()
+    rates = await run_history.failure_rates(hours, test_type=test_type)
+    return {"hours": hours, "test_types": rates}
+
+
+@router.get("/slowest")
+async def slowest_runs(
+    hours: float = Query(DEFAULT_HOURS, gt=0),
+    test_type: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """가장 오래 걸린 run"""
+    _check_enabled()
+    runs = await run_history.slowest_runs(hours, test_type=test_type, limit=limit)
+    return {"hours": hours, "runs": runs}
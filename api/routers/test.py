@@ -1,21 +1,31 @@
 """
 api/routers/test.py
 
-테스트 실행 WebSocket 라우터.
-클라이언트와 WebSocket 연결을 맺고, 테스트(로그인/업로드/번역)를 실행하면서
-실시간으로 로그를 스트리밍하고 결과를 반환합니다.
-
-엔드포인트: /test/ws/{test_type}
-- test_type: "login" | "upload" | "translate"
+테스트 실행 라우터.
+테스트(로그인/업로드/번역)는 run 작업 큐(api.runs.RunManager)에서 실행되고,
+WebSocket은 run의 로그/상태/결과 이벤트를 구독만 합니다.
+
+엔드포인트:
+- POST /test/runs: run 추가 (body: {"test_type": ..., "priority": 0})
+- GET /test/runs, GET /test/runs/{run_id}: run 조회
+- DELETE /test/runs/{run_id}: run 취소
+- GET /test/runs/{run_id}/artifacts: run 아티팩트 목록 (/screenshots/{path}로 조회)
+- WS /test/runs/{run_id}/ws: run 이벤트 구독
+- WS /test/ws/{test_type}: run 추가 + 구독 (기존 UI 호환, 연결이 끊기면 run 취소)
+  - test_type: "login" | "upload" | "translate"
+
+WebSocket 클라이언트 메시지:
+- {"type": "cancel"}: run 취소
+- {"type": "screencast", "enabled": true|false}: 라이브 보기 시작/중지 (SCREENCAST_ENABLED)
+  - 서버는 {"type": "screencast", "status": "started"|"stopped"|"unavailable"}와
+    {"type": "frame", "data": <base64 JPEG>} 프레임을 보냄
 """
-import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
-from functools import partial
-from typing import Callable, List
+import json
+import logging
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel
 from pathlib import Path
 import sys
 
@@ -23,97 +33,174 @@ import sys
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from tasks.test_login import test_login_sync
-from tasks.test_upload import test_upload_sync
-from tasks.test_translate import test_translate_sync
-from utils.teams_notifier import send_teams_notification
+from api.runs import QueueFullError, Run, Subscription
+from utils.artifacts import artifact_store
+from utils.config import SCREENCAST_ENABLED
+from utils.screencast import screencast_hub
 
 logger = logging.getLogger("perso-auto-tester")
 router = APIRouter()
 
 
-def _run_test(
-    test_func: Callable,
-    log_callback: Callable,
-    log_collector: List[str],
-) -> dict:
-    """테스트 함수 실행 wrapper (log_collector 전달용)"""
-    return test_func(log_callback=log_callback, log_collector=log_collector)
+class RunRequest(BaseModel):
+    """run 추가 요청"""
+
+    test_type: str
+    priority: int = 0
 
-@router.websocket("/ws/{test_type}")
-async def websocket_test(websocket: WebSocket, test_type: str):
-    """WebSocket으로 테스트 실행 및 로그 스트리밍"""
-    await websocket.accept()
-    logger.info(f"WebSocket connected: {test_type}")
 
-    # 테스트 함수 매핑
-    test_functions = {
-        "login": test_login_sync,
-        "upload": test_upload_sync,
-        "translate": test_translate_sync,
+@router.post("/runs", status_code=202)
+async def create_run(body: RunRequest, request: Request):
+    """run을 대기열에 추가"""
+    manager = request.app.state.run_manager
+    try:
+        run = manager.submit(body.test_type, priority=body.priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {**run.to_dict(), "queue": manager.stats()}
+
+
+@router.get("/runs")
+async def list_runs(request: Request):
+    """run 목록 조회 (최근 순)"""
+    manager = request.app.state.run_manager
+    return {
+        "runs": [run.to_dict() for run in reversed(manager.list())],
+        "queue": manager.stats(),
     }
 
-    if test_type not in test_functions:
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: str, request: Request):
+    """run 조회"""
+    run = request.app.state.run_manager.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="run을 찾을 수 없습니다")
+    return run.to_dict()
+
+
+@router.delete("/runs/{run_id}")
+async def cancel_run(run_id: str, request: Request):
+    """run 취소 (대기 중이면 바로, 실행 중이면 다음 안전 지점에서 중단)"""
+    run = request.app.state.run_manager.cancel(run_id, "취소 요청 (API)")
+    if run is None:
+        raise HTTPException(status_code=404, detail="run을 찾을 수 없습니다")
+    return run.to_dict()
+
+
+@router.get("/runs/{run_id}/artifacts")
+async def get_run_artifacts(run_id: str):
+    """run 아티팩트 목록 (스크린샷/trace/로그)"""
+    entry = artifact_store.get(run_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="아티팩트를 찾을 수 없습니다")
+    artifact_store.touch(run_id)
+    return entry.to_dict()
+
+
+def _set_screencast(run: Run, subscription: Subscription, enabled: bool) -> None:
+    """이 구독의 라이브 보기 시작/중지"""
+    viewer_id = id(subscription)
+    if not enabled or run.finished:
+        screencast_hub.remove_viewer(run.run_id, viewer_id)
+        subscription.put({"type": "screencast", "status": "stopped"})
+    elif SCREENCAST_ENABLED and screencast_hub.add_viewer(run.run_id, viewer_id, subscription.put_frame):
+        subscription.put({"type": "screencast", "status": "started"})
+    else:
+        subscription.put({"type": "screencast", "status": "unavailable"})
+
+
+async def _receive_until_disconnect(websocket: WebSocket, manager, run: Run,
+                                    subscription: Subscription):
+    """클라이언트 메시지 처리 (cancel/screencast), 연결이 끊기면 반환"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        try:
+            data = json.loads(message.get("text") or "{}")
+        except ValueError:
+            continue
+        if not isinstance(data, dict):
+            continue
+        if data.get("type") == "cancel":
+            manager.cancel(run.run_id, "취소 요청 (WebSocket)")
+        elif data.get("type") == "screencast":
+            _set_screencast(run, subscription, bool(data.get("enabled")))
+
+
+async def _stream_run(websocket: WebSocket, run: Run):
+    """run 이벤트를 WebSocket으로 전달 (result 이벤트 후 종료)
+
+    로그는 묶어서 "log_batch" 프레임으로 보냅니다 (api.runs.Subscription).
+    연결이 끊겼을 때 run.cancel_on_disconnect이고 남은 구독자가 없으면 run을 취소합니다.
+    """
+    manager = websocket.app.state.run_manager
+    subscription = run.subscribe()
+    receiver = asyncio.create_task(_receive_until_disconnect(websocket, manager, run, subscription))
+    try:
+        finished = False
+        while not finished:
+            getter = asyncio.create_task(subscription.next_frames())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                raise WebSocketDisconnect()
+            # 전송이 느리면 그동안 쌓인 로그는 Subscription 버퍼 한도에서 정리됨
+            for frame in getter.result():
+                await websocket.send_json(frame)
+                finished = finished or frame["type"] == "result"
+    finally:
+        receiver.cancel()
+        screencast_hub.remove_viewer(run.run_id, id(subscription))
+        run.unsubscribe(subscription)
+        if run.cancel_on_disconnect and not run.finished and run.subscriber_count == 0:
+            manager.cancel(run.run_id, "클라이언트 연결 끊김")
+
+
+@router.websocket("/runs/{run_id}/ws")
+async def websocket_run(websocket: WebSocket, run_id: str):
+    """WebSocket으로 run 이벤트 구독"""
+    await websocket.accept()
+
+    run = websocket.app.state.run_manager.get(run_id)
+    if run is None:
         await websocket.send_json({
             "type": "result",
             "success": False,
-            "message": "지원하지 않는 테스트 타입입니다"
+            "message": "run을 찾을 수 없습니다"
         })
         return
 
     try:
-        # 로그 전송 함수
-        async def send_log(msg: str):
-            try:
-                await websocket.send_json({"type": "log", "message": msg})
-            except Exception:
-                pass
-
-        # 로그 수집 리스트
-        log_collector: List[str] = []
-
-        # 별도 스레드에서 동기 함수 실행
-        executor = ThreadPoolExecutor(max_workers=1)
-        loop = asyncio.get_event_loop()
-
-        test_func = test_functions[test_type]
-        start_time = datetime.now()
+        await _stream_run(websocket, run)
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket disconnected: {run_id}")
+    except Exception as e:
+        logger.error(f"WebSocket error: {e}")
 
-        result = await loop.run_in_executor(
-            executor,
-            partial(_run_test, test_func, send_log, log_collector),
-        )
 
-        end_time = datetime.now()
+@router.websocket("/ws/{test_type}")
+async def websocket_test(websocket: WebSocket, test_type: str):
+    """WebSocket으로 run 추가 + 이벤트 구독"""
+    await websocket.accept()
+    logger.info(f"WebSocket connected: {test_type}")
 
-        # 결과 전송
+    try:
+        run = websocket.app.state.run_manager.submit(test_type, cancel_on_disconnect=True)
+    except (ValueError, QueueFullError) as e:
         await websocket.send_json({
             "type": "result",
-            "success": result["success"],
-            "message": result["message"],
-            "screenshot": result.get("screenshot")
+            "success": False,
+            "message": str(e) if isinstance(e, QueueFullError) else "지원하지 않는 테스트 타입입니다"
         })
+        return
 
-        # Teams 알림 전송
-        await send_teams_notification(
-            test_type=test_type,
-            success=result["success"],
-            message=result["message"],
-            start_time=start_time,
-            end_time=end_time,
-            screenshot_filename=result.get("screenshot"),
-            logs=log_collector,
-        )
-
+    try:
+        await _stream_run(websocket, run)
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        try:
-            await websocket.send_json({
-                "type": "result",
-                "success": False,
-                "message": f"테스트 실행 중 에러: {str(e)}"
-            })
-        except Exception:
-            pass
\ No newline at end of file
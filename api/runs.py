@@ -0,0 +1,516 @@
+"""
+api/runs.py
+
+테스트 실행(run) 작업 큐.
+
+테스트 실행은 WebSocket 연결과 분리된 run으로 관리됩니다.
+- POST /test/runs로 run을 대기열에 추가 (run ID 발급)
+- 동시 실행 수(RUN_CONCURRENCY)만큼의 워커가 우선순위 순서로 실행
+- 대기열이 RUN_QUEUE_MAX개를 넘으면 즉시 거절 (QueueFullError)
+- WebSocket은 run의 이벤트(log/status/result)를 구독만 함
+  - 로그는 LOG_BATCH_INTERVAL_MS마다 최대 LOG_BATCH_MAX_LINES줄씩 묶어 "log_batch"로 전송
+  - 느린 클라이언트는 LOG_SUBSCRIBER_BUFFER줄을 넘는 오래된 로그를 버림 (status/result는 유지)
+  - 워커 스레드에서 발행한 이벤트는 서버 이벤트 루프로 넘겨서 처리
+  - 라이브 보기 프레임(utils.screencast)은 구독마다 최신 1장만 보관 (느리면 이전 프레임 교체)
+- 취소 (DELETE /test/runs/{id}, 구독 연결 끊김, RUN_DEADLINE 초과): 실행 중인 테스트를
+  바로 중단하고 컨텍스트를 닫은 뒤 워커 슬롯을 반납
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from tasks.test_login import test_login_async
+from tasks.test_upload import test_upload_async
+from tasks.test_translate import test_translate_async
+from utils.artifacts import artifact_store
+from utils.metrics import run_duration, runs_total
+from utils.run_history import HistoryEntry, run_history
+from utils.cancellation import CancelToken
+from utils.config import (
+    HISTORY_ENABLED,
+    LOG_BATCH_INTERVAL_MS,
+    LOG_BATCH_MAX_LINES,
+    LOG_SUBSCRIBER_BUFFER,
+    RUN_LOG_BUFFER,
+)
+from utils.logger import RunLog
+from utils.teams_notifier import send_teams_notification
+
+logger = logging.getLogger("perso-auto-tester")
+
+# 테스트 종류 -> 테스트 함수
+TEST_FUNCTIONS = {
+    "login": test_login_async,
+    "upload": test_upload_async,
+    "translate": test_translate_async,
+}
+
+# 완료된 run을 메모리에 보관하는 개수 (오래된 것부터 삭제)
+RUN_HISTORY_LIMIT = 200
+
+# 전체 실행 로그 아티팩트 파일명 (JSON Lines, utils.logger.LogRecord)
+RUN_LOG_FILENAME = "run_log.jsonl"
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 run을 받을 수 없음"""
+
+
+# =============================================================================
+# Subscription
+# =============================================================================
+
+
+class Subscription:
+    """run 이벤트 구독 하나 (WebSocket 연결 하나)
+
+    로그는 모아서 "log_batch" 프레임으로 보내고, 전송 대기 로그가 max_pending줄을
+    넘으면 오래된 로그부터 버립니다 (버린 줄 수는 다음 프레임의 "dropped"로 전달).
+    status/result 이벤트는 버리지 않고 순서대로 전달합니다.
+
+    Args:
+        max_pending: 전송 대기 로그 최대 줄 수
+        batch_lines: 프레임 하나의 최대 줄 수 (다 차면 주기를 기다리지 않고 전송)
+    """
+
+    def __init__(self, max_pending: int = LOG_SUBSCRIBER_BUFFER,
+                 batch_lines: int = LOG_BATCH_MAX_LINES):
+        self.max_pending = max_pending
+        self.batch_lines = batch_lines
+        self.dropped = 0
+        self._events: Deque[Dict[str, Any]] = deque()
+        self._pending_logs = 0
+        self._frame: Optional[Dict[str, Any]] = None
+        self._ready = asyncio.Event()
+        self._flush = asyncio.Event()
+
+    def put(self, event: Dict[str, Any]) -> None:
+        if event["type"] == "log":
+            if self._pending_logs >= self.max_pending:
+                self._drop_oldest_log()
+            self._pending_logs += 1
+            if self._pending_logs >= self.batch_lines:
+                self._flush.set()
+        else:
+            self._flush.set()
+        self._events.append(event)
+        self._ready.set()
+
+    def put_frame(self, frame: Dict[str, Any]) -> bool:
+        """라이브 보기 프레임 (최신 프레임 하나만 유지, 이전 프레임을 버렸으면 False)"""
+        replaced = self._frame is not None
+        self._frame = frame
+        self._flush.set()
+        self._ready.set()
+        return not replaced
+
+    def _drop_oldest_log(self) -> None:
+        for i, event in enumerate(self._events):
+            if event["type"] == "log":
+                del self._events[i]
+                self._pending_logs -= 1
+                self.dropped += 1
+                return
+
+    async def next_frames(self, interval: float = LOG_BATCH_INTERVAL_MS / 1000) -> List[Dict[str, Any]]:
+        """다음에 보낼 프레임 목록
+
+        로그만 쌓여 있으면 interval초 동안(또는 batch_lines줄이 찰 때까지) 더 모은 뒤,
+        연속된 로그를 batch_lines줄씩 "log_batch" 프레임으로 묶어 반환합니다.
+        """
+        await self._ready.wait()
+        if not self._flush.is_set():
+            try:
+                await asyncio.wait_for(self._flush.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+        frames: List[Dict[str, Any]] = []
+        batch: List[str] = []
+        run_id = None
+
+        def flush_batch():
+            if batch:
+                frames.append({
+                    "type": "log_batch",
+                    "messages": list(batch),
+                    "dropped": self.dropped,
+                    "run_id": run_id,
+                })
+                batch.clear()
+                self.dropped = 0
+
+        while self._events:
+            event = self._events.popleft()
+            if event["type"] == "log":
+                self._pending_logs -= 1
+                run_id = event.get("run_id")
+                batch.append(event["message"])
+                if len(batch) >= self.batch_lines:
+                    flush_batch()
+            else:
+                flush_batch()
+                frames.append(event)
+
+        flush_batch()
+        if self._frame is not None:
+            frames.append(self._frame)
+            self._frame = None
+        self._ready.clear()
+        self._flush.clear()
+        return frames
+
+
+# =============================================================================
+# Run
+# =============================================================================
+
+
+@dataclass
+class Run:
+    """테스트 실행 하나
+
+    Attributes:
+        run_id: run ID
+        test_type: 테스트 종류 ("login" | "upload" | "translate")
+        priority: 우선순위 (클수록 먼저 실행)
+        status: "queued" | "running" | "passed" | "failed" | "cancelled"
+        cancel_on_disconnect: 구독자가 모두 끊기면 취소 (WebSocket으로 시작한 run)
+        events: 지금까지 발행된 status/result 이벤트 (새 구독자에게 먼저 전달)
+        logs: 실행 로그 (최근 RUN_LOG_BUFFER줄, 새 구독자/Teams 알림용)
+        result: 테스트 결과 (완료 후)
+    """
+
+    run_id: str
+    test_type: str
+    priority: int = 0
+    status: str = "queued"
+    cancel_on_disconnect: bool = False
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    logs: RunLog = field(default_factory=lambda: RunLog(RUN_LOG_BUFFER), repr=False)
+    result: Optional[Dict[str, Any]] = None
+    cancel_token: Optional[CancelToken] = field(default=None, repr=False)
+    _subscribers: Set[Subscription] = field(default_factory=set, repr=False)
+    _loop: Optional[asyncio.AbstractEventLoop] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        # 이벤트는 생성한 이벤트 루프(서버 루프)에서 구독자에게 전달
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("passed", "failed", "cancelled")
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """이벤트 발행 (기록 + 모든 구독자에게 전달, 어느 스레드에서든 호출 가능)"""
+        if self._loop is not None and not self._on_loop():
+            self._loop.call_soon_threadsafe(self.publish, event)
+            return
+
+        event = {**event, "run_id": self.run_id}
+        # 로그는 self.logs에 따로 보관 (create_logger의 log_collector)
+        if event["type"] != "log":
+            self.events.append(event)
+        for subscription in self._subscribers:
+            subscription.put(event)
+
+    def _on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def publish_log(self, msg: str) -> None:
+        """로그 이벤트 발행 (create_logger의 log_callback)"""
+        self.publish({"type": "log", "message": msg})
+
+    def subscribe(self) -> Subscription:
+        """구독 시작 (지금까지의 이벤트가 먼저 들어있는 구독 반환)
+
+        status 이벤트, 메모리에 남아있는 로그, result 이벤트 순서로 채웁니다.
+        """
+        subscription = Subscription()
+        results = [e for e in self.events if e["type"] == "result"]
+        for event in self.events:
+            if event["type"] != "result":
+                subscription.put(event)
+        for message in self.logs.messages():
+            subscription.put({"type": "log", "message": message, "run_id": self.run_id})
+        for event in results:
+            subscription.put(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "test_type": self.test_type,
+            "priority": self.priority,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result,
+        }
+
+
+# =============================================================================
+# RunManager
+# =============================================================================
+
+
+class RunManager:
+    """우선순위 대기열 + 고정 크기 워커 풀
+
+    Args:
+        concurrency: 동시에 실행할 run 수 (브라우저 컨텍스트 수)
+        max_queue: 대기열 최대 길이 (넘으면 QueueFullError)
+        browser_pool: 테스트에 넘길 브라우저 풀 (없으면 테스트마다 브라우저 실행)
+        deadline: run 하나의 제한 시간 (초, 실행 시작부터, None이면 제한 없음)
+    """
+
+    def __init__(self, concurrency: int, max_queue: int, browser_pool=None,
+                 deadline: Optional[float] = None):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.browser_pool = browser_pool
+        self.deadline = deadline
+        self._queue: "asyncio.PriorityQueue[tuple]" = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._runs: "OrderedDict[str, Run]" = OrderedDict()
+        self._workers: List[asyncio.Task] = []
+        self._queued = 0
+        self._running = 0
+
+    # -------------------------------------------------------------------------
+    # 시작/종료
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """워커 시작"""
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.concurrency)
+        ]
+        logger.info(f"Run manager started (concurrency={self.concurrency}, max_queue={self.max_queue})")
+
+    async def stop(self) -> None:
+        """워커 종료 (실행 중인 run은 취소됨)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # -------------------------------------------------------------------------
+    # 제출/조회
+    # -------------------------------------------------------------------------
+
+    def submit(self, test_type: str, priority: int = 0, cancel_on_disconnect: bool = False) -> Run:
+        """run을 대기열에 추가
+
+        Args:
+            test_type: 테스트 종류
+            priority: 우선순위 (클수록 먼저 실행)
+            cancel_on_disconnect: 구독자가 모두 끊기면 취소
+
+        Raises:
+            ValueError: 지원하지 않는 테스트 종류
+            QueueFullError: 대기열이 가득 참
+        """
+        if test_type not in TEST_FUNCTIONS:
+            raise ValueError(f"지원하지 않는 테스트 타입입니다: {test_type}")
+        if self._queued >= self.max_queue:
+            raise QueueFullError(
+                f"대기열이 가득 찼습니다 (대기 {self._queued}/{self.max_queue}개)"
+            )
+
+        run = Run(
+            run_id=uuid.uuid4().hex[:12],
+            test_type=test_type,
+            priority=priority,
+            cancel_on_disconnect=cancel_on_disconnect,
+        )
+        self._runs[run.run_id] = run
+        self._trim_history()
+
+        self._queue.put_nowait((-priority, next(self._seq), run.run_id))
+        self._queued += 1
+        position = self._queued
+        run.publish({"type": "status", "status": "queued", "position": position})
+        logger.info(f"Run queued: {run.run_id} ({test_type}, priority={priority}, position={position})")
+        return run
+
+    def get(self, run_id: str) -> Optional[Run]:
+        return self._runs.get(run_id)
+
+    def list(self) -> List[Run]:
+        return list(self._runs.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": self._running,
+            "queued": self._queued,
+            "max_queue": self.max_queue,
+        }
+
+    def cancel(self, run_id: str, reason: str = "취소 요청") -> Optional[Run]:
+        """run 취소
+
+        대기 중인 run은 바로 취소 처리하고, 실행 중인 run은 취소 토큰을 통해
+        테스트 태스크를 중단합니다 (컨텍스트 정리 후 워커 슬롯 반납).
+
+        Returns:
+            Run: 취소한 run (없으면 None, 이미 끝난 run은 그대로 반환)
+        """
+        run = self._runs.get(run_id)
+        if run is None or run.finished:
+            return run
+
+        if run.status == "queued":
+            self._queued -= 1
+            self._finish(run, "cancelled", {"success": False, "message": f"테스트 취소됨: {reason}"})
+        elif run.cancel_token is not None:
+            msg = f"🛑 테스트 취소: {reason}"
+            run.logs.append(msg)
+            run.publish_log(msg)
+            run.cancel_token.cancel(reason)
+
+        logger.info(f"Run cancel requested: {run_id} ({reason})")
+        return run
+
+    def _trim_history(self) -> None:
+        """완료된 run 중 오래된 것부터 삭제"""
+        excess = len(self._runs) - RUN_HISTORY_LIMIT
+        for run_id in [rid for rid, run in self._runs.items() if run.finished][:max(excess, 0)]:
+            del self._runs[run_id]
+
+    # -------------------------------------------------------------------------
+    # 실행
+    # -------------------------------------------------------------------------
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            _, _, run_id = await self._queue.get()
+            run = self._runs.get(run_id)
+            # 대기 중 취소된 run은 건너뜀
+            if run is None or run.status != "queued":
+                continue
+            self._queued -= 1
+            self._running += 1
+            try:
+                await self._execute(run)
+            except Exception as e:
+                logger.error(f"Run {run_id} crashed: {e}")
+            finally:
+                self._running -= 1
+
+    async def _execute(self, run: Run) -> None:
+        """run 하나 실행 + 결과 발행 + Teams 알림"""
+        run.status = "running"
+        run.started_at = datetime.now()
+        run.cancel_token = CancelToken(deadline=self.deadline)
+        # 전체 로그는 run 아티팩트로 기록 (메모리에는 최근 로그만)
+        run.logs.spill_path = artifact_store.path_for(run.run_id, RUN_LOG_FILENAME)
+        run.publish({"type": "status", "status": "running"})
+        logger.info(f"Run started: {run.run_id} ({run.test_type})")
+
+        task = asyncio.create_task(TEST_FUNCTIONS[run.test_type](
+            log_callback=run.publish_log,
+            log_collector=run.logs,
+            browser_pool=self.browser_pool,
+            cancel_token=run.cancel_token,
+            run_id=run.run_id,
+        ))
+        # 취소되면 다음 await 지점에서 바로 중단 (finally에서 컨텍스트 정리)
+        run.cancel_token.add_callback(lambda reason: task.cancel())
+
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not run.cancel_token.cancelled:
+                raise  # 워커 자체가 종료되는 경우
+            result = {"success": False, "message": f"테스트 취소됨: {run.cancel_token.reason}"}
+        except Exception as e:
+            result = {"success": False, "message": f"테스트 실행 중 에러: {str(e)}"}
+        finally:
+            run.cancel_token.close()
+            run.logs.close()
+            artifact_store.add(run.run_id, RUN_LOG_FILENAME, kind="log")
+
+        if run.cancel_token.cancelled:
+            self._finish(run, "cancelled", {**result, "success": False})
+            return
+
+        self._finish(run, "passed" if result["success"] else "failed", result)
+
+        # Teams 알림 (outbox에 넣고 바로 반환, 전송은 백그라운드)
+        await send_teams_notification(
+            test_type=run.test_type,
+            success=result["success"],
+            message=result["message"],
+            start_time=run.started_at,
+            end_time=run.finished_at,
+            screenshot_filename=result.get("screenshot"),
+            logs=run.logs.messages(),
+            log_filename=f"{run.run_id}/{RUN_LOG_FILENAME}",
+        )
+
+    def _finish(self, run: Run, status: str, result: Dict[str, Any]) -> None:
+        """run 종료 처리 + result 이벤트 발행"""
+        run.finished_at = datetime.now()
+        run.result = result
+        run.status = status
+        runs_total.inc(run.test_type, status)
+        if run.started_at is not None:
+            run_duration.observe((run.finished_at - run.started_at).total_seconds(), run.test_type)
+        run.publish({
+            "type": "result",
+            "success": result["success"],
+            "message": result["message"],
+            "screenshot": result.get("screenshot"),
+            "metrics": result.get("metrics"),
+        })
+        logger.info(f"Run finished: {run.run_id} ({run.status})")
+        if HISTORY_ENABLED:
+            run_history.record(self._history_entry(run))
+
+    @staticmethod
+    def _history_entry(run: Run) -> HistoryEntry:
+        """run 기록 저장소에 남길 항목"""
+        result = run.result or {}
+        artifacts = artifact_store.get(run.run_id)
+        return HistoryEntry(
+            run_id=run.run_id,
+            test_type=run.test_type,
+            status=run.status,
+            created_at=run.created_at.timestamp(),
+            started_at=run.started_at.timestamp() if run.started_at else None,
+            finished_at=run.finished_at.timestamp(),
+            message=result.get("message", ""),
+            error=None if result.get("success") else result.get("message"),
+            screenshot=result.get("screenshot"),
+            steps=result.get("steps") or [],
+            artifacts=artifacts.to_dict()["artifacts"] if artifacts else [],
+            vitals=((result.get("metrics") or {}).get("web_vitals") or {}).get("samples", []),
+        )
@@ -1,8 +1,7 @@
+import asyncio
 import sys
 from datetime import datetime
 from pathlib import Path
-from playwright.sync_api import sync_playwright
-import time
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
@@ -10,13 +9,20 @@ sys.path.insert(0, str(project_root))
 
 from utils.config import PERSO_EMAIL, HEADLESS
 from utils.browser import create_browser_context, save_screenshot
+from utils.browser_pool import acquire_browser
+from utils.run_state import get_run_state
+from utils.steps import run_step
+from utils.network_recorder import save_network_har
+from utils.tracing import save_failure_trace
+from utils.wait_engine import wait_for_hidden
 from utils.login import do_login
 from utils.popup_handler import close_all_modals_and_popups
 from utils.logger import create_logger
 from utils.verification import verify_login_success
 from utils.teams_notifier import send_teams_notification_sync
 
-def test_login_sync(log_callback=None, log_collector=None):
+async def test_login_async(log_callback=None, log_collector=None, browser_pool=None,
+                           cancel_token=None, run_id=None):
     """로그인 테스트"""
 
     log = create_logger(log_callback, log_collector)
@@ -25,43 +31,34 @@ def test_login_sync(log_callback=None, log_collector=None):
     log(f"📧 이메일: {PERSO_EMAIL}")
     log(f"🖥️  Headless: {HEADLESS}")
     
-    with sync_playwright() as p:
+    async with acquire_browser(browser_pool, headless=HEADLESS) as browser:
         # 브라우저 컨텍스트 생성 (utils.browser 사용)
-        browser, context, page = create_browser_context(p, headless=HEADLESS)
+        context, page = await create_browser_context(
+            browser, suite="login", cancel_token=cancel_token, run_id=run_id
+        )
         
         try:
             # === STEP 1: 로그인 ===
-            log("\n" + "="*50)
-            log("STEP 1: 로그인")
-            log("="*50)
-
-            do_login(page, log)
+            async with run_step(page, log, "STEP 1: 로그인"):
+                # 로그인 테스트는 세션 캐시를 쓰지 않고 항상 실제 로그인
+                await do_login(page, log, use_session_cache=False)
 
             # === STEP 2: 팝업/모달 닫기 ===
-            log("\n" + "="*50)
-            log("STEP 2: 팝업/모달 닫기")
-            log("="*50)
-
-            close_all_modals_and_popups(page, log) 
+            async with run_step(page, log, "STEP 2: 팝업/모달 닫기"):
+                await close_all_modals_and_popups(page, log)
 
             # === STEP 3: 로그인 성공 확인 ===
-            log("\n" + "="*50)
-            log("STEP 3: 로그인 성공 확인")
-            log("="*50)
-            
-            verify_login_success(page, log)
+            async with run_step(page, log, "STEP 3: 로그인 성공 확인"):
+                await verify_login_success(page, log)
 
             # === STEP 4: 스크린샷 저장 (드롭다운 열린 상태) ===
-            log("\n" + "="*50)
-            log("STEP 4: 스크린샷 저장")
-            log("="*50)
+            async with run_step(page, log, "STEP 4: 스크린샷 저장"):
+                screenshot = await save_screenshot(page, "login_success.png", log)
 
-            save_screenshot(page, "login_success.png", log)
-
-            # 드롭다운 닫기
-            log("🔽 드롭다운 닫는 중...")
-            page.keyboard.press('Escape')
-            time.sleep(0.5)
+                # 드롭다운 닫기
+                log("🔽 드롭다운 닫는 중...")
+                await page.keyboard.press('Escape')
+                await wait_for_hidden(page, 'text=로그아웃', timeout=2000, label="프로필 드롭다운 닫힘")
 
             log("\n" + "="*50)
             log("✅ 로그인 테스트 완료!")
@@ -69,27 +66,40 @@ def test_login_sync(log_callback=None, log_collector=None):
 
             return {
                 "success": True,
-                "screenshot": "login_success.png",
-                "message": "로그인 테스트 성공!"
+                "screenshot": screenshot,
+                "message": "로그인 테스트 성공!",
+                "metrics": get_run_state(context).metrics_dict(),
+                "steps": get_run_state(context).steps_dict(),
             }
             
         except Exception as e:
             log(f"❌ 에러 발생: {e}")
-            save_screenshot(page, "login_error.png", log)
+            screenshot = await save_screenshot(page, "login_error.png", log)
+            await save_failure_trace(page, log)
+            save_network_har(page, log)
 
             return {
                 "success": False,
-                "screenshot": "login_error.png",
-                "message": f"로그인 실패: {str(e)}"
+                "screenshot": screenshot,
+                "message": f"로그인 실패: {str(e)}",
+                "metrics": get_run_state(context).metrics_dict(),
+                "steps": get_run_state(context).steps_dict(),
             }
             
         finally:
-            if not HEADLESS:
+            # 취소된 실행은 바로 정리 (브라우저 슬롯 반납)
+            if not HEADLESS and not (cancel_token and cancel_token.cancelled):
                 log("🏁 브라우저를 5초 후 종료합니다...")
-                time.sleep(5)
-            browser.close()
+                await asyncio.sleep(5)
+            await context.close()
             log("🏁 테스트 종료")
 
+def test_login_sync(log_callback=None, log_collector=None):
+    """로그인 테스트 (sync wrapper for CLI)"""
+    return asyncio.run(
+        test_login_async(log_callback=log_callback, log_collector=log_collector)
+    )
+
 if __name__ == "__main__":
     logs: list[str] = []
     start_time = datetime.now()
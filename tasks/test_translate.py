@@ -1,8 +1,7 @@
+import asyncio
 import sys
 from datetime import datetime
 from pathlib import Path
-from playwright.sync_api import sync_playwright
-import time
 
 # 프로젝트 루트 추가
 project_root = Path(__file__).parent.parent
@@ -13,12 +12,19 @@ from utils.login import do_login
 from utils.upload import upload_file
 from utils.popup_handler import close_all_modals_and_popups, prepare_and_check_translation_modal, handle_permission_modal, close_translation_settings_modal, close_tutorial_popup
 from utils.browser import create_browser_context, save_screenshot
+from utils.browser_pool import acquire_browser
+from utils.run_state import get_run_state
+from utils.steps import run_step
+from utils.network_recorder import save_network_har
+from utils.tracing import save_failure_trace
+from utils.wait_engine import wait_for_dom_quiet, wait_for_hidden, wait_for_url
 from utils.logger import create_logger
 from utils.translation_helper import select_language_from_dropdown, click_translate_button
 from utils.verification import verify_translate_success
 from utils.teams_notifier import send_teams_notification_sync
 
-def test_translate_sync(log_callback=None, log_collector=None):
+async def test_translate_async(log_callback=None, log_collector=None, browser_pool=None,
+                               cancel_token=None, run_id=None):
     """파일 업로드 후 번역 설정을 완료하는 테스트"""
 
     log = create_logger(log_callback, log_collector)
@@ -28,95 +34,73 @@ def test_translate_sync(log_callback=None, log_collector=None):
     log(f"🎬 영상 파일: {VIDEO_FILE_PATH}")
     log(f"🖥️  Headless: {HEADLESS}")
 
-    with sync_playwright() as p:
+    async with acquire_browser(browser_pool, headless=HEADLESS) as browser:
         # 브라우저 컨텍스트 생성 (utils.browser 사용, viewport 1920x1080)
-        browser, context, page = create_browser_context(
-            p,
-            headless=HEADLESS,
+        context, page = await create_browser_context(
+            browser,
             viewport_width=1920,
-            viewport_height=1080
+            viewport_height=1080,
+            suite="translate",
+            cancel_token=cancel_token,
+            run_id=run_id,
         )
 
         try:
             # === STEP 1: 로그인 ===
-            log("\n" + "="*50)
-            log("STEP 1: 로그인")
-            log("="*50)
-
-            do_login(page, log)
+            async with run_step(page, log, "STEP 1: 로그인"):
+                await do_login(page, log)
 
             # === STEP 2: 팝업/모달 닫기 ===
-            log("\n" + "="*50)
-            log("STEP 2: 팝업/모달 닫기")
-            log("="*50)
-
-            close_all_modals_and_popups(page, log)
-
-            # === STEP 3: 파일 업로드 ===
-            log("\n" + "="*50)
-            log("STEP 3: 파일 업로드")
-            log("="*50)
+            async with run_step(page, log, "STEP 2: 팝업/모달 닫기"):
+                await close_all_modals_and_popups(page, log)
 
-            upload_file(page, log)
+            # === STEP 3: 파일 업로드 (업로드는 UPLOAD_TIMEOUT으로 제한) ===
+            async with run_step(page, log, "STEP 3: 파일 업로드", deadline=None):
+                await upload_file(page, log)
 
             # === STEP 4: 번역 설정 모달 확인 ===
-            log("\n" + "="*50)
-            log("STEP 4: 번역 설정 모달 확인")
-            log("="*50)
+            async with run_step(page, log, "STEP 4: 번역 설정 모달 확인"):
+                await prepare_and_check_translation_modal(page, log)
 
-            prepare_and_check_translation_modal(page, log)
-
-            log("✅ 번역 설정 모달 확인 완료!")
+                log("✅ 번역 설정 모달 확인 완료!")
 
             # === STEP 5: 원본 언어 선택 (Korean) ===
-            log("\n" + "="*50)
-            log("STEP 5: 원본 언어 선택 (Korean)")
-            log("="*50)
-
-            select_language_from_dropdown(page, "Korean", dropdown_index=0, log=log)
+            async with run_step(page, log, "STEP 5: 원본 언어 선택 (Korean)"):
+                await select_language_from_dropdown(page, "Korean", dropdown_index=0, log=log)
 
-            #log("✅ 원본 언어 Korean 선택 완료!")
+                #log("✅ 원본 언어 Korean 선택 완료!")
 
             # === STEP 6: 번역 언어 선택 (English) ===
-            log("\n" + "="*50)
-            log("STEP 6: 번역 언어 선택 (English)")
-            log("="*50)
-            select_language_from_dropdown(page, "English", dropdown_index=1, log=log)
+            async with run_step(page, log, "STEP 6: 번역 언어 선택 (English)"):
+                await select_language_from_dropdown(page, "English", dropdown_index=1, log=log)
 
-            # 드롭다운 닫기
-            log("🔍 드롭다운 닫는 중...")
-            page.mouse.click(900, 300)
-            time.sleep(1)
-            #log("✅ 번역 언어 English 선택 완료!")
+                # 드롭다운 닫기
+                log("🔍 드롭다운 닫는 중...")
+                await page.mouse.click(900, 300)
+                await wait_for_hidden(page, 'input[placeholder*="언어를 검색"]', timeout=2000,
+                                      label="언어 드롭다운 닫힘")
+                #log("✅ 번역 언어 English 선택 완료!")
 
             # === STEP 7: 번역 시작 - 번역하기 버튼 클릭 ===
-            log("\n" + "="*50)
-            log("STEP 7: 번역 시작 - 번역하기 버튼 클릭")
-            log("="*50)
-            click_translate_button(page, log)
-            handle_permission_modal(page, log)
-            close_translation_settings_modal(page, log)
-            close_tutorial_popup(page, log)
-
-            # === STEP 8: 번역 처리 확인 ===
-            log("\n" + "="*50)
-            log("STEP 8: 번역 처리 확인")
-            log("="*50)
-
-            # 페이지 전환 대기
-            log("⏳ 페이지 전환 대기 중...")
-            time.sleep(5)
-
-            # 번역 처리 검증
-            verify_translate_success(page, log)
-                        
-
-            # === STEP 8: 스크린샷 저장 ===
-            log("\n" + "="*50)
-            log("STEP 8: 스크린샷 저장")
-            log("="*50)
-
-            save_screenshot(page, "translate_success.png", log)
+            async with run_step(page, log, "STEP 7: 번역 시작 - 번역하기 버튼 클릭"):
+                await click_translate_button(page, log)
+                await handle_permission_modal(page, log)
+                await close_translation_settings_modal(page, log)
+                await close_tutorial_popup(page, log)
+
+            # === STEP 8: 번역 처리 확인 (영상 처리 대기는 자체 제한 시간 사용) ===
+            async with run_step(page, log, "STEP 8: 번역 처리 확인", deadline=None):
+                # 페이지 전환 대기
+                log("⏳ 페이지 전환 대기 중...")
+                await wait_for_url(page, '**/workspace/**', timeout=10000, label="workspace 이동")
+                await wait_for_dom_quiet(page, quiet_ms=500, timeout=5000, label="workspace 안정화")
+
+                # 번역 처리 검증
+                await verify_translate_success(page, log)
+
+            # === STEP 9: 스크린샷 저장 ===
+            async with run_step(page, log, "STEP 9: 스크린샷 저장"):
+                screenshot = await save_screenshot(page, "translate_success.png", log)
 
             log("\n" + "="*50)
             log("✅ 번역 테스트 완료!")
@@ -124,30 +108,43 @@ def test_translate_sync(log_callback=None, log_collector=None):
 
             return {
                 "success": True,
-                "screenshot": "translate_success.png",
-                "message": "번역 테스트가 성공적으로 완료되었습니다!"
+                "screenshot": screenshot,
+                "message": "번역 테스트가 성공적으로 완료되었습니다!",
+                "metrics": get_run_state(context).metrics_dict(),
+                "steps": get_run_state(context).steps_dict(),
             }
 
         except Exception as e:
             log(f"❌ 에러 발생: {e}")
-            save_screenshot(page, "translate_error.png", log)
+            screenshot = await save_screenshot(page, "translate_error.png", log)
+            await save_failure_trace(page, log)
+            save_network_har(page, log)
 
             import traceback
             traceback.print_exc()
 
             return {
                 "success": False,
-                "screenshot": "translate_error.png",
-                "message": f"번역 테스트 실패: {str(e)}"
+                "screenshot": screenshot,
+                "message": f"번역 테스트 실패: {str(e)}",
+                "metrics": get_run_state(context).metrics_dict(),
+                "steps": get_run_state(context).steps_dict(),
             }
 
         finally:
-            if not HEADLESS:
+            # 취소된 실행은 바로 정리 (브라우저 슬롯 반납)
+            if not HEADLESS and not (cancel_token and cancel_token.cancelled):
                 log("🏁 브라우저를 5초 후 종료합니다...")
-                time.sleep(5)
-            browser.close()
+                await asyncio.sleep(5)
+            await context.close()
             log("🏁 테스트 종료")
 
+def test_translate_sync(log_callback=None, log_collector=None):
+    """번역 테스트 (sync wrapper for CLI)"""
+    return asyncio.run(
+        test_translate_async(log_callback=log_callback, log_collector=log_collector)
+    )
+
 if __name__ == "__main__":
     logs: list[str] = []
     start_time = datetime.now()
@@ -1,8 +1,7 @@
+import asyncio
 import sys
 from datetime import datetime
 from pathlib import Path
-from playwright.sync_api import sync_playwright
-import time
 
 # 프로젝트 루트 추가
 project_root = Path(__file__).parent.parent
@@ -13,11 +12,17 @@ from utils.login import do_login
 from utils.upload import upload_file
 from utils.popup_handler import close_all_modals_and_popups
 from utils.browser import create_browser_context, save_screenshot
+from utils.browser_pool import acquire_browser
+from utils.run_state import get_run_state
+from utils.steps import run_step
+from utils.network_recorder import save_network_har
+from utils.tracing import save_failure_trace
 from utils.logger import create_logger
 from utils.verification import verify_upload_success
 from utils.teams_notifier import send_teams_notification_sync
 
-def test_upload_sync(log_callback=None, log_collector=None):
+async def test_upload_async(log_callback=None, log_collector=None, browser_pool=None,
+                            cancel_token=None, run_id=None):
     """파일 업로드 테스트 (번역 설정 모달 나타나는지까지)"""
 
     log = create_logger(log_callback, log_collector)
@@ -27,45 +32,32 @@ def test_upload_sync(log_callback=None, log_collector=None):
     log(f"🎬 영상 파일: {VIDEO_FILE_PATH}")
     log(f"🖥️  Headless: {HEADLESS}")
     
-    with sync_playwright() as p:
+    async with acquire_browser(browser_pool, headless=HEADLESS) as browser:
         # 브라우저 컨텍스트 생성 (utils.browser 사용)
-        browser, context, page = create_browser_context(p, headless=HEADLESS)
+        context, page = await create_browser_context(
+            browser, suite="upload", cancel_token=cancel_token, run_id=run_id
+        )
         
         try:
             # === STEP 1: 로그인 ===
-            log("\n" + "="*50)
-            log("STEP 1: 로그인")
-            log("="*50)
+            async with run_step(page, log, "STEP 1: 로그인"):
+                await do_login(page, log)
 
-            do_login(page, log)
-            
             # === STEP 2: 팝업/모달 닫기 ===
-            log("\n" + "="*50)
-            log("STEP 2: 팝업/모달 닫기")
-            log("="*50)
-
-            close_all_modals_and_popups(page, log)
-            
-            # === STEP 3: 파일 업로드 ===
-            log("\n" + "="*50)
-            log("STEP 3: 파일 업로드")
-            log("="*50)
+            async with run_step(page, log, "STEP 2: 팝업/모달 닫기"):
+                await close_all_modals_and_popups(page, log)
 
-            upload_file(page, log)
+            # === STEP 3: 파일 업로드 (업로드는 UPLOAD_TIMEOUT으로 제한) ===
+            async with run_step(page, log, "STEP 3: 파일 업로드", deadline=None):
+                await upload_file(page, log)
 
             # === STEP 4: 번역 설정 모달 확인 ===
-            log("\n" + "="*50)
-            log("STEP 4: 업로드 성공 확인 / 번역 설정 모달 확인")
-            log("="*50)
+            async with run_step(page, log, "STEP 4: 업로드 성공 확인 / 번역 설정 모달 확인"):
+                await verify_upload_success(page, log)
 
-            verify_upload_success(page, log)
-            
             # STEP 5: 스크린샷
-            log("\n" + "="*50)
-            log("STEP 5: 스크린샷 저장")
-            log("="*50)
-
-            save_screenshot(page, "upload_success.png", log)
+            async with run_step(page, log, "STEP 5: 스크린샷 저장"):
+                screenshot = await save_screenshot(page, "upload_success.png", log)
             
             log("\n" + "="*50)
             log("✅ 업로드 테스트 완료!")
@@ -73,30 +65,43 @@ def test_upload_sync(log_callback=None, log_collector=None):
             
             return {
                 "success": True,
-                "screenshot": "upload_success.png",
-                "message": "업로드 테스트 성공!"
+                "screenshot": screenshot,
+                "message": "업로드 테스트 성공!",
+                "metrics": get_run_state(context).metrics_dict(),
+                "steps": get_run_state(context).steps_dict(),
             }
             
         except Exception as e:
             log(f"❌ 에러 발생: {e}")
-            save_screenshot(page, "upload_error.png", log)
+            screenshot = await save_screenshot(page, "upload_error.png", log)
+            await save_failure_trace(page, log)
+            save_network_har(page, log)
 
             import traceback
             traceback.print_exc()
 
             return {
                 "success": False,
-                "screenshot": "upload_error.png",
-                "message": f"업로드 실패: {str(e)}"
+                "screenshot": screenshot,
+                "message": f"업로드 실패: {str(e)}",
+                "metrics": get_run_state(context).metrics_dict(),
+                "steps": get_run_state(context).steps_dict(),
             }
             
         finally:
-            if not HEADLESS:
+            # 취소된 실행은 바로 정리 (브라우저 슬롯 반납)
+            if not HEADLESS and not (cancel_token and cancel_token.cancelled):
                 log("🏁 브라우저를 5초 후 종료합니다...")
-                time.sleep(5)
-            browser.close()
+                await asyncio.sleep(5)
+            await context.close()
             log("🏁 테스트 종료")
 
+def test_upload_sync(log_callback=None, log_collector=None):
+    """파일 업로드 테스트 (sync wrapper for CLI)"""
+    return asyncio.run(
+        test_upload_async(log_callback=log_callback, log_collector=log_collector)
+    )
+
 if __name__ == "__main__":
     logs: list[str] = []
     start_time = datetime.now()
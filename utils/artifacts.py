@@ -0,0 +1,260 @@
+# utils/artifacts.py
+"""run별 아티팩트 저장소 (스크린샷/trace/로그)
+
+아티팩트는 run ID별 디렉토리(ARTIFACT_DIR/<run_id>/)에 저장되어 동시에 실행되는
+run끼리 파일을 덮어쓰지 않습니다. /screenshots 마운트로 그대로 서빙되므로
+URL은 /screenshots/<run_id>/<파일명> 입니다.
+
+- 인덱스: run별 아티팩트 목록을 ARTIFACT_DIR/index.json에 저장 (재시작 후에도 유지)
+- 정리: ARTIFACT_MAX_AGE초가 지난 run 삭제, 전체 크기가 ARTIFACT_MAX_MB를 넘으면
+  가장 오래 사용되지 않은(LRU) run부터 삭제
+- 사용 시각: 아티팩트 추가/조회 시 갱신
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.config import ARTIFACT_DIR, ARTIFACT_MAX_AGE, ARTIFACT_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+
+# run ID / 파일명으로 허용하는 문자 (경로 탈출 방지)
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+@dataclass
+class Artifact:
+    """아티팩트 하나
+
+    Attributes:
+        name: 파일명 (run 디렉토리 기준)
+        kind: "screenshot" | "trace" | "log" | ...
+        size: 파일 크기 (바이트)
+        created_at: 저장 시각 (time.time)
+    """
+
+    name: str
+    kind: str
+    size: int
+    created_at: float
+
+
+@dataclass
+class RunArtifacts:
+    """run 하나의 아티팩트 목록
+
+    Attributes:
+        run_id: run ID
+        created_at: 첫 아티팩트 저장 시각 (time.time)
+        last_access: 마지막 추가/조회 시각 (time.time, LRU 기준)
+        artifacts: 파일명 -> Artifact
+    """
+
+    run_id: str
+    created_at: float
+    last_access: float
+    artifacts: Dict[str, Artifact] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return sum(a.size for a in self.artifacts.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "created_at": self.created_at,
+            "last_access": self.last_access,
+            "size": self.size,
+            "artifacts": [
+                {**asdict(a), "path": f"{self.run_id}/{a.name}"}
+                for a in self.artifacts.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunArtifacts":
+        return cls(
+            run_id=data["run_id"],
+            created_at=data["created_at"],
+            last_access=data["last_access"],
+            artifacts={
+                a["name"]: Artifact(a["name"], a["kind"], a["size"], a["created_at"])
+                for a in data.get("artifacts", [])
+            },
+        )
+
+
+class ArtifactStore:
+    """run ID별 아티팩트 저장소 (스레드 안전)
+
+    Args:
+        root: 저장 디렉토리 (run별 하위 디렉토리 + index.json)
+        max_bytes: 전체 크기 제한 (바이트, 0이면 제한 없음)
+        max_age: run 보관 기간 (초, 0이면 제한 없음)
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 0, max_age: float = 0):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._runs: Dict[str, RunArtifacts] = {}
+        self._lock = threading.Lock()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    # -------------------------------------------------------------------------
+    # 경로
+    # -------------------------------------------------------------------------
+
+    def path_for(self, run_id: str, name: str) -> Path:
+        """아티팩트 저장 경로 (run 디렉토리 생성)
+
+        Raises:
+            ValueError: run ID 또는 파일명에 허용되지 않는 문자가 있는 경우
+        """
+        if not _SAFE_NAME.match(run_id) or not _SAFE_NAME.match(name):
+            raise ValueError(f"잘못된 아티팩트 경로: {run_id}/{name}")
+        run_dir = self.root / run_id
+        run_dir.mkdir(parents=True, exist_ok=True)
+        return run_dir / name
+
+    # -------------------------------------------------------------------------
+    # 추가/조회
+    # -------------------------------------------------------------------------
+
+    def add(self, run_id: str, name: str, kind: str) -> Optional[str]:
+        """path_for()에 저장한 파일을 인덱스에 등록 후 정리
+
+        Returns:
+            str: 서빙 경로 ("<run_id>/<name>", /screenshots 기준), 파일이 없으면 None
+        """
+        path = self.root / run_id / name
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._runs.get(run_id)
+            if entry is None:
+                entry = RunArtifacts(run_id=run_id, created_at=now, last_access=now)
+                self._runs[run_id] = entry
+            entry.artifacts[name] = Artifact(name=name, kind=kind, size=size, created_at=now)
+            entry.last_access = now
+            self._evict(keep=run_id)
+            self._save_index()
+
+        return f"{run_id}/{name}"
+
+    def write_text(self, run_id: str, name: str, text: str, kind: str = "log") -> Optional[str]:
+        """텍스트 아티팩트 저장 (실행 로그 등)"""
+        try:
+            self.path_for(run_id, name).write_text(text, encoding="utf-8")
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 아티팩트 저장 실패 ({run_id}/{name}): {e}")
+            return None
+        return self.add(run_id, name, kind)
+
+    def get(self, run_id: str) -> Optional[RunArtifacts]:
+        """run의 아티팩트 목록 (없으면 None)"""
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def touch(self, run_id: str) -> None:
+        """사용 시각 갱신 (서빙 시, 인덱스 파일은 다음 추가 때 저장)"""
+        with self._lock:
+            entry = self._runs.get(run_id)
+            if entry is not None:
+                entry.last_access = time.time()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "runs": len(self._runs),
+                "bytes": sum(e.size for e in self._runs.values()),
+                "max_bytes": self.max_bytes,
+                "max_age": self.max_age,
+            }
+
+    # -------------------------------------------------------------------------
+    # 정리
+    # -------------------------------------------------------------------------
+
+    def evict(self) -> None:
+        """보관 기간/전체 크기 제한 적용"""
+        with self._lock:
+            self._evict()
+            self._save_index()
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """오래된 run 삭제 후 크기 제한을 넘으면 LRU 순서로 삭제 (keep은 제외)"""
+        now = time.time()
+
+        if self.max_age:
+            for run_id, entry in list(self._runs.items()):
+                if run_id != keep and now - entry.created_at > self.max_age:
+                    self._remove(run_id)
+
+        if self.max_bytes:
+            total = sum(e.size for e in self._runs.values())
+            for entry in sorted(self._runs.values(), key=lambda e: e.last_access):
+                if total <= self.max_bytes:
+                    break
+                if entry.run_id == keep:
+                    continue
+                total -= entry.size
+                self._remove(entry.run_id)
+
+    def _remove(self, run_id: str) -> None:
+        self._runs.pop(run_id, None)
+        shutil.rmtree(self.root / run_id, ignore_errors=True)
+        logger.info(f"🧹 아티팩트 삭제: {run_id}")
+
+    # -------------------------------------------------------------------------
+    # 인덱스
+    # -------------------------------------------------------------------------
+
+    def _load_index(self) -> None:
+        path = self.root / INDEX_FILENAME
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self._runs = {d["run_id"]: RunArtifacts.from_dict(d) for d in data.get("runs", [])}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ 아티팩트 인덱스 읽기 실패: {e}")
+            self._runs = {}
+
+    def _save_index(self) -> None:
+        path = self.root / INDEX_FILENAME
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps({"runs": [e.to_dict() for e in self._runs.values()]}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ 아티팩트 인덱스 저장 실패: {e}")
+
+
+# 프로세스 전역 저장소
+artifact_store = ArtifactStore(
+    root=ARTIFACT_DIR,
+    max_bytes=int(ARTIFACT_MAX_MB * 1024 * 1024),
+    max_age=ARTIFACT_MAX_AGE,
+)
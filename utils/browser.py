@@ -1,9 +1,28 @@
-from utils.config import SCREENSHOT_DIR
+import uuid
 
+from utils.artifacts import artifact_store
+from utils.network_recorder import install_network_recorder
+from utils.config import (
+    NETWORK_RECORDER_ENABLED,
+    REQUEST_FILTER_ENABLED,
+    POPUP_SUPPRESSION_ENABLED,
+    SCREENCAST_ENABLED,
+    TRACE_ON_FAILURE,
+    WEB_VITALS_ENABLED,
+)
+from utils.popup_suppression import install_popup_suppression
+from utils.request_filter import install_request_filter
+from utils.run_state import get_run_state
+from utils.screencast import screencast_hub
+from utils.tracing import start_failure_trace
+from utils.web_vitals import install_web_vitals
 
-def save_screenshot(page, filename, log=None, full_page=False):
+
+async def save_screenshot(page, filename, log=None, full_page=False):
     """스크린샷을 저장합니다.
 
+    스크린샷은 이 실행의 run ID 디렉토리에 저장되어 다른 실행과 덮어쓰지 않습니다.
+
     Args:
         page: Playwright page 객체
         filename: 저장할 파일명 (예: "login_success.png")
@@ -11,31 +30,31 @@ def save_screenshot(page, filename, log=None, full_page=False):
         full_page: 전체 페이지 스크린샷 여부 (default: False)
 
     Returns:
-        str: 저장된 파일명 (성공 시), None (실패 시)
+        str: 저장된 경로 ("<run_id>/<filename>", /screenshots 기준, 성공 시), None (실패 시)
     """
     _log = log if log else print
-    screenshot_path = SCREENSHOT_DIR / filename
+    run_id = get_run_state(page).run_id or "local"
 
     try:
-        page.screenshot(path=str(screenshot_path), full_page=full_page)
-        _log(f"📸 스크린샷 저장: {filename}")
-        return filename
+        screenshot_path = artifact_store.path_for(run_id, filename)
+        await page.screenshot(path=str(screenshot_path), full_page=full_page)
+        saved = artifact_store.add(run_id, filename, kind="screenshot")
+        _log(f"📸 스크린샷 저장: {saved}")
+        return saved
     except Exception as e:
         _log(f"⚠️ 스크린샷 저장 실패: {e}")
         return None
 
 
-def create_browser_context(playwright, headless=True, viewport_width=1920, viewport_height=1080):
-    """브라우저 컨텍스트를 생성합니다.
+async def launch_browser(playwright, headless=True):
+    """Chromium 브라우저를 실행합니다.
 
     Args:
-        playwright: Playwright 인스턴스 (sync_playwright()의 결과)
+        playwright: Playwright 인스턴스 (async_playwright()의 결과)
         headless: Headless 모드 사용 여부 (default: True)
-        viewport_width: 뷰포트 너비 (default: 1920)
-        viewport_height: 뷰포트 높이 (default: 1080)
 
     Returns:
-        tuple: (browser, context, page) 튜플
+        Browser: 실행된 브라우저
     """
     # 브라우저 launch 옵션 설정
     launch_options = {
@@ -53,15 +72,68 @@ def create_browser_context(playwright, headless=True, viewport_width=1920, viewp
         # Non-headless 모드용 슬로우 모션
         launch_options['slow_mo'] = 500
 
-    # 브라우저 실행
-    browser = playwright.chromium.launch(**launch_options)
+    return await playwright.chromium.launch(**launch_options)
+
 
+async def create_browser_context(browser, viewport_width=1920, viewport_height=1080, suite=None,
+                                 cancel_token=None, run_id=None):
+    """브라우저 컨텍스트를 생성합니다.
+
+    브라우저는 여러 테스트가 공유할 수 있으므로, 테스트 종료 시에는
+    브라우저가 아니라 컨텍스트만 닫습니다.
+    suite가 주어지면 해당 suite의 요청 차단 규칙을 설치합니다.
+    쿠키 배너/HubSpot/튜토리얼 팝업은 컨텍스트 단계에서 미리 차단합니다.
+    cancel_token은 실행 상태에 연결되어 utils 함수들의 안전 지점에서 확인됩니다.
+    TRACE_ON_FAILURE면 순환 trace를 시작합니다 (실패 시 utils.tracing.save_failure_trace()로 저장).
+    WEB_VITALS_ENABLED면 페이지 성능 관찰 스크립트를 설치합니다 (utils.web_vitals).
+    NETWORK_RECORDER_ENABLED면 요청별 시간을 기록합니다 (실패 시 utils.network_recorder.save_network_har()).
+    run_id는 아티팩트 저장 디렉토리 이름으로 쓰이며, 없으면 새로 발급합니다 (CLI 실행).
+
+    Args:
+        browser: Playwright Browser (utils.browser_pool.acquire_browser()의 결과)
+        viewport_width: 뷰포트 너비 (default: 1920)
+        viewport_height: 뷰포트 높이 (default: 1080)
+        suite: 테스트 종류 ("login", "upload", "translate", optional)
+        cancel_token: 실행 취소 토큰 (utils.cancellation.CancelToken, optional)
+        run_id: run ID (optional)
+
+    Returns:
+        tuple: (context, page) 튜플
+    """
     # 컨텍스트 생성 (viewport 설정 포함)
-    context = browser.new_context(
+    context = await browser.new_context(
         viewport={'width': viewport_width, 'height': viewport_height}
     )
+    state = get_run_state(context)
+    state.cancel_token = cancel_token
+    state.run_id = run_id or uuid.uuid4().hex[:12]
+    state.test_type = suite
+
+    # 테스트와 무관한 요청 차단 (HubSpot, 분석, 웹폰트 등)
+    if suite and REQUEST_FILTER_ENABLED:
+        await install_request_filter(context, suite)
+
+    # 팝업이 아예 뜨지 않도록 사전 차단
+    if POPUP_SUPPRESSION_ENABLED:
+        await install_popup_suppression(context)
+
+    # 문서/API 요청별 시간 기록
+    if NETWORK_RECORDER_ENABLED:
+        install_network_recorder(context)
+
+    # PERSO 페이지 성능 관찰 (LCP/CLS/long task)
+    if WEB_VITALS_ENABLED:
+        await install_web_vitals(context)
+
+    # 실패 시 저장할 trace (단계별 chunk 순환 보관)
+    if TRACE_ON_FAILURE:
+        await start_failure_trace(context)
 
     # 페이지 생성
-    page = context.new_page()
+    page = await context.new_page()
+
+    # 라이브 보기 대상으로 등록 (viewer가 있을 때만 캡처)
+    if SCREENCAST_ENABLED:
+        screencast_hub.register_page(state.run_id, page)
 
-    return browser, context, page
+    return context, page
@@ -0,0 +1,271 @@
+# utils/browser_pool.py
+"""미리 띄워둔 Chromium 브라우저 풀
+
+웹 서버 시작 시 Playwright 드라이버 하나와 Chromium 브라우저들을 미리 실행해두고,
+각 테스트 실행은 풀에서 브라우저를 빌려 새 BrowserContext만 생성합니다.
+브라우저 실행 비용을 테스트마다 지불하지 않아도 됩니다.
+
+- 풀 크기: BROWSER_POOL_SIZE
+- 재시작: 브라우저 하나가 BROWSER_POOL_MAX_CONTEXTS개의 컨텍스트를 만들면 재시작
+- 헬스 체크: 연결이 끊긴 브라우저는 재실행
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Optional
+
+from playwright.async_api import async_playwright
+
+from utils.browser import launch_browser
+from utils.metrics import retries_total
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# 풀 구성 요소
+# =============================================================================
+
+
+class PooledBrowser:
+    """풀에 속한 Chromium 브라우저 하나"""
+
+    def __init__(self, index: int, max_contexts: int):
+        self.index = index
+        self.max_contexts = max_contexts
+        self.browser: Any = None
+        self.generation = 0
+        self.contexts_served = 0
+        self.active = 0
+        self.launched_at = 0.0
+
+    @property
+    def retiring(self) -> bool:
+        """재시작 대상 여부 (컨텍스트 생성 횟수 초과)"""
+        return self.contexts_served >= self.max_contexts
+
+    def is_alive(self) -> bool:
+        """브라우저 연결 상태 확인"""
+        return self.browser is not None and self.browser.is_connected()
+
+
+@dataclass
+class BrowserLease:
+    """테스트 실행 하나가 빌려가는 브라우저 정보"""
+
+    pooled: PooledBrowser
+    generation: int
+    browser: Any
+
+
+# =============================================================================
+# Browser Pool
+# =============================================================================
+
+
+class BrowserPool:
+    """Chromium 브라우저 풀 (이벤트 루프 전용)
+
+    Args:
+        size: 띄워둘 브라우저 개수
+        max_contexts: 브라우저당 최대 컨텍스트 생성 횟수 (초과 시 재시작)
+        headless: Headless 모드 여부
+    """
+
+    def __init__(self, size: int, max_contexts: int, headless: bool = True):
+        self.size = max(1, size)
+        self.max_contexts = max(1, max_contexts)
+        self.headless = headless
+        self._playwright: Any = None
+        self._browsers: List[PooledBrowser] = []
+        self._cond = asyncio.Condition()
+        self._closed = False
+
+    # -------------------------------------------------------------------------
+    # 수명 주기
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Playwright 드라이버와 브라우저를 모두 실행"""
+        self._playwright = await async_playwright().start()
+
+        for i in range(self.size):
+            pooled = PooledBrowser(i, self.max_contexts)
+            await self._launch(pooled)
+            self._browsers.append(pooled)
+
+        logger.info(f"✅ 브라우저 풀 시작 (size={self.size}, max_contexts={self.max_contexts})")
+
+    async def stop(self) -> None:
+        """모든 브라우저와 드라이버 종료"""
+        async with self._cond:
+            self._closed = True
+            for pooled in self._browsers:
+                await self._close(pooled)
+            self._cond.notify_all()
+
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info("🏁 브라우저 풀 종료")
+
+    async def _launch(self, pooled: PooledBrowser) -> None:
+        pooled.browser = await launch_browser(self._playwright, headless=self.headless)
+        pooled.generation += 1
+        pooled.contexts_served = 0
+        pooled.active = 0
+        pooled.launched_at = time.monotonic()
+        logger.info(f"🌐 브라우저 #{pooled.index} 실행 완료")
+
+    async def _close(self, pooled: PooledBrowser) -> None:
+        if pooled.browser is not None:
+            try:
+                await pooled.browser.close()
+            except Exception:
+                pass
+            pooled.browser = None
+
+    async def _restart(self, pooled: PooledBrowser, reason: str) -> None:
+        logger.info(f"♻️ 브라우저 #{pooled.index} 재시작 ({reason})")
+        await self._close(pooled)
+        await self._launch(pooled)
+
+    # -------------------------------------------------------------------------
+    # 대여 / 반납
+    # -------------------------------------------------------------------------
+
+    async def acquire(self, timeout: float = 60.0) -> BrowserLease:
+        """사용 가능한 브라우저 하나를 빌림
+
+        재시작 대상이 아닌 브라우저 중 사용 중인 컨텍스트가 가장 적은 것을 고릅니다.
+        모두 재시작 대기 중이면 반납될 때까지 기다립니다.
+
+        Raises:
+            RuntimeError: 풀이 종료되었거나 timeout 동안 브라우저를 얻지 못한 경우
+        """
+        deadline = time.monotonic() + timeout
+
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("브라우저 풀이 종료되었습니다")
+
+                # 연결이 끊긴 브라우저는 헬스 체크에서 재실행
+                candidates = [
+                    b for b in self._browsers if not b.retiring and b.is_alive()
+                ]
+                if not candidates:
+                    # 사용 중인 컨텍스트가 없는 재시작 대상은 바로 재시작
+                    idle = [b for b in self._browsers if b.retiring and b.active == 0]
+                    if idle:
+                        await self._restart(idle[0], "컨텍스트 생성 횟수 초과")
+                        candidates = [idle[0]]
+
+                if candidates:
+                    pooled = min(candidates, key=lambda b: b.active)
+                    pooled.active += 1
+                    pooled.contexts_served += 1
+                    return BrowserLease(
+                        pooled=pooled,
+                        generation=pooled.generation,
+                        browser=pooled.browser,
+                    )
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError("사용 가능한 브라우저가 없습니다 (타임아웃)")
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, lease: BrowserLease) -> None:
+        """빌린 브라우저 반납 (재시작 대상이면 마지막 반납 시 재시작)"""
+        async with self._cond:
+            pooled = lease.pooled
+            # 대여 이후 재시작된 경우 카운트는 이미 초기화됨
+            if lease.generation == pooled.generation:
+                pooled.active = max(0, pooled.active - 1)
+                if pooled.retiring and pooled.active == 0 and not self._closed:
+                    try:
+                        await self._restart(pooled, "컨텍스트 생성 횟수 초과")
+                    except Exception as e:
+                        logger.error(f"❌ 브라우저 #{pooled.index} 재시작 실패: {e}")
+            self._cond.notify_all()
+
+    # -------------------------------------------------------------------------
+    # 헬스 체크
+    # -------------------------------------------------------------------------
+
+    async def check_health(self) -> int:
+        """연결이 끊긴 브라우저를 찾아 재실행
+
+        Returns:
+            int: 재실행한 브라우저 개수
+        """
+        restarted = 0
+        async with self._cond:
+            if self._closed:
+                return 0
+            for pooled in self._browsers:
+                if pooled.is_alive():
+                    continue
+                retries_total.inc("browser_relaunch")
+                try:
+                    await self._restart(pooled, "헬스 체크 실패")
+                    restarted += 1
+                except Exception as e:
+                    logger.error(f"❌ 브라우저 #{pooled.index} 재실행 실패: {e}")
+            if restarted:
+                self._cond.notify_all()
+        return restarted
+
+    def stats(self) -> dict:
+        """풀 상태 요약"""
+        now = time.monotonic()
+        return {
+            "size": self.size,
+            "max_contexts": self.max_contexts,
+            "browsers": [
+                {
+                    "index": b.index,
+                    "alive": b.is_alive(),
+                    "active": b.active,
+                    "contexts_served": b.contexts_served,
+                    "uptime": round(now - b.launched_at, 1),
+                }
+                for b in self._browsers
+            ],
+        }
+
+
+@asynccontextmanager
+async def acquire_browser(
+    pool: Optional[BrowserPool], headless: bool = True
+) -> AsyncIterator[Any]:
+    """테스트에서 사용할 브라우저 확보
+
+    풀이 있으면 풀에서 빌리고, 없으면(CLI 실행 등) 새로 실행한 뒤 종료 시 닫습니다.
+
+    Yields:
+        Browser: Playwright Browser
+    """
+    if pool is not None:
+        lease = await pool.acquire()
+        try:
+            yield lease.browser
+        finally:
+            await pool.release(lease)
+        return
+
+    async with async_playwright() as p:
+        browser = await launch_browser(p, headless=headless)
+        try:
+            yield browser
+        finally:
+            await browser.close()
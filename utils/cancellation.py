@@ -0,0 +1,94 @@
+# utils/cancellation.py
+"""테스트 실행 취소 토큰
+
+run 하나에 CancelToken 하나를 만들어 테스트 함수에 넘기면, BrowserContext의
+실행 상태(run_state.cancel_token)에 연결되어 utils 함수들이 page만으로 확인할 수 있습니다.
+
+- 취소 요청: cancel(reason) (클라이언트 연결 끊김, DELETE /test/runs/{id})
+- 제한 시간: CancelToken(deadline=초) - 시간이 지나면 스스로 취소
+- 안전 지점: run_step() 시작, 조건 대기(utils.wait_engine) 시작, 상태 폴링 루프에서
+  check_cancelled()가 RunCancelled를 발생시킴
+- 취소 콜백: add_callback()으로 등록 (RunManager는 실행 중인 태스크를 바로 취소)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+from utils.run_state import get_run_state
+
+
+class RunCancelled(Exception):
+    """실행이 취소됨 (취소 요청 또는 제한 시간 초과)"""
+
+
+class CancelToken:
+    """run 하나의 취소 상태
+
+    Args:
+        deadline: 제한 시간 (초, 생성 시점부터, None이면 제한 없음).
+                  지정하면 실행 중인 이벤트 루프에서 생성해야 합니다.
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.reason: Optional[str] = None
+        self.deadline_at: Optional[float] = None
+        self._callbacks: List[Callable[[str], None]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        if deadline:
+            self.deadline_at = time.monotonic() + deadline
+            self._timer = asyncio.get_running_loop().call_later(
+                deadline, self.cancel, f"제한 시간 초과 ({deadline:.0f}초)"
+            )
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """제한 시간까지 남은 시간 (초, 제한 없으면 None)"""
+        if self.deadline_at is None:
+            return None
+        return self.deadline_at - time.monotonic()
+
+    def cancel(self, reason: str = "취소 요청") -> None:
+        """취소 (이미 취소되었으면 무시)"""
+        if self.cancelled:
+            return
+        self.reason = reason
+        self.close()
+        for callback in self._callbacks:
+            callback(reason)
+
+    def add_callback(self, callback: Callable[[str], None]) -> None:
+        """취소 시 호출할 콜백 등록 (이미 취소되었으면 바로 호출)"""
+        if self.cancelled:
+            callback(self.reason)
+        else:
+            self._callbacks.append(callback)
+
+    def check(self) -> None:
+        """취소되었으면 RunCancelled 발생"""
+        if self.cancelled:
+            raise RunCancelled(f"테스트 취소됨: {self.reason}")
+
+    def close(self) -> None:
+        """제한 시간 타이머 해제 (실행 종료 시)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+def get_cancel_token(page_or_context) -> Optional[CancelToken]:
+    """이 실행의 취소 토큰 (없으면 None)"""
+    return get_run_state(page_or_context).cancel_token
+
+
+def check_cancelled(page_or_context) -> None:
+    """안전 지점: 이 실행이 취소되었으면 RunCancelled 발생"""
+    token = get_cancel_token(page_or_context)
+    if token is not None:
+        token.check()
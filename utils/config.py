@@ -1,4 +1,5 @@
 # utils/config.py
+import json
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -21,13 +22,135 @@ PERSO_URL = os.getenv('PERSO_URL', 'https://perso.ai/ko/workspace/vt')
 # Playwright 설정
 HEADLESS = os.getenv('HEADLESS', 'true').lower() == 'true'
 
+# 브라우저 풀 설정 (웹 서버 전용, CLI 실행 시에는 사용하지 않음)
+BROWSER_POOL_ENABLED = os.getenv('BROWSER_POOL_ENABLED', 'true').lower() == 'true'
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '2'))
+# 브라우저 하나가 컨텍스트를 N개 생성하면 재시작 (메모리 누수 방지)
+BROWSER_POOL_MAX_CONTEXTS = int(os.getenv('BROWSER_POOL_MAX_CONTEXTS', '50'))
+# 헬스 체크 주기 (초)
+BROWSER_POOL_HEALTH_INTERVAL = float(os.getenv('BROWSER_POOL_HEALTH_INTERVAL', '30'))
+
+# run 작업 큐 설정 (웹 서버 전용)
+# 동시에 실행할 테스트 수 (기본값: 브라우저 풀 크기)
+RUN_CONCURRENCY = int(os.getenv('RUN_CONCURRENCY', str(BROWSER_POOL_SIZE)))
+# 대기열 최대 길이 (넘으면 새 요청 거절)
+RUN_QUEUE_MAX = int(os.getenv('RUN_QUEUE_MAX', '20'))
+# run 하나의 제한 시간 (초, 실행 시작부터, 0이면 제한 없음) - 넘으면 취소
+RUN_DEADLINE = float(os.getenv('RUN_DEADLINE', '2400'))
+
+# 로그 스트리밍 설정 (WebSocket)
+# 로그를 모아서 보내는 주기 (ms)와 프레임 하나의 최대 줄 수 (다 차면 바로 전송)
+LOG_BATCH_INTERVAL_MS = int(os.getenv('LOG_BATCH_INTERVAL_MS', '200'))
+LOG_BATCH_MAX_LINES = int(os.getenv('LOG_BATCH_MAX_LINES', '50'))
+# 구독자별 전송 대기 로그 최대 줄 수 (느린 클라이언트는 오래된 로그부터 버림)
+LOG_SUBSCRIBER_BUFFER = int(os.getenv('LOG_SUBSCRIBER_BUFFER', '1000'))
+# run별로 메모리에 유지하는 최근 로그 줄 수 (전체 로그는 run 아티팩트 run_log.jsonl에 기록)
+RUN_LOG_BUFFER = int(os.getenv('RUN_LOG_BUFFER', '2000'))
+
+# 라이브 보기 설정 (CDP screencast, 웹 서버 전용)
+SCREENCAST_ENABLED = os.getenv('SCREENCAST_ENABLED', 'false').lower() == 'true'
+# 최대 프레임 속도 (run당 캡처/인코딩 상한), 동시에 라이브 보기할 수 있는 run 수
+SCREENCAST_MAX_FPS = int(os.getenv('SCREENCAST_MAX_FPS', '5'))
+SCREENCAST_MAX_SESSIONS = int(os.getenv('SCREENCAST_MAX_SESSIONS', '2'))
+# JPEG 품질 (시작값/최저값, 느린 연결에서는 최저값까지 낮춤), 최대 가로 크기 (px)
+SCREENCAST_QUALITY = int(os.getenv('SCREENCAST_QUALITY', '60'))
+SCREENCAST_MIN_QUALITY = int(os.getenv('SCREENCAST_MIN_QUALITY', '30'))
+SCREENCAST_MAX_WIDTH = int(os.getenv('SCREENCAST_MAX_WIDTH', '1280'))
+
+# 요청 차단 설정 (HubSpot/분석/웹폰트 등 테스트와 무관한 요청 차단)
+REQUEST_FILTER_ENABLED = os.getenv('REQUEST_FILTER_ENABLED', 'true').lower() == 'true'
+# 기본 규칙에 더할 차단/허용 도메인 (쉼표 구분, "suite:도메인"이면 해당 suite에만 적용, 허용이 차단보다 우선)
+REQUEST_FILTER_BLOCK = [d.strip() for d in os.getenv('REQUEST_FILTER_BLOCK', '').split(',') if d.strip()]
+REQUEST_FILTER_ALLOW = [d.strip() for d in os.getenv('REQUEST_FILTER_ALLOW', '').split(',') if d.strip()]
+# suite별 차단할 리소스 타입 (JSON, font/image/media)
+REQUEST_FILTER_RESOURCE_TYPES = json.loads(os.getenv(
+    'REQUEST_FILTER_RESOURCE_TYPES',
+    '{"login": ["font", "image", "media"], "upload": ["font", "media"], "translate": ["font", "media"]}',
+))
+
+# 팝업 사전 차단 설정 (쿠키 배너/HubSpot/Driver.js 튜토리얼)
+POPUP_SUPPRESSION_ENABLED = os.getenv('POPUP_SUPPRESSION_ENABLED', 'true').lower() == 'true'
+# 미리 심어둘 localStorage 플래그 (JSON, 예: {"tutorial_done": "true"})
+POPUP_SUPPRESSION_LOCAL_STORAGE = json.loads(os.getenv('POPUP_SUPPRESSION_LOCAL_STORAGE', '{}'))
+
+# 로그인 세션 캐시 설정 (storage_state 재사용)
+SESSION_CACHE_ENABLED = os.getenv('SESSION_CACHE_ENABLED', 'true').lower() == 'true'
+SESSION_CACHE_TTL = int(os.getenv('SESSION_CACHE_TTL', '3600'))  # 초
+SESSION_CACHE_DIR = Path(os.getenv('SESSION_CACHE_DIR', '/tmp/perso_sessions'))
+
+# 대기 엔진 설정
+# 단계(STEP)별 마감 시간 (초, 0이면 제한 없음) - 넘기면 이후 조건 대기가 즉시 실패
+STEP_DEADLINE = float(os.getenv('STEP_DEADLINE', '120'))
+# 단계별 대기/동작 시간 계측 (로그 + 결과 메트릭 "wait_profile")
+WAIT_PROFILING = os.getenv('WAIT_PROFILING', 'false').lower() == 'true'
+
+# 실패 시 trace 저장 (단계별 chunk를 순환 보관하다가 실패한 실행만 run 아티팩트로 저장)
+TRACE_ON_FAILURE = os.getenv('TRACE_ON_FAILURE', 'false').lower() == 'true'
+# 보관할 최근 chunk(단계) 수, DOM 스냅샷/스크린샷 포함 여부 (끄면 동작/네트워크만 기록)
+TRACE_KEEP_CHUNKS = int(os.getenv('TRACE_KEEP_CHUNKS', '3'))
+TRACE_SNAPSHOTS = os.getenv('TRACE_SNAPSHOTS', 'true').lower() == 'true'
+
+# PERSO 페이지 성능 측정 (Navigation Timing, LCP/CLS/long task, JS 힙 - 결과 메트릭 "web_vitals")
+WEB_VITALS_ENABLED = os.getenv('WEB_VITALS_ENABLED', 'true').lower() == 'true'
+
+# 네트워크 요청 기록 (문서/API 요청별 DNS/연결/TTFB/다운로드 시간, 실패 시 HAR 저장)
+NETWORK_RECORDER_ENABLED = os.getenv('NETWORK_RECORDER_ENABLED', 'false').lower() == 'true'
+# 유지할 최근 요청 수, 결과 메트릭에 넣을 가장 느린 요청 수
+NETWORK_RECORDER_MAX_ENTRIES = int(os.getenv('NETWORK_RECORDER_MAX_ENTRIES', '2000'))
+NETWORK_SLOWEST_COUNT = int(os.getenv('NETWORK_SLOWEST_COUNT', '10'))
+
+# run 기록 저장소 (SQLite, 웹 서버 전용) - 단계별 소요 시간 백분위수/실패율 조회 (GET /history/...)
+HISTORY_ENABLED = os.getenv('HISTORY_ENABLED', 'true').lower() == 'true'
+HISTORY_DB_PATH = Path(os.getenv('HISTORY_DB_PATH', '/tmp/perso_history.sqlite3'))
+# 일괄 기록 주기 (초)와 크기 (다 차면 주기 전이라도 기록), 보관 기간 (일, 0이면 계속 보관)
+HISTORY_FLUSH_INTERVAL = float(os.getenv('HISTORY_FLUSH_INTERVAL', '2'))
+HISTORY_BATCH_SIZE = int(os.getenv('HISTORY_BATCH_SIZE', '50'))
+HISTORY_RETENTION_DAYS = float(os.getenv('HISTORY_RETENTION_DAYS', '90'))
+
+# 업로드 대기 설정 (업로드 요청 감시)
+# 파일 선택 후 첫 업로드 요청을 기다릴 시간 (초, 넘으면 화면 안정화 대기로 대체)
+UPLOAD_START_TIMEOUT = float(os.getenv('UPLOAD_START_TIMEOUT', '15'))
+# 업로드 전체 제한 시간 (초)
+UPLOAD_TIMEOUT = float(os.getenv('UPLOAD_TIMEOUT', '300'))
+
+# 영상 처리 대기 설정 (번역 테스트)
+# 영상 처리 전체 제한 시간 (초)
+VIDEO_PROCESSING_TIMEOUT = float(os.getenv('VIDEO_PROCESSING_TIMEOUT', '1800'))
+# 상태 push가 없을 때 직접 확인하는 주기 (초)
+VIDEO_STATUS_POLL_INTERVAL = float(os.getenv('VIDEO_STATUS_POLL_INTERVAL', '10'))
+
 # Teams 알림 설정
 TEAMS_WEBHOOK_URL = os.getenv('TEAMS_WEBHOOK_URL', '')
 APP_BASE_URL = os.getenv('APP_BASE_URL', 'http://localhost:8000')
+# 알림 발송 대기열(outbox) 저장 경로 (서버 재시작 후에도 미발송 알림 재전송)
+TEAMS_OUTBOX_DIR = Path(os.getenv('TEAMS_OUTBOX_DIR', '/tmp/perso_teams_outbox'))
+# 최대 전송 시도 횟수 (넘으면 outbox의 failed/로 이동)
+TEAMS_MAX_ATTEMPTS = int(os.getenv('TEAMS_MAX_ATTEMPTS', '8'))
+# 재시도 대기 시간 (초, 지수 백오프 시작값/최댓값, 지터 적용)
+TEAMS_RETRY_BASE = float(os.getenv('TEAMS_RETRY_BASE', '2'))
+TEAMS_RETRY_MAX = float(os.getenv('TEAMS_RETRY_MAX', '300'))
+# CLI 실행 시 종료 전에 outbox를 비우며 기다리는 최대 시간 (초)
+TEAMS_SYNC_DRAIN_TIMEOUT = float(os.getenv('TEAMS_SYNC_DRAIN_TIMEOUT', '30'))
+# 요약(digest) 모드 (웹 서버 전용): 결과를 모아서 카드 하나로 전송, 상태 변화(성공 <-> 실패)만 즉시 전송
+TEAMS_DIGEST_ENABLED = os.getenv('TEAMS_DIGEST_ENABLED', 'false').lower() == 'true'
+# 요약 카드 전송 주기 (초)와 최대 결과 수 (다 차면 주기 전이라도 전송)
+TEAMS_DIGEST_WINDOW = float(os.getenv('TEAMS_DIGEST_WINDOW', '3600'))
+TEAMS_DIGEST_MAX_RUNS = int(os.getenv('TEAMS_DIGEST_MAX_RUNS', '50'))
+# 카드 JSON 최대 크기 (바이트, Teams 제한 28KB보다 작게) - 넘으면 실행 로그를 줄임
+TEAMS_CARD_MAX_BYTES = int(os.getenv('TEAMS_CARD_MAX_BYTES', '20000'))
+# 카드에 남길 실행 로그 앞/뒤 줄 수 (에러 로그는 항상 유지)
+TEAMS_LOG_KEEP_LINES = int(os.getenv('TEAMS_LOG_KEEP_LINES', '30'))
+# 요약 카드의 실패 메시지 최대 길이 (첫 줄만, 문자 수)
+TEAMS_DIGEST_MESSAGE_CHARS = int(os.getenv('TEAMS_DIGEST_MESSAGE_CHARS', '200'))
 
-# 스크린샷 저장 경로
-SCREENSHOT_DIR = Path("/tmp/screenshots")
-SCREENSHOT_DIR.mkdir(exist_ok=True)
+# 아티팩트(스크린샷/trace/로그) 저장 경로 - run ID별 하위 디렉토리, /screenshots로 서빙
+ARTIFACT_DIR = Path(os.getenv('ARTIFACT_DIR', '/tmp/screenshots'))
+ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+# 전체 크기 제한 (MB, 넘으면 오래 사용되지 않은 run부터 삭제, 0이면 제한 없음)
+ARTIFACT_MAX_MB = float(os.getenv('ARTIFACT_MAX_MB', '500'))
+# run 보관 기간 (초, 0이면 제한 없음)
+ARTIFACT_MAX_AGE = float(os.getenv('ARTIFACT_MAX_AGE', str(3 * 24 * 3600)))
+SCREENSHOT_DIR = ARTIFACT_DIR  # 기존 이름 (호환용)
 
 def get_current_time() -> str:
     """현재 시간을 반환합니다.
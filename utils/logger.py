@@ -1,40 +1,214 @@
+# utils/logger.py
+"""테스트 로거와 실행 로그 저장소
+
+create_logger()가 만든 log 함수는 메시지마다 구조화된 LogRecord(단조 시각, 단계,
+레벨, 메시지, 소요 시간)를 만들어 log_collector에 넘깁니다.
+
+- RunLog: 최근 capacity줄만 메모리(링 버퍼)에 두고 전체 로그는 파일(JSON Lines)에 기록
+- 단계 이름: utils.steps.run_step()이 log_step에 설정 (같은 태스크/스레드의 로그에 자동 기록)
+- 레벨: log(msg, level=...)로 지정하거나 메시지 앞 이모지로 추정 (❌ error, ⚠️ warning)
+"""
+
+from __future__ import annotations
+
 import asyncio
-from typing import Callable, List, Optional
+import json
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Iterator, List, Optional, Set, TextIO, Union
+
+# 전송 중인 로그 태스크 (GC로 취소되지 않도록 참조 유지)
+_pending_sends: Set[asyncio.Task] = set()
+
+# 진행 중인 단계 이름 (utils.steps.run_step()이 설정)
+log_step: ContextVar[Optional[str]] = ContextVar("log_step", default=None)
+
+
+# =============================================================================
+# 로그 레코드
+# =============================================================================
+
+
+@dataclass
+class LogRecord:
+    """로그 한 줄
+
+    Attributes:
+        ts: 기록 시각 (time.monotonic, 단계별 시간 계산용)
+        wall_time: 기록 시각 (time.time, 표시용)
+        level: "info" | "warning" | "error"
+        message: 메시지
+        step: 기록 당시 진행 중인 단계 이름 (단계 밖이면 None)
+        duration: 소요 시간 (초, 단계 종료 로그 등에서만)
+    """
+
+    ts: float
+    wall_time: float
+    level: str
+    message: str
+    step: Optional[str] = None
+    duration: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        data = {
+            "ts": round(self.ts, 3),
+            "time": round(self.wall_time, 3),
+            "level": self.level,
+            "step": self.step,
+            "message": self.message,
+        }
+        if self.duration is not None:
+            data["duration"] = round(self.duration, 3)
+        return data
+
+
+def _guess_level(msg: str) -> str:
+    """메시지 앞 이모지로 레벨 추정"""
+    stripped = msg.lstrip()
+    if stripped.startswith("❌"):
+        return "error"
+    if stripped.startswith("⚠️"):
+        return "warning"
+    return "info"
+
+
+class RunLog:
+    """실행 하나의 로그 (최근 로그 링 버퍼 + 전체 로그 파일)
+
+    메모리에는 최근 capacity줄만 유지하므로 한 시간씩 폴링하는 번역 테스트도
+    실행당 메모리 사용량이 일정합니다. 전체 로그는 spill_path에 JSON Lines로 기록됩니다.
+
+    Args:
+        capacity: 메모리에 유지할 최대 줄 수
+        spill_path: 전체 로그 파일 경로 (None이면 파일에 기록하지 않음)
+    """
+
+    def __init__(self, capacity: int, spill_path: Optional[Path] = None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.total = 0
+        self._records: Deque[LogRecord] = deque(maxlen=capacity)
+        self._file: Optional[TextIO] = None
+
+    def add(self, record: LogRecord) -> None:
+        self._records.append(record)
+        self.total += 1
+        if self.spill_path is None:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.spill_path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+        except OSError:
+            # 파일 기록 실패 시 메모리 버퍼만 사용
+            self.spill_path = None
+
+    def append(self, msg: str) -> None:
+        """문자열 로그 추가 (기존 list 기반 log_collector 호환)"""
+        self.add(LogRecord(time.monotonic(), time.time(), _guess_level(msg), msg, log_step.get()))
+
+    @property
+    def dropped(self) -> int:
+        """메모리에서 밀려난 줄 수 (파일에는 남아있음)"""
+        return self.total - len(self._records)
+
+    def records(self, level: Optional[str] = None, step: Optional[str] = None) -> List[LogRecord]:
+        """메모리에 남아있는 레코드 (level/step으로 필터)"""
+        return [
+            r for r in self._records
+            if (level is None or r.level == level) and (step is None or r.step == step)
+        ]
+
+    def messages(self) -> List[str]:
+        """메모리에 남아있는 메시지 (Teams 알림용)"""
+        return [r.message for r in self._records]
+
+    def close(self) -> None:
+        """전체 로그 파일 닫기"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.messages())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+# =============================================================================
+# 로거
+# =============================================================================
 
 
 def create_logger(
     log_callback: Optional[Callable] = None,
-    log_collector: Optional[List[str]] = None,
+    log_collector: Optional[Union[RunLog, List[str]]] = None,
 ):
     """테스트용 로거 생성
 
+    log 함수는 워커 스레드에서 호출해도 안전합니다. 코루틴 콜백은 로거를 만든
+    이벤트 루프(서버 루프)로 넘겨서 실행하고, 일반 콜백은 그대로 호출하므로
+    콜백 자체가 스레드 안전해야 합니다 (api.runs.Run.publish_log).
+
     Args:
         log_callback: WebSocket 등으로 로그 전송할 콜백 함수
-        log_collector: 로그를 수집할 리스트 (Teams 알림용)
+        log_collector: 로그를 수집할 RunLog (구조화된 레코드) 또는 리스트 (문자열)
 
     Returns:
-        log 함수
+        log 함수 (log(msg, level=None, duration=None))
     """
+    try:
+        owner_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        owner_loop = None
+
+    def send_async(msg: str):
+        """코루틴 콜백 실행 (호출한 스레드의 이벤트 루프 유무에 따라 전달 방식 선택)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None and (owner_loop is None or loop is owner_loop):
+            # 같은 이벤트 루프에서 호출되었으므로 바로 태스크로 전송
+            task = loop.create_task(log_callback(msg))
+            _pending_sends.add(task)
+            task.add_done_callback(_pending_sends.discard)
+        elif owner_loop is not None and not owner_loop.is_closed():
+            # 다른 스레드에서 호출됨: 로거를 만든 이벤트 루프로 넘김
+            asyncio.run_coroutine_threadsafe(log_callback(msg), owner_loop)
+        elif loop is None:
+            # 이벤트 루프가 없는 CLI 환경
+            asyncio.run(log_callback(msg))
 
-    def log(msg: str):
+    def log(msg: str, level: Optional[str] = None, duration: Optional[float] = None):
         """콘솔 출력 + 콜백 전송 + 로그 수집"""
         print(msg)
 
         # 로그 수집 (Teams 알림용)
-        if log_collector is not None:
+        if isinstance(log_collector, RunLog):
+            log_collector.add(LogRecord(
+                ts=time.monotonic(),
+                wall_time=time.time(),
+                level=level or _guess_level(msg),
+                message=msg,
+                step=log_step.get(),
+                duration=duration,
+            ))
+        elif log_collector is not None:
             log_collector.append(msg)
 
         if log_callback:
             if asyncio.iscoroutinefunction(log_callback):
                 try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        asyncio.create_task(log_callback(msg))
-                    else:
-                        asyncio.run(log_callback(msg))
+                    send_async(msg)
                 except Exception:
                     pass
             else:
                 log_callback(msg)
 
-    return log
\ No newline at end of file
+    return log
@@ -1,14 +1,29 @@
-import time
+import json
 
-def do_login(page, log):
+from utils.cancellation import RunCancelled
+from utils.metrics import retries_total
+from utils.popup_suppression import add_consent_cookies, get_popup_suppression
+from utils.session_cache import session_cache
+from utils.wait_engine import wait_for_dom_quiet, wait_for_load_state, wait_for_url, wait_for_visible
+from utils.steps import StepDeadlineExceeded, timed_span
+from utils.web_vitals import collect_web_vitals
+
+
+@timed_span("login")
+async def do_login(page, log, use_session_cache=True):
     """PERSO AI 로그인 공통 함수
 
     로그인 페이지에서 workspace 페이지로 이동하고 화면이 로드될 때까지 대기합니다.
     프로필 확인 등의 검증은 수행하지 않습니다.
 
+    use_session_cache=True이면 캐시된 세션(storage_state)을 먼저 복원해보고,
+    만료되었거나 검증에 실패하면 실제 로그인 플로우로 진행합니다.
+    로그인 성공 시 세션은 항상 캐시에 저장됩니다.
+
     Args:
         page: Playwright page 객체
         log: 로그 출력 함수 (callable)
+        use_session_cache: 캐시된 세션 재사용 여부 (로그인 테스트는 False로 강제 로그인)
 
     Returns:
         None
@@ -16,52 +31,168 @@ def do_login(page, log):
     Raises:
         Exception: 로그인 실패 시
     """
+    from utils.config import PERSO_EMAIL, SESSION_CACHE_ENABLED
+
+    if use_session_cache and SESSION_CACHE_ENABLED:
+        storage_state = session_cache.get(PERSO_EMAIL)
+        if storage_state:
+            if await _restore_session(page, storage_state, log):
+                log("✅ 로그인 완료! (세션 재사용)")
+                return
+            session_cache.invalidate(PERSO_EMAIL)
+            await _clear_session(page)
+            retries_total.inc("login_fallback")
+
+    await _login_with_credentials(page, log)
+
+    await _wait_for_workspace_ready(page, log)
+
+    # 다음 테스트에서 재사용할 세션 저장
+    try:
+        session_cache.save(PERSO_EMAIL, await page.context.storage_state())
+    except Exception as e:
+        log(f"  ⚠️ 세션 저장 실패: {e}")
+
+    log("✅ 로그인 완료!")
+
+
+async def _login_with_credentials(page, log):
+    """이메일/비밀번호 로그인 플로우 (private)"""
     from utils.config import PERSO_EMAIL, PERSO_PASSWORD
 
     log("📍 로그인 페이지 접속 중...")
-    page.goto('https://perso.ai/ko/login', timeout=60000)
-    page.wait_for_load_state('networkidle')
+    await page.goto('https://perso.ai/ko/login', timeout=60000)
+    if not await wait_for_load_state(page, 'networkidle', timeout=30000, label="로그인 페이지 로딩"):
+        raise Exception("로그인 페이지 로딩 시간 초과 (networkidle)")
+    await collect_web_vitals(page, "login_page", log)
 
     log("📝 이메일 입력 중...")
     email_input = page.locator('input[type="email"], input[placeholder*="이메일"]')
-    email_input.fill(PERSO_EMAIL)
-    time.sleep(0.5)
+    await email_input.fill(PERSO_EMAIL)
 
     log("👆 계속 버튼 클릭...")
     continue_button = page.locator('button:has-text("계속")')
-    continue_button.click()
-    time.sleep(2)
+    await continue_button.click()
 
     log("🔐 비밀번호 입력 중...")
     password_input = page.locator('input[type="password"]')
-    password_input.fill(PERSO_PASSWORD)
-    time.sleep(0.5)
+    await wait_for_visible(page, password_input, timeout=10000, label="비밀번호 입력창")
+    await password_input.fill(PERSO_PASSWORD)
 
     log("🚪 Enter 키로 로그인 제출...")
-    password_input.press('Enter')
+    await password_input.press('Enter')
 
     log("⏳ 로그인 처리 중...")
-    page.wait_for_url('**/workspace/**', timeout=15000)
+    if not await wait_for_url(page, '**/workspace/**', timeout=15000, label="로그인 후 workspace 이동"):
+        raise Exception(f"로그인 후 workspace로 이동하지 않음 (현재 URL: {page.url})")
+
 
-    # 화면 로딩 대기
+async def _wait_for_workspace_ready(page, log):
+    """workspace 화면 로딩 대기 (private)"""
     log("⏳ 페이지 로딩 대기 중...")
 
     # 1. 네트워크 idle 대기
-    try:
-        page.wait_for_load_state('networkidle', timeout=10000)
+    if await wait_for_load_state(page, 'networkidle', timeout=10000, label="workspace 네트워크 idle"):
         log("  ✓ 네트워크 로딩 완료")
-    except:
+    else:
         log("  ⚠️ 네트워크 타임아웃 (계속 진행)")
 
     # 2. 주요 UI 요소 로드 확인
-    try:
-        page.wait_for_selector('text=AI Dubbing', state='visible', timeout=5000)
+    if await wait_for_visible(page, 'text=AI Dubbing', timeout=5000, label="workspace 주요 UI"):
         log("  ✓ 주요 UI 요소 로드 완료")
-    except:
+    else:
         log("  ⚠️ 일부 요소 로딩 지연")
 
-    # 3. 추가 안정화
+    # 3. 화면 안정화 (DOM 변경이 멈출 때까지)
     log("  ✓ 화면 안정화 중...")
-    time.sleep(2)
+    await wait_for_dom_quiet(page, quiet_ms=500, timeout=3000, label="workspace 안정화")
+    await collect_web_vitals(page, "workspace", log)
 
-    log("✅ 로그인 완료!")
+
+async def _restore_session(page, storage_state, log):
+    """캐시된 세션 복원 후 workspace 접근 가능 여부 확인 (private)
+
+    Returns:
+        bool: 세션이 유효하면 True
+    """
+    from utils.config import PERSO_URL
+
+    log("♻️ 캐시된 로그인 세션 복원 중...")
+    context = page.context
+
+    cookies = storage_state.get("cookies", [])
+    if cookies:
+        await context.add_cookies(cookies)
+
+    # localStorage는 origin별로 init script에서 복원 (탭당 한 번만)
+    origins = storage_state.get("origins", [])
+    if origins:
+        await context.add_init_script(script=_LOCAL_STORAGE_RESTORE_SCRIPT % {
+            "origins": _to_js_origins(origins),
+        })
+
+    try:
+        await page.goto(PERSO_URL, timeout=60000, wait_until='domcontentloaded')
+
+        # 세션이 만료되었으면 로그인 페이지로 리다이렉트됨
+        if "/login" in page.url:
+            log("  ⚠️ 세션 만료 (로그인 페이지로 이동됨)")
+            return False
+
+        if not await wait_for_visible(page, 'text=AI Dubbing', timeout=5000, label="복원 세션 workspace UI"):
+            log("  ⚠️ workspace 화면이 보이지 않음")
+            return False
+        if "/workspace" not in page.url:
+            log(f"  ⚠️ workspace 페이지가 아님: {page.url}")
+            return False
+    except (RunCancelled, StepDeadlineExceeded):
+        raise
+    except Exception as e:
+        log(f"  ⚠️ 세션 검증 실패: {e}")
+        return False
+
+    log("  ✓ 세션 유효")
+    await _wait_for_workspace_ready(page, log)
+    return True
+
+
+async def _clear_session(page):
+    """복원했던 쿠키/localStorage 제거 (private)
+
+    팝업 사전 차단의 동의 쿠키는 다시 심어서 새 로그인에서 쿠키 배너가 뜨지 않게 합니다.
+    """
+    await page.context.clear_cookies()
+    if get_popup_suppression(page) is not None:
+        await add_consent_cookies(page.context)
+    try:
+        await page.evaluate("localStorage.clear()")
+    except Exception:
+        pass
+
+
+def _to_js_origins(origins):
+    """storage_state의 origins를 init script용 JSON으로 변환 (private)"""
+    return json.dumps([
+        {
+            "origin": o["origin"],
+            "localStorage": {item["name"]: item["value"] for item in o.get("localStorage", [])},
+        }
+        for o in origins
+    ])
+
+
+_LOCAL_STORAGE_RESTORE_SCRIPT = '''
+(() => {
+    try {
+        if (sessionStorage.getItem('__perso_session_restored')) return;
+        sessionStorage.setItem('__perso_session_restored', '1');
+        const origins = %(origins)s;
+        for (const o of origins) {
+            if (o.origin !== location.origin) continue;
+            for (const [k, v] of Object.entries(o.localStorage)) {
+                if (localStorage.getItem(k) === null) localStorage.setItem(k, v);
+            }
+        }
+    } catch (e) {}
+})();
+'''
@@ -0,0 +1,205 @@
+# utils/metrics.py
+"""Prometheus 메트릭 (GET /metrics, 텍스트 형식)
+
+프로세스 안에서 단계/구간 소요 시간 히스토그램과 run/실패/재시도 카운터를 모으고,
+/metrics 요청 때 Prometheus 텍스트 형식(0.0.4)으로 내보냅니다.
+외부 라이브러리 없이 필요한 만큼(Counter/Gauge/Histogram + 라벨)만 구현했습니다.
+
+- 단계: utils.steps.run_step()이 perso_step_duration_seconds{test_type, step}에 기록
+- 구간: utils.steps.span()/timed_span()이 perso_span_duration_seconds{test_type, span}에 기록
+- run: api.runs.RunManager가 run 종료 시 perso_runs_total{test_type, status}와 소요 시간 기록
+- 대기열/브라우저: /metrics 요청 때 RunManager/BrowserPool 상태로 게이지 갱신
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+# 단계/구간 소요 시간 버킷 (초) - 로그인 수 초 ~ 영상 처리 수십 분
+DEFAULT_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# =============================================================================
+# 메트릭 종류
+# =============================================================================
+
+
+class _Metric:
+    """라벨 값 조합별 값을 가진 메트릭 (스레드 안전)"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, values: Sequence[str]) -> Tuple[str, ...]:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name}: 라벨 {self.labels} 값이 필요합니다")
+        return tuple(str(v) for v in values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """증가만 하는 값 (예: run 수)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """현재 값 (예: 대기열 길이)"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """소요 시간 분포 (누적 버킷 + 합계 + 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 라벨 값 -> (버킷별 개수, 합계, 개수)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+# =============================================================================
+# 레지스트리
+# =============================================================================
+
+
+class MetricsRegistry:
+    """등록된 메트릭 모음"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식으로 출력"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전역 레지스트리와 메트릭
+registry = MetricsRegistry()
+
+step_duration = registry.register(Histogram(
+    "perso_step_duration_seconds", "테스트 단계(STEP) 소요 시간", ("test_type", "step"),
+))
+step_failures = registry.register(Counter(
+    "perso_step_failures_total", "실패한 테스트 단계 수", ("test_type", "step"),
+))
+span_duration = registry.register(Histogram(
+    "perso_span_duration_seconds", "주요 utils 호출 소요 시간", ("test_type", "span"),
+))
+run_duration = registry.register(Histogram(
+    "perso_run_duration_seconds", "run 실행 시간 (대기열 대기 제외)", ("test_type",),
+))
+runs_total = registry.register(Counter(
+    "perso_runs_total", "종료된 run 수", ("test_type", "status"),
+))
+retries_total = registry.register(Counter(
+    "perso_retries_total", "재시도 횟수 (Teams 알림 재전송, 브라우저 재시작, 상태 확인 재시도)", ("kind",),
+))
+queue_depth = registry.register(Gauge(
+    "perso_run_queue_depth", "대기열에 있는 run 수",
+))
+runs_running = registry.register(Gauge(
+    "perso_runs_running", "실행 중인 run 수",
+))
+browsers_active = registry.register(Gauge(
+    "perso_browsers_active", "실행 중인(연결된) 풀 브라우저 수",
+))
+browser_contexts_active = registry.register(Gauge(
+    "perso_browser_contexts_active", "풀 브라우저에서 사용 중인 컨텍스트 수",
+))
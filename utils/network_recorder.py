@@ -0,0 +1,347 @@
+# utils/network_recorder.py
+"""run별 네트워크 요청 기록 (요청별 지연 시간 분해 + 실패 시 HAR)
+
+로그인 후 workspace 이동이 타임아웃되거나 업로드가 느릴 때 어느 백엔드 호출이
+원인인지 알 수 있도록, 문서/API(xhr, fetch) 요청의 단계별 시간을 기록합니다.
+
+- 기록: requestfinished/requestfailed 이벤트에서 request.timing으로 DNS, 연결(TLS 포함),
+  TTFB(요청 전송 ~ 첫 바이트), 다운로드 시간 계산 (최근 NETWORK_RECORDER_MAX_ENTRIES개)
+- 진행 중: request 이벤트부터 추적해서, 끝나지 않은 요청(멈춘 백엔드 호출)도 경과 시간과 함께
+  요약/HAR에 포함 (pending)
+- 분류: URL/메서드로 엔드포인트 그룹 지정 (auth, upload, project_create, status_polling, ...)
+- 결과: run 메트릭 "network" (그룹별 요약 + 가장 느린 요청)
+- 실패 시: save_network_har()가 본문/헤더를 뺀 HAR(network.har)를 run 아티팩트로 저장
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+from utils.artifacts import artifact_store
+from utils.config import NETWORK_RECORDER_MAX_ENTRIES, NETWORK_SLOWEST_COUNT
+from utils.run_state import get_run_state
+
+HAR_FILENAME = "network.har"
+
+# 기록할 리소스 타입 (정적 리소스는 제외)
+RECORDED_RESOURCE_TYPES = frozenset({"document", "xhr", "fetch"})
+
+# API 엔드포인트 그룹 (위에서부터 처음 일치하는 그룹, 메서드가 None이면 모든 메서드)
+ENDPOINT_GROUPS: Tuple[Tuple[str, Optional[frozenset], Pattern[str]], ...] = (
+    ("auth", None, re.compile(r"/(auth|login|logout|token|session|oauth|sign-?in|users?/me)\b", re.I)),
+    ("upload", frozenset({"POST", "PUT", "PATCH"}),
+     re.compile(r"/(upload|files?|media|presigned)\b|amazonaws\.com|storage\.googleapis\.com|blob\.core", re.I)),
+    ("project_create", frozenset({"POST"}), re.compile(r"/(projects?|videos?|spaces?|dubbing|translat\w*)\b", re.I)),
+    ("status_polling", frozenset({"GET"}),
+     re.compile(r"/(status|progress|projects?|videos?|spaces?|workspaces?)\b", re.I)),
+)
+
+
+def classify_request(method: str, url: str, resource_type: str) -> str:
+    """요청의 엔드포인트 그룹 (페이지 문서는 "document", 일치하는 그룹이 없으면 "api")"""
+    if resource_type == "document":
+        return "document"
+    for group, methods, pattern in ENDPOINT_GROUPS:
+        if (methods is None or method in methods) and pattern.search(url):
+            return group
+    return "api"
+
+
+def _span(timing: dict, start: str, end: str) -> Optional[float]:
+    """request.timing의 두 시점 사이 시간 (ms, 값이 없으면 None)"""
+    a, b = timing.get(start, -1), timing.get(end, -1)
+    if a is None or b is None or a < 0 or b < 0:
+        return None
+    return max(b - a, 0.0)
+
+
+def _strip_query(url: str) -> str:
+    """쿼리/fragment 제외 (토큰 등이 결과에 남지 않도록)"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    index = max(math.ceil(q / 100 * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+@dataclass
+class RequestRecord:
+    """요청 하나의 기록 (시간은 ms, 값이 없으면 None)
+
+    Attributes:
+        started_at: 요청 시작 시각 (epoch ms)
+        method: HTTP 메서드
+        url: 요청 URL (쿼리 제외)
+        resource_type: document | xhr | fetch
+        group: 엔드포인트 그룹
+        status: HTTP 상태 (응답이 없으면 None)
+        failure: 실패 이유 (requestfailed)
+        pending: 아직 끝나지 않은 요청 (total은 지금까지의 경과 시간)
+        dns: DNS 조회
+        connect: TCP/TLS 연결
+        ttfb: 요청 전송 ~ 첫 응답 바이트 (서버 처리 시간 포함)
+        download: 첫 바이트 ~ 응답 완료
+        total: 요청 시작 ~ 응답 완료
+    """
+
+    started_at: float
+    method: str
+    url: str
+    resource_type: str
+    group: str
+    status: Optional[int] = None
+    failure: Optional[str] = None
+    pending: bool = False
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    ttfb: Optional[float] = None
+    download: Optional[float] = None
+    total: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "group": self.group,
+            "status": self.status,
+            "failure": self.failure,
+            "pending": self.pending,
+            **{
+                key: round(value, 1) if value is not None else None
+                for key, value in (("dns", self.dns), ("connect", self.connect), ("ttfb", self.ttfb),
+                                   ("download", self.download), ("total", self.total))
+            },
+        }
+
+    def to_har_entry(self) -> dict:
+        """HAR 1.2 entry (헤더/본문 제외)"""
+        timings = {
+            "blocked": -1,
+            "dns": round(self.dns, 1) if self.dns is not None else -1,
+            "connect": round(self.connect, 1) if self.connect is not None else -1,
+            "send": 0,
+            "wait": round(self.ttfb, 1) if self.ttfb is not None else -1,
+            "receive": round(self.download, 1) if self.download is not None else -1,
+            "ssl": -1,
+        }
+        started = datetime.fromtimestamp(self.started_at / 1000, tz=timezone.utc)
+        entry = {
+            "startedDateTime": started.isoformat(),
+            "time": round(self.total, 1) if self.total is not None else 0,
+            "request": {
+                "method": self.method, "url": self.url, "httpVersion": "",
+                "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1,
+            },
+            "response": {
+                "status": self.status or 0, "statusText": self.failure or "", "httpVersion": "",
+                "headers": [], "cookies": [], "content": {"size": -1, "mimeType": ""},
+                "redirectURL": "", "headersSize": -1, "bodySize": -1,
+            },
+            "cache": {},
+            "timings": timings,
+            "_group": self.group,
+            "_resourceType": self.resource_type,
+        }
+        if self.failure:
+            entry["_failure"] = self.failure
+        if self.pending:
+            entry["_pending"] = True
+        return entry
+
+
+class NetworkRecorder:
+    """컨텍스트 하나의 네트워크 기록 (run_state.metrics["network"])
+
+    Args:
+        context: Playwright BrowserContext
+        max_entries: 유지할 최근 요청 수
+        slowest_count: 결과에 넣을 가장 느린 요청 수
+    """
+
+    def __init__(self, context, max_entries: int = 2000, slowest_count: int = 10):
+        self.context = context
+        self.max_entries = max_entries
+        self.slowest_count = slowest_count
+        self.total = 0
+        self._records: Deque[RequestRecord] = deque(maxlen=max_entries)
+        # 진행 중인 요청: id(request) -> [request, 시작 시각(epoch ms), 시작(monotonic), 응답 상태]
+        self._pending: Dict[int, list] = {}
+
+    def install(self) -> None:
+        self.context.on("request", self._on_request)
+        self.context.on("response", self._on_response)
+        self.context.on("requestfinished", self._on_finished)
+        self.context.on("requestfailed", self._on_failed)
+        self.context.on("close", self._on_close)
+
+    # -------------------------------------------------------------------------
+    # 이벤트
+    # -------------------------------------------------------------------------
+
+    def _on_request(self, request) -> None:
+        if request.resource_type not in RECORDED_RESOURCE_TYPES:
+            return
+        if len(self._pending) >= self.max_entries:
+            # 끝나지 않은 채 쌓이는 요청(롱 폴링 등)은 오래된 것부터 버림
+            self._pending.pop(next(iter(self._pending)))
+        self._pending[id(request)] = [request, time.time() * 1000, time.monotonic(), None]
+
+    def _on_response(self, response) -> None:
+        pending = self._pending.get(id(response.request))
+        if pending is not None:
+            pending[3] = response.status
+
+    def _on_finished(self, request) -> None:
+        self._record(request, None)
+
+    def _on_failed(self, request) -> None:
+        self._record(request, request.failure or "failed")
+
+    def _on_close(self, _context=None) -> None:
+        self._pending.clear()
+
+    def _record(self, request, failure: Optional[str]) -> None:
+        pending = self._pending.pop(id(request), None)
+        if request.resource_type not in RECORDED_RESOURCE_TYPES:
+            return
+        status = pending[3] if pending else None
+        timing = request.timing or {}
+        url = _strip_query(request.url)
+        total = timing.get("responseEnd", -1)
+        self._records.append(RequestRecord(
+            started_at=timing.get("startTime") or (pending[1] if pending else 0.0),
+            method=request.method,
+            url=url,
+            resource_type=request.resource_type,
+            group=classify_request(request.method, url, request.resource_type),
+            status=status,
+            failure=failure,
+            dns=_span(timing, "domainLookupStart", "domainLookupEnd"),
+            connect=_span(timing, "connectStart", "connectEnd"),
+            ttfb=_span(timing, "requestStart", "responseStart"),
+            download=_span(timing, "responseStart", "responseEnd"),
+            total=total if total is not None and total >= 0 else None,
+        ))
+        self.total += 1
+
+    # -------------------------------------------------------------------------
+    # 결과
+    # -------------------------------------------------------------------------
+
+    def pending(self) -> List[RequestRecord]:
+        """아직 끝나지 않은 요청 (경과 시간이 긴 순서)"""
+        now = time.monotonic()
+        records = []
+        for request, started_at, started, status in self._pending.values():
+            url = _strip_query(request.url)
+            records.append(RequestRecord(
+                started_at=started_at,
+                method=request.method,
+                url=url,
+                resource_type=request.resource_type,
+                group=classify_request(request.method, url, request.resource_type),
+                status=status,
+                pending=True,
+                total=(now - started) * 1000,
+            ))
+        return sorted(records, key=lambda r: r.total, reverse=True)
+
+    def groups(self) -> Dict[str, dict]:
+        """엔드포인트 그룹별 요약 (요청 수, 실패/진행 중 수, 끝난 요청의 전체 시간/TTFB p50/p95)"""
+        grouped: Dict[str, List[RequestRecord]] = {}
+        for record in self._records:
+            grouped.setdefault(record.group, []).append(record)
+        pending_counts: Dict[str, int] = {}
+        for record in self.pending():
+            grouped.setdefault(record.group, [])
+            pending_counts[record.group] = pending_counts.get(record.group, 0) + 1
+
+        summary = {}
+        for group, records in sorted(grouped.items()):
+            totals = sorted(r.total for r in records if r.total is not None)
+            ttfbs = sorted(r.ttfb for r in records if r.ttfb is not None)
+            summary[group] = {
+                "requests": len(records) + pending_counts.get(group, 0),
+                "failed": sum(1 for r in records if r.failure or (r.status or 0) >= 400),
+                "pending": pending_counts.get(group, 0),
+                "total_p50": round(_percentile(totals, 50), 1) if totals else None,
+                "total_p95": round(_percentile(totals, 95), 1) if totals else None,
+                "ttfb_p50": round(_percentile(ttfbs, 50), 1) if ttfbs else None,
+                "ttfb_p95": round(_percentile(ttfbs, 95), 1) if ttfbs else None,
+            }
+        return summary
+
+    def slowest(self) -> List[RequestRecord]:
+        """가장 오래 걸린 요청 (진행 중인 요청은 지금까지의 경과 시간으로 비교)"""
+        timed = [r for r in self._records if r.total is not None] + self.pending()
+        return sorted(timed, key=lambda r: r.total, reverse=True)[:self.slowest_count]
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.total,
+            "kept": len(self._records),
+            "groups": self.groups(),
+            "slowest": [r.to_dict() for r in self.slowest()],
+            "pending": [r.to_dict() for r in self.pending()[:self.slowest_count]],
+        }
+
+    def to_har(self) -> dict:
+        return {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "perso-auto-tester", "version": "1.0.0"},
+                "pages": [],
+                "entries": [r.to_har_entry() for r in list(self._records) + self.pending()],
+            }
+        }
+
+
+# =============================================================================
+# 헬퍼
+# =============================================================================
+
+
+def install_network_recorder(context) -> NetworkRecorder:
+    """컨텍스트에 네트워크 기록 설치 (create_browser_context에서 NETWORK_RECORDER_ENABLED일 때)"""
+    recorder = NetworkRecorder(
+        context, max_entries=NETWORK_RECORDER_MAX_ENTRIES, slowest_count=NETWORK_SLOWEST_COUNT
+    )
+    recorder.install()
+    get_run_state(context).metrics["network"] = recorder
+    return recorder
+
+
+def save_network_har(page_or_context, log=None) -> Optional[str]:
+    """실패 시 기록한 요청을 HAR로 저장 (네트워크 기록이 없으면 아무것도 하지 않음)
+
+    Returns:
+        str: 저장 경로 ("<run_id>/network.har", /screenshots 기준), 저장하지 않으면 None
+    """
+    state = get_run_state(page_or_context)
+    recorder = state.metrics.get("network")
+    if not isinstance(recorder, NetworkRecorder):
+        return None
+
+    _log = log if log else print
+    har = recorder.to_har()
+    saved = artifact_store.write_text(
+        state.run_id or "local", HAR_FILENAME, json.dumps(har, ensure_ascii=False), kind="har"
+    )
+    if saved:
+        pending = recorder.pending()
+        _log(f"🌐 네트워크 기록 저장: {saved} (요청 {len(har['log']['entries'])}개, 진행 중 {len(pending)}개)")
+        for record in recorder.slowest()[:3]:
+            status = "진행 중" if record.pending else record.status
+            _log(f"  🐢 {record.total:.0f}ms {record.method} {record.url} ({record.group}, {status})")
+    return saved
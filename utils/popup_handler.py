@@ -1,9 +1,18 @@
 import time
 from utils.logger import create_logger
+from utils.probe import first_visible
+from utils.wait_engine import wait_for_dom_quiet, wait_for_hidden, wait_for_visible
+from utils.popup_suppression import (
+    FALLBACK_COST_ESTIMATE,
+    find_leaked_popups,
+    get_popup_suppression,
+    refresh_suppression_counts,
+)
+from utils.steps import timed_span
 
 _default_log = create_logger()
 
-def accept_cookies(page, log=None):
+async def accept_cookies(page, log=None):
     """쿠키 수락 처리"""
     log = log or _default_log
     log("🍪 쿠키 배너 확인 중...")
@@ -18,32 +27,28 @@ def accept_cookies(page, log=None):
             'button:has-text("모두 동의")',
         ]
 
-        for selector in cookie_button_selectors:
-            try:
-                button = page.locator(selector).first
-                if button.is_visible(timeout=2000):
-                    button.click(force=True)
-                    log("✅ 쿠키 수락 완료")
-                    time.sleep(1)
-                    return True
-            except:
-                continue
-
-        log("ℹ️  쿠키 배너 없음")
+        probe = await first_visible(page, cookie_button_selectors, timeout=2000, label="쿠키 동의 버튼")
+        if probe:
+            await probe.locator.click(force=True)
+            log(f"✅ 쿠키 수락 완료 ({probe.selector}, {probe.elapsed:.1f}초)")
+            await wait_for_hidden(page, probe.locator, timeout=2000, label="쿠키 배너 닫힘")
+            return True
+
+        log(f"ℹ️  쿠키 배너 없음 ({probe.elapsed:.1f}초)")
         return False
 
     except Exception as e:
         log(f"⚠️  쿠키 처리 중 에러: {e}")
         return False
 
-def close_hubspot_iframe_popup(page, log=None):
+async def close_hubspot_iframe_popup(page, log=None):
     """HubSpot iframe 팝업 닫기"""
     log = log or _default_log
     log("🔍 HubSpot iframe 팝업 확인 중...")
 
     try:
         # iframe 자체를 강제로 제거
-        page.evaluate('''
+        await page.evaluate('''
             const iframes = document.querySelectorAll('iframe[title*="Popup"], iframe[id*="hs-"]');
             iframes.forEach(iframe => {
                 if (iframe.parentElement) {
@@ -54,71 +59,111 @@ def close_hubspot_iframe_popup(page, log=None):
             });
         ''')
         log("✅ HubSpot iframe 제거")
-        time.sleep(1)
         return True
     except Exception as e:
         log(f"ℹ️  HubSpot iframe 없음: {e}")
         return False
 
-def close_all_popups(page, log=None):
-    """모든 팝업/모달/오버레이 닫기"""
+# 한 번의 page.evaluate로 닫을 수 있는 팝업을 모두 찾아 닫는 스크립트
+# (패스마다 settle_ms 대기 후 새로 나타난 팝업을 다시 확인, 최대 max_passes회)
+_SWEEP_POPUPS_SCRIPT = '''
+async ({maxPasses, settleMs, maxSize, overlaySelectors}) => {
+    const visible = el => {
+        const r = el.getBoundingClientRect();
+        const s = getComputedStyle(el);
+        return r.width > 0 && r.height > 0 && s.visibility !== 'hidden' && s.display !== 'none';
+    };
+    const describe = el => {
+        let d = el.tagName.toLowerCase();
+        if (el.id) d += '#' + el.id;
+        const cls = (typeof el.className === 'string' ? el.className : '').trim().split(/\s+/).filter(Boolean);
+        if (cls.length) d += '.' + cls.slice(0, 2).join('.');
+        const label = el.getAttribute('aria-label');
+        if (label) d += `[aria-label="${label}"]`;
+        return d;
+    };
+    const isCloseButton = b => {
+        const text = (b.innerText || '').trim();
+        const label = (b.getAttribute('aria-label') || '').toLowerCase();
+        return (text.length <= 2 && (text.includes('×') || text.includes('✕'))) || label === 'close';
+    };
+
+    const closed = [];
+    const clicked = new Set();
+    for (let pass = 0; pass < maxPasses; pass++) {
+        let found = 0;
+
+        for (const selector of overlaySelectors) {
+            document.querySelectorAll(selector).forEach(el => {
+                closed.push({kind: 'overlay', target: describe(el)});
+                el.remove();
+                found++;
+            });
+        }
+
+        for (const button of document.querySelectorAll('button')) {
+            if (clicked.has(button) || !visible(button) || !isCloseButton(button)) continue;
+            const r = button.getBoundingClientRect();
+            if (r.width >= maxSize || r.height >= maxSize) continue;
+            clicked.add(button);
+            const modal = button.closest('[role="dialog"], [aria-modal="true"], [class*="modal" i]');
+            button.click();
+            closed.push({kind: modal ? 'modal' : 'close_button', target: describe(modal || button)});
+            found++;
+        }
+
+        if (!found) break;
+        await new Promise(resolve => setTimeout(resolve, settleMs));
+    }
+    return closed;
+}
+'''
+
+# 버튼 없이 바로 제거하는 오버레이
+_SWEEP_OVERLAY_SELECTORS = [
+    '#hs-interactives-modal-overlay',
+    '.driver-overlay',
+]
+
+
+async def close_all_popups(page, log=None):
+    """모든 팝업/모달/오버레이 닫기
+
+    작은 X 버튼(50px 미만), 모달, 오버레이를 한 번의 page.evaluate로 찾아서
+    일괄로 닫습니다. 닫은 뒤 새로 나타난 팝업도 같은 호출 안에서 다시 확인합니다.
+
+    Args:
+        page: Playwright page 객체
+        log: 로그 출력 함수 (optional)
+
+    Returns:
+        list: 닫은 요소 목록 (예: [{"kind": "modal", "target": "div.modal"}])
+    """
     log = log or _default_log
     log("🔍 모든 팝업/오버레이 확인 중...")
 
-    closed_count = 0
-    max_attempts = 5
-
-    for attempt in range(max_attempts):
-        found_close_button = False
+    try:
+        closed = await page.evaluate(_SWEEP_POPUPS_SCRIPT, {
+            "maxPasses": 5,
+            "settleMs": 300,
+            "maxSize": 50,
+            "overlaySelectors": _SWEEP_OVERLAY_SELECTORS,
+        })
+    except Exception as e:
+        log(f"⚠️  팝업 확인 중 에러: {e}")
+        return []
 
-        # X 버튼 찾기
-        close_selectors = [
-            'button:has-text("×")',
-            'button:has-text("✕")',
-            'button[aria-label="Close"]',
-            'button[aria-label="close"]',
-        ]
+    for item in closed:
+        log(f"  ✓ 닫음 ({item['kind']}): {item['target']}")
 
-        for selector in close_selectors:
-            try:
-                buttons = page.locator(selector)
-                count = buttons.count()
-
-                if count > 0:
-                    for i in range(count):
-                        button = buttons.nth(i)
-                        try:
-                            if button.is_visible(timeout=1000):
-                                box = button.bounding_box()
-                                if box and box['width'] < 50 and box['height'] < 50:
-                                    button.click(force=True, timeout=3000)
-                                    closed_count += 1
-                                    found_close_button = True
-                                    log(f"✅ 팝업 {closed_count}개 닫음")
-                                    time.sleep(1)
-                                    break
-                        except:
-                            continue
-
-                if found_close_button:
-                    break
-
-            except:
-                continue
-
-        if not found_close_button:
-            break
-
-        time.sleep(0.5)
-
-    if closed_count > 0:
-        log(f"✅ 총 {closed_count}개의 팝업을 닫았습니다")
+    if closed:
+        log(f"✅ 총 {len(closed)}개의 팝업을 닫았습니다")
     else:
         log("ℹ️  닫을 팝업이 없습니다")
 
-    return closed_count > 0
+    return closed
 
-def remove_hubspot_overlay(page, log=None):
+async def remove_hubspot_overlay(page, log=None):
     """HubSpot 오버레이 제거
 
     Args:
@@ -132,13 +177,12 @@ def remove_hubspot_overlay(page, log=None):
     log("🧹 HubSpot 오버레이 제거 중...")
 
     try:
-        page.evaluate('''
+        await page.evaluate('''
             const overlay = document.querySelector('#hs-interactives-modal-overlay');
             if (overlay) overlay.remove();
             const container = document.querySelector('#hs-web-interactives-top-anchor');
             if (container) container.remove();
         ''')
-        time.sleep(1)
 
         log("✅ HubSpot 오버레이 제거 완료!")
         return True
@@ -146,14 +190,14 @@ def remove_hubspot_overlay(page, log=None):
         log(f"⚠️ HubSpot 오버레이 제거 실패: {e}")
         return False
 
-def close_tutorial_popup(page, log=None):
+async def close_tutorial_popup(page, log=None):
     """튜토리얼/가이드 팝업 닫기 (Driver.js, 일반 가이드 팝업 등)"""
     log = log or _default_log
     log("📚 튜토리얼 팝업 확인 중...")
 
     try:
         # 1. Driver.js 오버레이 강제 제거
-        page.evaluate('''
+        await page.evaluate('''
             const driverOverlay = document.querySelector('.driver-overlay');
             if (driverOverlay) driverOverlay.remove();
             
@@ -163,7 +207,6 @@ def close_tutorial_popup(page, log=None):
             document.body.classList.remove('driver-active');
             document.body.style.overflow = '';
         ''')
-        time.sleep(0.5)
 
         # 2. Next 버튼 찾아서 클릭
         next_selectors = [
@@ -173,17 +216,12 @@ def close_tutorial_popup(page, log=None):
         ]
 
         next_clicked = False
-        for selector in next_selectors:
-            try:
-                button = page.locator(selector).first
-                if button.is_visible(timeout=2000):
-                    log("  ✓ Next 버튼 발견!")
-                    button.click(force=True)
-                    time.sleep(1.5)
-                    next_clicked = True
-                    break
-            except:
-                continue
+        probe = await first_visible(page, next_selectors, timeout=2000, label="튜토리얼 다음 버튼")
+        if probe:
+            log(f"  ✓ Next 버튼 발견! ({probe.selector}, {probe.elapsed:.1f}초)")
+            await probe.locator.click(force=True)
+            await wait_for_dom_quiet(page, quiet_ms=300, timeout=2000, label="튜토리얼 다음 단계")
+            next_clicked = True
 
         # 3. Done/Close 버튼 찾아서 클릭
         done_selectors = [
@@ -194,17 +232,12 @@ def close_tutorial_popup(page, log=None):
         ]
 
         done_clicked = False
-        for selector in done_selectors:
-            try:
-                button = page.locator(selector).first
-                if button.is_visible(timeout=2000):
-                    log("  ✓ Done/Close 버튼 발견!")
-                    button.click(force=True)
-                    time.sleep(1)
-                    done_clicked = True
-                    break
-            except:
-                continue
+        probe = await first_visible(page, done_selectors, timeout=2000, label="튜토리얼 완료 버튼")
+        if probe:
+            log(f"  ✓ Done/Close 버튼 발견! ({probe.selector}, {probe.elapsed:.1f}초)")
+            await probe.locator.click(force=True)
+            await wait_for_hidden(page, probe.locator, timeout=2000, label="튜토리얼 닫힘")
+            done_clicked = True
 
         # 4. 결과 로그
         if next_clicked and done_clicked:
@@ -222,9 +255,13 @@ def close_tutorial_popup(page, log=None):
         log(f"⚠️  튜토리얼 처리 중 에러: {e}")
         return False
     
-def close_all_modals_and_popups(page, log=None):
+@timed_span("close_popups")
+async def close_all_modals_and_popups(page, log=None):
     """모든 팝업/모달/오버레이 한 번에 정리
 
+    팝업 사전 차단(utils.popup_suppression)이 설치되어 있고 남은 팝업이 없으면
+    개별 닫기 단계를 모두 건너뜁니다. 남은 팝업이 있을 때만 기존 방식으로 정리합니다.
+
     Args:
         page: Playwright page 객체
         log: 로그 출력 함수 (optional)
@@ -235,43 +272,69 @@ def close_all_modals_and_popups(page, log=None):
     log = log or _default_log
     log("🧹 팝업/모달 정리 시작...")
 
+    suppression = get_popup_suppression(page)
+    if suppression is not None:
+        await refresh_suppression_counts(page, suppression)
+        try:
+            leaked = await find_leaked_popups(page)
+        except Exception as e:
+            log(f"  ⚠️ 팝업 확인 실패: {e}")
+            leaked = ["unknown"]
+
+        if not leaked:
+            saved = sum(FALLBACK_COST_ESTIMATE.values())
+            suppression.skipped_runs += 1
+            suppression.estimated_saved_seconds += saved
+            removed = sum(suppression.removed.values())
+            log(f"✅ 팝업 사전 차단됨 (제거 {removed}개) - 정리 생략, 약 {saved:.0f}초 절약")
+            await page.evaluate("window.scrollTo(0, 0)")
+            return
+
+        suppression.leaked.extend(k for k in leaked if k not in suppression.leaked)
+        log(f"  ⚠️ 차단되지 않은 팝업 발견: {', '.join(leaked)} → 기존 방식으로 정리")
+
+    fallback_start = time.monotonic()
+
     # 1. 쿠키 수락
     try:
-        accept_cookies(page, log)
+        await accept_cookies(page, log)
     except Exception as e:
         log(f"  ⚠️ 쿠키 수락 실패: {e}")
 
     # 2. HubSpot iframe 제거
     try:
-        close_hubspot_iframe_popup(page, log)
+        await close_hubspot_iframe_popup(page, log)
     except Exception as e:
         log(f"  ⚠️ HubSpot iframe 실패: {e}")
 
     # 3. HubSpot 오버레이 제거
     try:
-        remove_hubspot_overlay(page, log)
+        await remove_hubspot_overlay(page, log)
     except Exception as e:
         log(f"  ⚠️ HubSpot 오버레이 실패: {e}")
 
     # 4. 모든 팝업 닫기
     try:
-        close_all_popups(page, log)
+        await close_all_popups(page, log)
     except Exception as e:
         log(f"  ⚠️ 팝업 닫기 실패: {e}")
 
     # 5. 튜토리얼 팝업 닫기
     try:
-        close_tutorial_popup(page, log)
+        await close_tutorial_popup(page, log)
     except Exception as e:
         log(f"  ⚠️ 튜토리얼 닫기 실패: {e}")
 
     # 6. 맨 위로 스크롤
-    page.evaluate("window.scrollTo(0, 0)")
-    time.sleep(1)
+    await page.evaluate("window.scrollTo(0, 0)")
+
+    if suppression is not None:
+        suppression.fallback_runs += 1
+        suppression.fallback_seconds += time.monotonic() - fallback_start
 
     log("✅ 팝업/모달 정리 완료!")
 
-def prepare_and_check_translation_modal(page, log=None):
+async def prepare_and_check_translation_modal(page, log=None):
     """번역 설정 모달 확인 전 준비 및 검증
 
     HubSpot 오버레이를 제거하고 번역 설정 모달이 제대로 표시되었는지 확인
@@ -289,26 +352,22 @@ def prepare_and_check_translation_modal(page, log=None):
     log = log or _default_log
 
     # 1. HubSpot 오버레이 제거
-    remove_hubspot_overlay(page, log)
-
-    time.sleep(2)  # 모달 렌더링 대기
+    await remove_hubspot_overlay(page, log)
 
     # URL 및 페이지 상태 확인
     log(f"📍 현재 URL: {page.url}")
 
-    # 2. 번역 설정 모달 찾기
+    # 2. 번역 설정 모달 찾기 (렌더링될 때까지 대기)
     log("🔍 번역 설정 모달 찾는 중...")
 
-    try:
-        # ✅ 이렇게 변경! (기존 if page.locator 제거)
-        page.wait_for_selector('text=번역 언어', state='visible', timeout=10000)
+    if await wait_for_visible(page, 'text=번역 언어', timeout=10000, label="번역 설정 모달"):
         log("  ✅ 번역 설정 모달 발견!")
         return True
-    except TimeoutError:
-        log("  ⚠️ 번역 설정 모달을 찾지 못했습니다 (10초 대기)")
-        raise Exception("번역 설정 모달 확인 실패")
 
-def handle_permission_modal(page, log=None):
+    log("  ⚠️ 번역 설정 모달을 찾지 못했습니다 (10초 대기)")
+    raise Exception("번역 설정 모달 확인 실패")
+
+async def handle_permission_modal(page, log=None):
     """권한 안내 모달 처리
     
     Args:
@@ -319,19 +378,20 @@ def handle_permission_modal(page, log=None):
     
     log("⏳ '서비스 이용 및 편집 권한 안내' 모달 확인 중...")
     try:
-        agree_button = page.locator('button:has-text("동의 후 진행")').first
-        
-        if agree_button.is_visible(timeout=5000):
-            log("  ✓ '동의 후 진행' 버튼 발견!")
-            agree_button.click(force=True)
-            time.sleep(3)
+        probe = await first_visible(page, ['button:has-text("동의 후 진행")'], timeout=5000,
+                                    label="권한 동의 모달")
+
+        if probe:
+            log(f"  ✓ '동의 후 진행' 버튼 발견! ({probe.elapsed:.1f}초)")
+            await probe.locator.click(force=True)
+            await wait_for_hidden(page, probe.locator, timeout=5000, label="권한 안내 모달 닫힘")
             log("✅ 권한 동의 완료!")
         else:
             log("ℹ️  권한 안내 모달 없음")
     except Exception as e:
         log(f"ℹ️  권한 안내 처리: {e}")
 
-def close_translation_settings_modal(page, log=None):
+async def close_translation_settings_modal(page, log=None):
     """번역 설정 모달 닫기
     
     Args:
@@ -341,6 +401,6 @@ def close_translation_settings_modal(page, log=None):
     log = log or _default_log
     
     log("🔍 번역 설정 모달 닫기...")
-    page.keyboard.press("Escape")
-    time.sleep(2)
+    await page.keyboard.press("Escape")
+    await wait_for_dom_quiet(page, quiet_ms=300, timeout=2000, label="번역 설정 모달 닫힘")
     log("✅ 번역 설정 모달 닫힘")
\ No newline at end of file
@@ -0,0 +1,190 @@
+# utils/popup_suppression.py
+"""팝업 사전 차단 (init script + 동의 쿠키 + localStorage 플래그)
+
+쿠키 배너, HubSpot interactives, Driver.js 튜토리얼을 뜬 다음에 닫는 대신
+컨텍스트 생성 시점에 아예 나타나지 않도록 막습니다.
+
+- 동의 쿠키: 쿠키 배너가 "이미 동의함"으로 판단하도록 미리 설정
+- localStorage 플래그: 튜토리얼 완료 등 (POPUP_SUPPRESSION_LOCAL_STORAGE)
+- init script: 팝업 요소를 CSS로 숨기고 MutationObserver로 삽입 즉시 제거
+
+기존 popup_handler의 닫기 함수들은 차단되지 않은 팝업이 남아있을 때만 폴백으로 실행됩니다.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from utils.config import POPUP_SUPPRESSION_LOCAL_STORAGE
+from utils.run_state import get_run_state
+
+# 쿠키 배너 동의 상태로 미리 심어둘 쿠키 (HubSpot 쿠키 배너)
+CONSENT_COOKIES = [
+    {"name": "__hs_cookie_cat_pref", "value": "1:true,2:true,3:true"},
+    {"name": "__hs_initial_opt_in", "value": "true"},
+    {"name": "__hs_opt_out", "value": "no"},
+]
+CONSENT_COOKIE_DOMAIN = ".perso.ai"
+
+# 차단할 팝업 요소 (종류 -> CSS selector)
+SUPPRESSED_SELECTORS = {
+    "cookie_banner": "#hs-eu-cookie-confirmation, #onetrust-banner-sdk, .cookie-banner",
+    "hubspot": (
+        "#hs-interactives-modal-overlay, #hs-web-interactives-top-anchor, "
+        "#hs-web-interactives-floating-container, "
+        "iframe[title*='Popup'], iframe[id^='hs-']"
+    ),
+    "driver_tour": ".driver-overlay, .driver-popover",
+}
+
+# 폴백 닫기 함수가 팝업이 없을 때 소모하는 시간 추정치 (초, 프로브 타임아웃 + evaluate 왕복)
+FALLBACK_COST_ESTIMATE = {
+    "accept_cookies": 2.0,
+    "close_hubspot_iframe_popup": 0.1,
+    "remove_hubspot_overlay": 0.1,
+    "close_all_popups": 0.5,
+    "close_tutorial_popup": 2.0 + 2.0,
+}
+
+
+_INIT_SCRIPT = '''
+(() => {
+    const SELECTORS = %(selectors)s;
+    const LOCAL_STORAGE = %(local_storage)s;
+    const state = window.__persoPopupSuppression = window.__persoPopupSuppression || {removed: {}};
+
+    try {
+        for (const [k, v] of Object.entries(LOCAL_STORAGE)) {
+            if (localStorage.getItem(k) === null) localStorage.setItem(k, v);
+        }
+    } catch (e) {}
+
+    const allSelectors = Object.values(SELECTORS).join(', ');
+
+    const sweep = () => {
+        for (const [kind, selector] of Object.entries(SELECTORS)) {
+            document.querySelectorAll(selector).forEach(el => {
+                el.remove();
+                state.removed[kind] = (state.removed[kind] || 0) + 1;
+            });
+        }
+        if (document.body && document.body.classList.contains('driver-active')) {
+            document.body.classList.remove('driver-active');
+            document.body.style.overflow = '';
+        }
+    };
+
+    const install = () => {
+        const style = document.createElement('style');
+        style.textContent = allSelectors + ' { display: none !important; }';
+        (document.head || document.documentElement).appendChild(style);
+        sweep();
+        new MutationObserver(sweep).observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, attributeFilter: ['class'],
+        });
+    };
+
+    if (document.documentElement) install();
+    else document.addEventListener('DOMContentLoaded', install, {once: true});
+})();
+'''
+
+# 차단되지 않고 남은 팝업 확인 (폴백 실행 여부 판단)
+_LEAK_CHECK_SCRIPT = '''
+(selectors) => {
+    const visible = el => {
+        const r = el.getBoundingClientRect();
+        const s = getComputedStyle(el);
+        return r.width > 0 && r.height > 0 && s.visibility !== 'hidden' && s.display !== 'none';
+    };
+    const leaked = [];
+    for (const [kind, selector] of Object.entries(selectors)) {
+        if ([...document.querySelectorAll(selector)].some(visible)) leaked.push(kind);
+    }
+    const cookieWords = ['Accept', 'Accept all', '수락', '모두 수락', '모두 동의'];
+    const buttons = [...document.querySelectorAll('button')].filter(visible);
+    if (buttons.some(b => cookieWords.includes(b.innerText.trim()))) leaked.push('cookie_button');
+    const closeButtons = buttons.filter(b => {
+        const t = b.innerText.trim();
+        const label = (b.getAttribute('aria-label') || '').toLowerCase();
+        const r = b.getBoundingClientRect();
+        return (t === '×' || t === '✕' || label === 'close') && r.width < 50 && r.height < 50;
+    });
+    if (closeButtons.length) leaked.push('close_button');
+    if (buttons.some(b => ['Next', '다음', 'Done', '완료'].includes(b.innerText.trim())
+                        && b.closest('.driver-popover'))) leaked.push('driver_tour');
+    return [...new Set(leaked)];
+}
+'''
+
+
+@dataclass
+class PopupSuppressionStats:
+    """실행 하나의 팝업 사전 차단 결과"""
+
+    removed: Dict[str, int] = field(default_factory=dict)
+    fallback_runs: int = 0
+    fallback_seconds: float = 0.0
+    skipped_runs: int = 0
+    estimated_saved_seconds: float = 0.0
+    leaked: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "removed": dict(self.removed),
+            "fallback_runs": self.fallback_runs,
+            "fallback_seconds": round(self.fallback_seconds, 2),
+            "skipped_runs": self.skipped_runs,
+            "estimated_saved_seconds": round(self.estimated_saved_seconds, 2),
+            "leaked": list(self.leaked),
+        }
+
+
+async def add_consent_cookies(context) -> None:
+    """쿠키 배너 동의 쿠키 심기 (설치 시, 세션 쿠키를 지운 뒤 다시)"""
+    await context.add_cookies([
+        {**cookie, "domain": CONSENT_COOKIE_DOMAIN, "path": "/"}
+        for cookie in CONSENT_COOKIES
+    ])
+
+
+async def install_popup_suppression(context):
+    """BrowserContext에 팝업 사전 차단 설치
+
+    Returns:
+        PopupSuppressionStats: 차단 결과 (run_state.metrics["popup_suppression"]에도 저장)
+    """
+    await add_consent_cookies(context)
+    await context.add_init_script(script=_INIT_SCRIPT % {
+        "selectors": json.dumps(SUPPRESSED_SELECTORS),
+        "local_storage": json.dumps(POPUP_SUPPRESSION_LOCAL_STORAGE),
+    })
+
+    stats = PopupSuppressionStats()
+    get_run_state(context).metrics["popup_suppression"] = stats
+    return stats
+
+
+def get_popup_suppression(page):
+    """이 실행에 팝업 사전 차단이 설치되어 있으면 통계 객체 반환 (없으면 None)"""
+    return get_run_state(page).metrics.get("popup_suppression")
+
+
+async def find_leaked_popups(page) -> List[str]:
+    """사전 차단을 뚫고 화면에 남아있는 팝업 종류 목록"""
+    return await page.evaluate(_LEAK_CHECK_SCRIPT, SUPPRESSED_SELECTORS)
+
+
+async def refresh_suppression_counts(page, stats: PopupSuppressionStats) -> None:
+    """페이지에서 제거된 팝업 개수를 통계에 반영"""
+    try:
+        removed = await page.evaluate(
+            "() => (window.__persoPopupSuppression || {removed: {}}).removed"
+        )
+    except Exception:
+        return
+    for kind, count in (removed or {}).items():
+        # 페이지 이동 시 카운터가 초기화되므로 최댓값 유지
+        stats.removed[kind] = max(stats.removed.get(kind, 0), count)
@@ -0,0 +1,94 @@
+# utils/probe.py
+"""여러 selector 후보를 한 번에 확인하는 프로브
+
+selector 후보를 하나씩 is_visible로 확인하면 후보 수만큼 타임아웃이 누적됩니다.
+first_visible()은 후보마다 보이는 요소만 남긴 뒤(filter(visible=True)) locator.or_()로 묶어
+한 번만 대기하고 (앞쪽 DOM의 숨은 요소에 걸려 타임아웃까지 기다리지 않도록),
+어떤 후보가 매칭되었는지와 소요 시간을 함께 반환합니다.
+대기 시간은 utils.wait_engine과 같이 단계 마감 시간으로 줄어들고 단계 기록에 누적됩니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.wait_engine import clamp_timeout, record_wait
+
+
+@dataclass
+class ProbeResult:
+    """first_visible() 결과
+
+    Attributes:
+        matched: 후보 중 하나라도 보였는지 여부
+        index: 매칭된 후보 인덱스 (없으면 None)
+        selector: 매칭된 selector (없으면 None)
+        locator: 매칭된 요소의 locator (없으면 None)
+        elapsed: 프로브 소요 시간 (초)
+    """
+
+    matched: bool
+    index: Optional[int] = None
+    selector: Optional[str] = None
+    locator: Any = None
+    elapsed: float = 0.0
+
+    def __bool__(self) -> bool:
+        return self.matched
+
+
+async def first_visible(page, selectors: Sequence[str], timeout: float = 2000,
+                        label: Optional[str] = None) -> ProbeResult:
+    """후보 selector 중 먼저 보이는 요소 찾기
+
+    Args:
+        page: Playwright page 객체
+        selectors: 후보 selector 목록 (앞쪽이 우선)
+        timeout: 전체 대기 시간 (ms)
+        label: 계측용 대기 이름 (optional, 기본값: 첫 번째 후보)
+
+    Returns:
+        ProbeResult: 매칭 결과 (매칭 없거나 후보가 없으면 matched=False)
+    """
+    if not selectors:
+        return ProbeResult(matched=False)
+
+    label = label or f"probe: {selectors[0]}" + (f" 외 {len(selectors) - 1}개" if len(selectors) > 1 else "")
+    timeout = clamp_timeout(page, timeout)
+    start = time.monotonic()
+    # 숨은 요소(숨은 "Accept" 버튼, 화면 밖 모달 사본 등)는 후보에서 제외
+    locators = [page.locator(selector).filter(visible=True) for selector in selectors]
+
+    combined = locators[0]
+    for locator in locators[1:]:
+        combined = combined.or_(locator)
+
+    try:
+        await combined.first.wait_for(state="visible", timeout=timeout)
+    except PlaywrightTimeoutError:
+        record_wait(page, label, start, False)
+        return ProbeResult(matched=False, elapsed=time.monotonic() - start)
+    record_wait(page, label, start, True)
+
+    # 어떤 후보가 매칭되었는지 확인 (동시에 요청해서 왕복 1회 수준)
+    visible = await asyncio.gather(
+        *(locator.first.is_visible() for locator in locators),
+        return_exceptions=True,
+    )
+    for i, is_visible in enumerate(visible):
+        if is_visible is True:
+            return ProbeResult(
+                matched=True,
+                index=i,
+                selector=selectors[i],
+                locator=locators[i].first,
+                elapsed=time.monotonic() - start,
+            )
+
+    # 대기 직후 사라진 경우
+    return ProbeResult(matched=False, elapsed=time.monotonic() - start)
@@ -0,0 +1,197 @@
+# utils/request_filter.py
+"""테스트 중 불필요한 요청 차단 (context.route)
+
+HubSpot, 분석 스크립트, 웹폰트, 마케팅 이미지처럼 테스트가 검증하지 않는 요청을
+suite(login/upload/translate)별 규칙에 따라 차단합니다.
+networkidle 대기 시간과 동시 실행 시 대역폭을 줄이는 것이 목적입니다.
+
+- 도메인 차단: 차단 도메인(및 하위 도메인)으로 가는 모든 요청
+  (기본 목록 + REQUEST_FILTER_BLOCK, REQUEST_FILTER_ALLOW가 우선)
+- 리소스 타입 차단: REQUEST_FILTER_RESOURCE_TYPES의 suite별 타입 (PERSO 자체 리소스 포함)
+- 통계: 차단 요청 수, 도메인/타입별 집계 (응답을 받지 않으므로 바이트는 집계하지 않음)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlparse
+
+from utils.config import REQUEST_FILTER_ALLOW, REQUEST_FILTER_BLOCK, REQUEST_FILTER_RESOURCE_TYPES
+from utils.run_state import get_run_state
+
+# =============================================================================
+# 차단 규칙
+# =============================================================================
+
+# 모든 suite 공통 차단 도메인 (마케팅/분석/웹폰트)
+DEFAULT_BLOCKED_DOMAINS = frozenset({
+    "hubspot.com",
+    "hs-scripts.com",
+    "hs-analytics.net",
+    "hs-banner.com",
+    "hsforms.com",
+    "hsforms.net",
+    "hscollectedforms.net",
+    "hsadspixel.net",
+    "usemessages.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "clarity.ms",
+    "hotjar.com",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+})
+
+# 항상 허용하는 도메인 (PERSO 서비스 자체)
+DEFAULT_ALLOWED_DOMAINS = frozenset({
+    "perso.ai",
+})
+
+# 리소스 타입별 URL 확장자 (route 패턴을 좁혀 나머지 요청은 가로채지 않음)
+_RESOURCE_TYPE_EXTENSIONS = {
+    "font": ("woff2", "woff", "ttf", "otf", "eot"),
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "avif"),
+    "media": ("mp4", "webm", "mp3", "m4a", "ogg", "mov"),
+}
+
+
+@dataclass(frozen=True)
+class RouteRules:
+    """suite별 차단 규칙
+
+    Attributes:
+        blocked_domains: 차단할 도메인 (하위 도메인 포함)
+        allowed_domains: 도메인 차단 규칙보다 우선하는 허용 도메인
+        blocked_resource_types: 차단할 리소스 타입 (font, image, media)
+    """
+
+    blocked_domains: FrozenSet[str] = DEFAULT_BLOCKED_DOMAINS
+    allowed_domains: FrozenSet[str] = DEFAULT_ALLOWED_DOMAINS
+    blocked_resource_types: FrozenSet[str] = frozenset()
+
+
+def _domains_for(suite: str, entries: Iterable[str]) -> FrozenSet[str]:
+    """설정 값 중 모든 suite용("도메인")과 이 suite용("suite:도메인") 도메인"""
+    domains = set()
+    for entry in entries:
+        prefix, sep, domain = entry.rpartition(":")
+        if not sep:
+            domains.add(entry.lower())
+        elif prefix == suite:
+            domains.add(domain.lower())
+    return frozenset(domains)
+
+
+def build_suite_rules(suite: str) -> RouteRules:
+    """설정(REQUEST_FILTER_*)으로 suite 규칙 생성"""
+    return RouteRules(
+        blocked_domains=DEFAULT_BLOCKED_DOMAINS | _domains_for(suite, REQUEST_FILTER_BLOCK),
+        allowed_domains=DEFAULT_ALLOWED_DOMAINS | _domains_for(suite, REQUEST_FILTER_ALLOW),
+        blocked_resource_types=frozenset(REQUEST_FILTER_RESOURCE_TYPES.get(suite, ())),
+    )
+
+
+# 기본값 - login: 화면 요소만 확인하므로 이미지/미디어까지 차단
+# upload/translate: 좌표 기반 클릭이 있어 레이아웃에 영향이 적은 폰트/미디어만 차단
+SUITE_RULES: Dict[str, RouteRules] = {
+    suite: build_suite_rules(suite) for suite in ("login", "upload", "translate")
+}
+
+
+def _matches_domain(host: str, domains: FrozenSet[str]) -> Optional[str]:
+    """host가 domains 중 하나(또는 그 하위 도메인)이면 해당 도메인 반환"""
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return None
+
+
+def _build_route_pattern(rules: RouteRules) -> "re.Pattern[str]":
+    """가로챌 URL 패턴 (차단 도메인 + 차단 타입 확장자)"""
+    parts = []
+    if rules.blocked_domains:
+        domains = "|".join(re.escape(d) for d in sorted(rules.blocked_domains))
+        parts.append(rf"^https?://([^/]*\.)?({domains})(:\d+)?/")
+    extensions = [
+        ext
+        for rtype in sorted(rules.blocked_resource_types)
+        for ext in _RESOURCE_TYPE_EXTENSIONS.get(rtype, ())
+    ]
+    if extensions:
+        parts.append(rf"\.({'|'.join(extensions)})(\?|#|$)")
+    return re.compile("|".join(parts) if parts else r"^$")
+
+
+# =============================================================================
+# 통계
+# =============================================================================
+
+
+@dataclass
+class RequestFilterStats:
+    """실행 하나의 요청 차단 통계"""
+
+    suite: str
+    blocked_requests: int = 0
+    by_domain: Dict[str, int] = field(default_factory=dict)
+    by_resource_type: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, resource_type: str, domain: str) -> None:
+        self.blocked_requests += 1
+        self.by_domain[domain] = self.by_domain.get(domain, 0) + 1
+        self.by_resource_type[resource_type] = self.by_resource_type.get(resource_type, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "suite": self.suite,
+            "blocked_requests": self.blocked_requests,
+            "by_domain": dict(self.by_domain),
+            "by_resource_type": dict(self.by_resource_type),
+        }
+
+
+# =============================================================================
+# 설치
+# =============================================================================
+
+
+async def install_request_filter(context, suite: str, rules: Optional[RouteRules] = None):
+    """BrowserContext에 요청 차단 route 설치
+
+    Args:
+        context: Playwright BrowserContext
+        suite: 테스트 종류 ("login", "upload", "translate")
+        rules: 차단 규칙 (기본값: SUITE_RULES[suite], 설정에서 생성)
+
+    Returns:
+        RequestFilterStats: 이 실행의 차단 통계 (run_state.metrics["request_filter"]에도 저장)
+    """
+    rules = rules or SUITE_RULES.get(suite) or build_suite_rules(suite)
+    stats = RequestFilterStats(suite=suite)
+    get_run_state(context).metrics["request_filter"] = stats
+
+    async def _handle(route):
+        request = route.request
+        host = urlparse(request.url).hostname or ""
+
+        if _matches_domain(host, rules.allowed_domains) is None:
+            domain = _matches_domain(host, rules.blocked_domains)
+            if domain is not None:
+                stats.record(request.resource_type, domain)
+                await route.abort("blockedbyclient")
+                return
+
+        if request.resource_type in rules.blocked_resource_types:
+            stats.record(request.resource_type, host)
+            await route.abort("blockedbyclient")
+            return
+
+        # 다른 route 핸들러가 있으면 그쪽으로 넘김
+        await route.fallback()
+
+    await context.route(_build_route_pattern(rules), _handle)
+    return stats
@@ -0,0 +1,457 @@
+# utils/run_history.py
+"""run 기록 저장소 (SQLite)
+
+종료된 run을 로컬 SQLite DB(HISTORY_DB_PATH)에 남겨서 "이번 주 번역 테스트가
+느려졌나?" 같은 질문에 답할 수 있게 합니다.
+
+- 기록: run(결과/소요 시간/에러 메시지), 단계별 소요 시간, 아티팩트 목록,
+  PERSO 페이지 성능 값 (utils.web_vitals)
+- 인덱스: test_type + 시각, 시각, 결과(status) + 시각, 단계 이름
+- 쓰기: record()는 메모리 대기열에 넣기만 하고, 백그라운드 태스크가
+  HISTORY_FLUSH_INTERVAL초마다(또는 HISTORY_BATCH_SIZE개가 모이면) 한 트랜잭션으로
+  워커 스레드에서 기록 (run 실행 경로는 DB를 기다리지 않음)
+- 조회: 단계별 p50/p95/p99, 페이지 성능 p50/p95, 실패율, 가장 느린 run (GET /history/...)
+- 보관: HISTORY_RETENTION_DAYS일이 지난 기록은 시작 시 삭제
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import sqlite3
+import time
+from collections import deque
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.config import (
+    HISTORY_BATCH_SIZE,
+    HISTORY_DB_PATH,
+    HISTORY_FLUSH_INTERVAL,
+    HISTORY_RETENTION_DAYS,
+)
+
+logger = logging.getLogger(__name__)
+
+# 기록 대기열 최대 길이 (DB에 쓰지 못하는 동안 넘으면 오래된 기록부터 버림)
+MAX_PENDING = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    test_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL NOT NULL,
+    duration REAL,
+    message TEXT,
+    error TEXT,
+    screenshot TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_type_time ON runs (test_type, finished_at);
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (finished_at);
+CREATE INDEX IF NOT EXISTS idx_runs_status_time ON runs (status, finished_at);
+
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    wait_seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_steps_name ON steps (name);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS vitals (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    url TEXT,
+    ttfb REAL,
+    fcp REAL,
+    lcp REAL,
+    dom_content_loaded REAL,
+    load REAL,
+    cls REAL,
+    long_tasks INTEGER,
+    long_task_ms REAL,
+    js_heap_mb REAL,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_vitals_label ON vitals (label);
+"""
+
+# 페이지 성능 백분위수를 계산하는 값 (vitals 테이블 컬럼)
+VITALS_COLUMNS = ("ttfb", "fcp", "lcp", "dom_content_loaded", "load", "cls",
+                  "long_tasks", "long_task_ms", "js_heap_mb")
+
+
+@dataclass
+class HistoryEntry:
+    """기록할 run 하나
+
+    Attributes:
+        run_id: run ID
+        test_type: 테스트 종류
+        status: "passed" | "failed" | "cancelled"
+        created_at: 대기열 추가 시각 (time.time)
+        started_at: 실행 시작 시각 (time.time, 대기 중 취소되면 None)
+        finished_at: 종료 시각 (time.time)
+        message: 결과 메시지
+        error: 실패/취소 이유 (성공이면 None)
+        screenshot: 결과 스크린샷 경로 ("<run_id>/<파일명>")
+        steps: 단계 기록 (utils.steps.StepRecord.to_dict())
+        artifacts: 아티팩트 목록 (utils.artifacts.RunArtifacts.to_dict()["artifacts"])
+        vitals: 페이지 성능 값 (utils.web_vitals.VitalsSample.to_dict())
+    """
+
+    run_id: str
+    test_type: str
+    status: str
+    created_at: float
+    started_at: Optional[float]
+    finished_at: float
+    message: str = ""
+    error: Optional[str] = None
+    screenshot: Optional[str] = None
+    steps: List[Dict[str, Any]] = field(default_factory=list)
+    artifacts: List[Dict[str, Any]] = field(default_factory=list)
+    vitals: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    index = max(math.ceil(q / 100 * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class RunHistory:
+    """SQLite run 기록 + 비동기 일괄 기록기
+
+    Args:
+        db_path: SQLite 파일 경로
+        flush_interval: 일괄 기록 주기 (초)
+        batch_size: 이만큼 모이면 주기 전이라도 기록
+        retention_days: 보관 기간 (일, 0이면 삭제하지 않음)
+    """
+
+    def __init__(self, db_path: Path, flush_interval: float = 2.0, batch_size: int = 50,
+                 retention_days: float = 0):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self.written = 0
+        self.dropped = 0
+        self._pending: Deque[HistoryEntry] = deque(maxlen=MAX_PENDING)
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # -------------------------------------------------------------------------
+    # 수명 주기
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """DB 준비 + 기록기 시작 (서버 lifespan)"""
+        await asyncio.to_thread(self._init_db)
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """기록기 종료 (남은 기록은 마지막으로 한 번 더 기록)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        self._wake = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # 호출한 스레드에서만 쓰는 연결 (asyncio.to_thread 워커)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SCHEMA)
+            if self.retention_days:
+                cutoff = time.time() - self.retention_days * 86400
+                deleted = conn.execute("DELETE FROM runs WHERE finished_at < ?", (cutoff,)).rowcount
+                if deleted:
+                    logger.info(f"🧹 오래된 run 기록 {deleted}개 삭제")
+            conn.commit()
+
+    # -------------------------------------------------------------------------
+    # 기록
+    # -------------------------------------------------------------------------
+
+    def record(self, entry: HistoryEntry) -> None:
+        """기록 대기열에 추가 (DB를 기다리지 않음)"""
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(entry)
+        if self._wake is not None and len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """대기 중인 기록을 한 트랜잭션으로 기록 (실패하면 다음 주기에 다시 시도)"""
+        if not self._pending:
+            return
+        batch = list(self._pending)
+        self._pending.clear()
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ run 기록 저장 실패 ({len(batch)}개, 다음 주기에 재시도): {e}")
+            self._pending.extendleft(reversed(batch))
+
+    def _write_batch(self, batch: List[HistoryEntry]) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (e.run_id, e.test_type, e.status, e.created_at, e.started_at,
+                     e.finished_at, e.duration, e.message, e.error, e.screenshot)
+                    for e in batch
+                ],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (e.run_id, i, s["name"], s["status"], s["duration"], s.get("wait_seconds", 0.0))
+                    for e in batch for i, s in enumerate(e.steps)
+                ],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?)",
+                [
+                    (e.run_id, a["name"], a["kind"], a["size"])
+                    for e in batch for a in e.artifacts
+                ],
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO vitals (run_id, position, label, url, {', '.join(VITALS_COLUMNS)}) "
+                f"VALUES (?, ?, ?, ?{', ?' * len(VITALS_COLUMNS)})",
+                [
+                    (e.run_id, i, v["label"], v.get("url"), *(v.get(c) for c in VITALS_COLUMNS))
+                    for e in batch for i, v in enumerate(e.vitals)
+                ],
+            )
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "dropped": self.dropped,
+            "running": self._task is not None,
+        }
+
+    # -------------------------------------------------------------------------
+    # 조회 (워커 스레드에서 실행)
+    # -------------------------------------------------------------------------
+
+    async def step_percentiles(self, hours: float, test_type: Optional[str] = None) -> List[dict]:
+        """단계별 소요 시간 p50/p95/p99 (최근 hours시간, 통과한 단계만)"""
+        return await asyncio.to_thread(self._step_percentiles, hours, test_type)
+
+    def _step_percentiles(self, hours: float, test_type: Optional[str]) -> List[dict]:
+        where, params = self._window(hours, test_type)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT r.test_type, s.name, s.duration
+                FROM runs r JOIN steps s ON s.run_id = r.run_id
+                WHERE {where} AND s.status = 'passed'
+                ORDER BY r.test_type, s.name, s.duration
+                """,
+                params,
+            ).fetchall()
+
+        grouped: Dict[tuple, List[float]] = {}
+        for row in rows:
+            grouped.setdefault((row["test_type"], row["name"]), []).append(row["duration"])
+        return [
+            {
+                "test_type": test_type_,
+                "step": name,
+                "count": len(durations),
+                "p50": round(_percentile(durations, 50), 2),
+                "p95": round(_percentile(durations, 95), 2),
+                "p99": round(_percentile(durations, 99), 2),
+            }
+            for (test_type_, name), durations in grouped.items()
+        ]
+
+    async def vitals_percentiles(self, hours: float, test_type: Optional[str] = None) -> List[dict]:
+        """측정 지점별 페이지 성능 p50/p95 (최근 hours시간)"""
+        return await asyncio.to_thread(self._vitals_percentiles, hours, test_type)
+
+    def _vitals_percentiles(self, hours: float, test_type: Optional[str]) -> List[dict]:
+        where, params = self._window(hours, test_type)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT r.test_type, v.* FROM runs r JOIN vitals v ON v.run_id = r.run_id
+                WHERE {where}
+                """,
+                params,
+            ).fetchall()
+
+        grouped: Dict[tuple, List[sqlite3.Row]] = {}
+        for row in rows:
+            grouped.setdefault((row["test_type"], row["label"]), []).append(row)
+        result = []
+        for (test_type_, label), samples in sorted(grouped.items()):
+            entry: Dict[str, Any] = {"test_type": test_type_, "label": label, "count": len(samples)}
+            for column in VITALS_COLUMNS:
+                values = sorted(s[column] for s in samples if s[column] is not None)
+                entry[column] = {
+                    "p50": round(_percentile(values, 50), 4),
+                    "p95": round(_percentile(values, 95), 4),
+                } if values else None
+            result.append(entry)
+        return result
+
+    async def failure_rates(self, hours: float, test_type: Optional[str] = None) -> List[dict]:
+        """test_type별 실패율 (최근 hours시간, 취소된 run 제외)"""
+        return await asyncio.to_thread(self._failure_rates, hours, test_type)
+
+    def _failure_rates(self, hours: float, test_type: Optional[str]) -> List[dict]:
+        where, params = self._window(hours, test_type)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT r.test_type,
+                       SUM(r.status = 'passed') AS passed,
+                       SUM(r.status = 'failed') AS failed,
+                       SUM(r.status = 'cancelled') AS cancelled
+                FROM runs r
+                WHERE {where}
+                GROUP BY r.test_type
+                ORDER BY r.test_type
+                """,
+                params,
+            ).fetchall()
+        result = []
+        for row in rows:
+            finished = row["passed"] + row["failed"]
+            result.append({
+                "test_type": row["test_type"],
+                "passed": row["passed"],
+                "failed": row["failed"],
+                "cancelled": row["cancelled"],
+                "failure_rate": round(row["failed"] / finished, 4) if finished else None,
+            })
+        return result
+
+    async def slowest_runs(self, hours: float, test_type: Optional[str] = None,
+                           limit: int = 10) -> List[dict]:
+        """가장 오래 걸린 run (최근 hours시간)"""
+        return await asyncio.to_thread(self._slowest_runs, hours, test_type, limit)
+
+    def _slowest_runs(self, hours: float, test_type: Optional[str], limit: int) -> List[dict]:
+        where, params = self._window(hours, test_type)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT r.* FROM runs r
+                WHERE {where} AND r.duration IS NOT NULL
+                ORDER BY r.duration DESC
+                LIMIT ?
+                """,
+                (*params, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def recent_runs(self, hours: float, test_type: Optional[str] = None,
+                          status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """최근 run 목록 (단계/아티팩트 포함)"""
+        return await asyncio.to_thread(self._recent_runs, hours, test_type, status, limit)
+
+    def _recent_runs(self, hours: float, test_type: Optional[str], status: Optional[str],
+                     limit: int) -> List[dict]:
+        where, params = self._window(hours, test_type)
+        if status:
+            where += " AND r.status = ?"
+            params = (*params, status)
+        with closing(self._connect()) as conn:
+            runs = [
+                dict(row) for row in conn.execute(
+                    f"SELECT r.* FROM runs r WHERE {where} ORDER BY r.finished_at DESC LIMIT ?",
+                    (*params, limit),
+                )
+            ]
+            for run in runs:
+                run["steps"] = [
+                    dict(row) for row in conn.execute(
+                        "SELECT name, status, duration, wait_seconds FROM steps "
+                        "WHERE run_id = ? ORDER BY position",
+                        (run["run_id"],),
+                    )
+                ]
+                run["artifacts"] = [
+                    dict(row) for row in conn.execute(
+                        "SELECT name, kind, size FROM artifacts WHERE run_id = ?",
+                        (run["run_id"],),
+                    )
+                ]
+                run["vitals"] = [
+                    dict(row) for row in conn.execute(
+                        f"SELECT label, url, {', '.join(VITALS_COLUMNS)} FROM vitals "
+                        "WHERE run_id = ? ORDER BY position",
+                        (run["run_id"],),
+                    )
+                ]
+        return runs
+
+    @staticmethod
+    def _window(hours: float, test_type: Optional[str]) -> tuple:
+        """조회 기간/테스트 종류 조건 (인덱스 사용)"""
+        where = "r.finished_at >= ?"
+        params: tuple = (time.time() - hours * 3600,)
+        if test_type:
+            where += " AND r.test_type = ?"
+            params = (*params, test_type)
+        return where, params
+
+
+# 프로세스 전역 기록 저장소
+run_history = RunHistory(
+    db_path=HISTORY_DB_PATH,
+    flush_interval=HISTORY_FLUSH_INTERVAL,
+    batch_size=HISTORY_BATCH_SIZE,
+    retention_days=HISTORY_RETENTION_DAYS,
+)
@@ -0,0 +1,65 @@
+# utils/run_state.py
+"""테스트 실행 하나의 상태 저장소
+
+테스트 실행 하나는 BrowserContext 하나를 사용하므로, 실행 단위 상태(메트릭 등)를
+BrowserContext에 묶어 보관합니다. 유틸 함수들은 page만 받아도
+get_run_state(page)로 같은 실행의 상태에 접근할 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class RunState:
+    """테스트 실행 하나의 상태
+
+    Attributes:
+        run_id: run ID (아티팩트 저장 디렉토리 이름)
+        test_type: 테스트 종류 ("login" | "upload" | "translate", 메트릭 라벨)
+        metrics: 실행 결과에 첨부할 메트릭 (섹션 이름 -> dict 또는 to_dict() 지원 객체)
+        steps: 지금까지 시작된 단계 기록 (utils.steps.StepRecord)
+        current_step: 진행 중인 단계 기록 (단계 밖이면 None)
+        cancel_token: 실행 취소 토큰 (utils.cancellation.CancelToken, 없으면 None)
+    """
+
+    run_id: Optional[str] = None
+    test_type: Optional[str] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    steps: List[Any] = field(default_factory=list)
+    current_step: Optional[Any] = None
+    cancel_token: Optional[Any] = None
+
+    def metrics_dict(self) -> Dict[str, Any]:
+        """결과 전송용 메트릭 dict (to_dict() 지원 객체는 변환)"""
+        return {
+            name: value.to_dict() if hasattr(value, "to_dict") else value
+            for name, value in self.metrics.items()
+        }
+
+    def steps_dict(self) -> List[Dict[str, Any]]:
+        """결과 전송용 단계 기록 (run 기록 저장소의 단계별 소요 시간)"""
+        return [step.to_dict() for step in self.steps]
+
+
+# BrowserContext -> RunState (컨텍스트가 GC되면 자동 삭제)
+_states: "weakref.WeakKeyDictionary[Any, RunState]" = weakref.WeakKeyDictionary()
+
+
+def _resolve_context(page_or_context: Any) -> Any:
+    """page가 주어지면 소속 BrowserContext 반환"""
+    context = getattr(page_or_context, "context", None)
+    return context if context is not None else page_or_context
+
+
+def get_run_state(page_or_context: Any) -> RunState:
+    """page 또는 BrowserContext의 실행 상태 조회 (없으면 생성)"""
+    context = _resolve_context(page_or_context)
+    state = _states.get(context)
+    if state is None:
+        state = RunState()
+        _states[context] = state
+    return state
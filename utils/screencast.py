@@ -0,0 +1,297 @@
+# utils/screencast.py
+"""실행 중인 브라우저 라이브 보기 (CDP screencast)
+
+headless 서버에서도 run의 WebSocket으로 브라우저 화면(JPEG)을 볼 수 있습니다.
+보는 사람(viewer)이 있을 때만 캡처하고, 모두 나가면 바로 캡처를 멈춥니다.
+
+- 프레임 속도: 프레임 확인(ack)을 1/fps초 간격으로 보내서 Chromium이 그보다 빨리
+  캡처/인코딩하지 않게 함 (SCREENCAST_MAX_FPS가 run당 CPU 사용 상한)
+- 적응: 2초마다 viewer가 놓친 프레임 비율을 보고 fps/품질을 낮추거나 다시 올림
+- 느린 viewer: 전송 전인 이전 프레임은 새 프레임으로 교체 (api.runs.Subscription.put_frame)
+- 동시 세션 수: SCREENCAST_MAX_SESSIONS (넘으면 라이브 보기 거절)
+- 측정: run 메트릭 "screencast" (프레임/바이트/놓친 프레임/fps/프레임 처리 CPU 시간)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set
+
+from utils.config import (
+    SCREENCAST_MAX_FPS,
+    SCREENCAST_MAX_SESSIONS,
+    SCREENCAST_MAX_WIDTH,
+    SCREENCAST_MIN_QUALITY,
+    SCREENCAST_QUALITY,
+)
+from utils.run_state import get_run_state
+
+logger = logging.getLogger(__name__)
+
+# 프레임 수신 함수: 프레임 dict를 받고, 이전 프레임을 버렸으면 False 반환
+FrameSink = Callable[[Dict[str, Any]], bool]
+
+# fps/품질을 다시 계산하는 주기 (초)
+ADAPT_INTERVAL = 2.0
+
+
+# =============================================================================
+# 측정
+# =============================================================================
+
+
+@dataclass
+class ScreencastStats:
+    """run 하나의 라이브 보기 측정값 (run_state.metrics["screencast"])
+
+    Attributes:
+        frames: 받은 프레임 수
+        bytes: 받은 프레임 크기 합계 (base64)
+        dropped: viewer가 놓친 프레임 수 (전송 전에 새 프레임으로 교체됨)
+        watched_seconds: 캡처한 시간 합계 (초)
+        cpu_seconds: 프레임 처리에 쓴 서버 CPU 시간 (초, 인코딩은 Chromium)
+        max_viewers: 동시에 본 최대 viewer 수
+    """
+
+    frames: int = 0
+    bytes: int = 0
+    dropped: int = 0
+    watched_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    max_viewers: int = 0
+
+    def to_dict(self) -> dict:
+        fps = self.frames / self.watched_seconds if self.watched_seconds else 0.0
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "dropped": self.dropped,
+            "watched_seconds": round(self.watched_seconds, 1),
+            "fps": round(fps, 2),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "max_viewers": self.max_viewers,
+        }
+
+
+# =============================================================================
+# 세션 (page 하나의 캡처)
+# =============================================================================
+
+
+class ScreencastSession:
+    """page 하나의 CDP screencast
+
+    Args:
+        page: Playwright page 객체 (Chromium)
+        viewers: viewer ID -> FrameSink (ScreencastHub와 공유)
+    """
+
+    def __init__(self, page, viewers: Dict[int, FrameSink]):
+        self.page = page
+        self.viewers = viewers
+        self.fps = SCREENCAST_MAX_FPS
+        self.quality = SCREENCAST_QUALITY
+        self._cdp = None
+        self._started_at: Optional[float] = None
+        self._last_ack = 0.0
+        self._window_started = 0.0
+        self._window_deliveries = 0
+        self._window_drops = 0
+        self._acks: Set[asyncio.Task] = set()
+
+        state = get_run_state(page)
+        if "screencast" not in state.metrics:
+            state.metrics["screencast"] = ScreencastStats()
+        self.stats: ScreencastStats = state.metrics["screencast"]
+
+    async def start(self) -> None:
+        self._cdp = await self.page.context.new_cdp_session(self.page)
+        self._cdp.on("Page.screencastFrame", self._on_frame)
+        self._started_at = time.monotonic()
+        self._window_started = self._started_at
+        await self._start_capture()
+
+    async def stop(self) -> None:
+        if self._cdp is None:
+            return
+        cdp, self._cdp = self._cdp, None
+        for task in self._acks:
+            task.cancel()
+        if self._started_at is not None:
+            self.stats.watched_seconds += time.monotonic() - self._started_at
+            self._started_at = None
+        try:
+            await cdp.send("Page.stopScreencast")
+            await cdp.detach()
+        except Exception:
+            # page가 이미 닫힌 경우
+            pass
+
+    async def _start_capture(self) -> None:
+        await self._cdp.send("Page.startScreencast", {
+            "format": "jpeg",
+            "quality": self.quality,
+            "maxWidth": SCREENCAST_MAX_WIDTH,
+            "maxHeight": SCREENCAST_MAX_WIDTH,
+        })
+
+    def _on_frame(self, params: Dict[str, Any]) -> None:
+        """프레임 수신 -> viewer에게 전달 -> fps 간격에 맞춰 ack 예약"""
+        cpu_start = time.process_time()
+        data = params["data"]
+        frame = {
+            "type": "frame",
+            "data": data,
+            "quality": self.quality,
+            "fps": self.fps,
+        }
+
+        self.stats.frames += 1
+        self.stats.bytes += len(data)
+        for sink in list(self.viewers.values()):
+            self._window_deliveries += 1
+            if not sink(frame):
+                self._window_drops += 1
+                self.stats.dropped += 1
+
+        task = asyncio.get_running_loop().create_task(self._ack(params["sessionId"]))
+        self._acks.add(task)
+        task.add_done_callback(self._acks.discard)
+        self.stats.cpu_seconds += time.process_time() - cpu_start
+
+    async def _ack(self, session_id: int) -> None:
+        """1/fps초 간격으로 ack (ack 전에는 Chromium이 다음 프레임을 캡처하지 않음)"""
+        wait = self._last_ack + 1 / self.fps - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if self._cdp is None:
+            return
+        self._last_ack = time.monotonic()
+        try:
+            await self._adapt()
+            await self._cdp.send("Page.screencastFrameAck", {"sessionId": session_id})
+        except Exception:
+            # 캡처를 다시 시작했거나 page가 닫힌 경우
+            pass
+
+    async def _adapt(self) -> None:
+        """viewer가 놓친 프레임 비율에 따라 fps/품질 조정"""
+        now = time.monotonic()
+        if now - self._window_started < ADAPT_INTERVAL or not self._window_deliveries:
+            return
+        drop_ratio = self._window_drops / self._window_deliveries
+        self._window_started = now
+        self._window_deliveries = 0
+        self._window_drops = 0
+
+        quality = self.quality
+        if drop_ratio > 0.25:
+            self.fps = max(self.fps - 1, 1)
+            quality = max(self.quality - 10, SCREENCAST_MIN_QUALITY)
+        elif drop_ratio == 0:
+            self.fps = min(self.fps + 1, SCREENCAST_MAX_FPS)
+            quality = min(self.quality + 5, SCREENCAST_QUALITY)
+
+        if quality != self.quality:
+            # 품질은 캡처를 다시 시작해야 적용됨
+            self.quality = quality
+            await self._cdp.send("Page.stopScreencast")
+            await self._start_capture()
+
+
+# =============================================================================
+# 허브 (run ID -> page/viewer/세션)
+# =============================================================================
+
+
+class ScreencastHub:
+    """run별 라이브 보기 관리
+
+    create_browser_context()가 run의 page를 등록하고, WebSocket이 viewer를
+    추가/제거합니다. viewer가 있는 동안에만 세션을 유지합니다.
+
+    Args:
+        max_sessions: 동시에 캡처할 수 있는 run 수
+    """
+
+    def __init__(self, max_sessions: int):
+        self.max_sessions = max_sessions
+        self._pages: Dict[str, Any] = {}
+        self._viewers: Dict[str, Dict[int, FrameSink]] = {}
+        self._sessions: Dict[str, ScreencastSession] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def register_page(self, run_id: str, page) -> None:
+        """run의 page 등록 (기다리던 viewer가 있으면 캡처 시작)"""
+        self._pages[run_id] = page
+        page.on("close", lambda _: self._on_page_closed(run_id))
+        if self._viewers.get(run_id):
+            self._spawn(self._ensure_session(run_id))
+
+    def add_viewer(self, run_id: str, viewer_id: int, sink: FrameSink) -> bool:
+        """viewer 추가 (동시 세션 수를 넘으면 False)
+
+        page가 아직 없으면 (대기 중인 run) 등록될 때 캡처를 시작합니다.
+        """
+        viewers = self._viewers.get(run_id)
+        if not viewers and len(self._viewers) >= self.max_sessions:
+            return False
+        self._viewers.setdefault(run_id, {})[viewer_id] = sink
+        session = self._sessions.get(run_id)
+        if session is not None:
+            session.stats.max_viewers = max(session.stats.max_viewers, len(self._viewers[run_id]))
+        elif run_id in self._pages:
+            self._spawn(self._ensure_session(run_id))
+        return True
+
+    def remove_viewer(self, run_id: str, viewer_id: int) -> None:
+        """viewer 제거 (남은 viewer가 없으면 캡처 중지)"""
+        viewers = self._viewers.get(run_id)
+        if viewers is None:
+            return
+        viewers.pop(viewer_id, None)
+        if not viewers:
+            del self._viewers[run_id]
+            session = self._sessions.pop(run_id, None)
+            if session is not None:
+                self._spawn(session.stop())
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "viewers": sum(len(v) for v in self._viewers.values()),
+            "max_sessions": self.max_sessions,
+        }
+
+    async def _ensure_session(self, run_id: str) -> None:
+        viewers = self._viewers.get(run_id)
+        page = self._pages.get(run_id)
+        if not viewers or page is None or run_id in self._sessions:
+            return
+        session = ScreencastSession(page, viewers)
+        self._sessions[run_id] = session
+        try:
+            await session.start()
+        except Exception as e:
+            logger.warning(f"⚠️ 라이브 보기 시작 실패 ({run_id}): {e}")
+            self._sessions.pop(run_id, None)
+            return
+        session.stats.max_viewers = max(session.stats.max_viewers, len(viewers))
+
+    def _on_page_closed(self, run_id: str) -> None:
+        self._pages.pop(run_id, None)
+        session = self._sessions.pop(run_id, None)
+        if session is not None:
+            self._spawn(session.stop())
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# 프로세스 전역 허브 (SCREENCAST_ENABLED일 때 create_browser_context가 page 등록)
+screencast_hub = ScreencastHub(max_sessions=SCREENCAST_MAX_SESSIONS)
@@ -0,0 +1,112 @@
+# utils/session_cache.py
+"""로그인 세션 캐시 (Playwright storage_state 재사용)
+
+로그인 성공 후 컨텍스트의 storage_state(쿠키 + localStorage)를 계정별로 저장해두고,
+이후 테스트에서는 로그인 플로우 대신 저장된 세션을 복원합니다.
+
+- 만료: SESSION_CACHE_TTL (초)
+- 저장 위치: 메모리 + SESSION_CACHE_DIR (서버 재시작 후에도 재사용)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.config import SESSION_CACHE_DIR, SESSION_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCache:
+    """계정별 storage_state 캐시 (스레드 안전)
+
+    Args:
+        cache_dir: 세션 파일 저장 디렉토리 (None이면 메모리에만 저장)
+        ttl: 세션 유효 시간 (초)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: int = 3600):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, account: str) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha256(account.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, account: str) -> Optional[Dict[str, Any]]:
+        """만료되지 않은 storage_state 반환 (없으면 None)"""
+        if not account:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(account)
+
+            if entry is None:
+                path = self._path(account)
+                if path and path.exists():
+                    try:
+                        entry = json.loads(path.read_text(encoding="utf-8"))
+                        self._entries[account] = entry
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"⚠️ 세션 파일 읽기 실패: {e}")
+                        return None
+
+            if entry is None:
+                return None
+
+            if time.time() - entry["saved_at"] > self.ttl:
+                self._remove(account)
+                return None
+
+            return entry["storage_state"]
+
+    def save(self, account: str, storage_state: Dict[str, Any]) -> None:
+        """로그인 성공 후 storage_state 저장"""
+        if not account:
+            return
+
+        entry = {"saved_at": time.time(), "storage_state": storage_state}
+
+        with self._lock:
+            self._entries[account] = entry
+            path = self._path(account)
+            if path:
+                try:
+                    # 쿠키가 들어있으므로 소유자만 읽을 수 있게 저장
+                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(entry, f)
+                except OSError as e:
+                    logger.warning(f"⚠️ 세션 파일 저장 실패: {e}")
+
+    def invalidate(self, account: str) -> None:
+        """세션 무효화 (검증 실패 시)"""
+        with self._lock:
+            self._remove(account)
+
+    def _remove(self, account: str) -> None:
+        self._entries.pop(account, None)
+        path = self._path(account)
+        if path and path.exists():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+# 프로세스 전역 캐시
+session_cache = SessionCache(cache_dir=SESSION_CACHE_DIR, ttl=SESSION_CACHE_TTL)
@@ -0,0 +1,232 @@
+# utils/steps.py
+"""테스트 단계(STEP) 구분과 단계별 시간 기록
+
+tasks의 각 STEP을 run_step()으로 감싸면 STEP 배너를 출력하고, 단계마다
+소요 시간, 조건 대기(utils.wait_engine)에 쓴 시간, 성공/실패 여부를
+실행 상태(run_state.steps)에 기록합니다.
+
+- 단계 마감 시간: STEP_DEADLINE초가 지나면 이후 조건 대기가 StepDeadlineExceeded로 실패
+- 계측 모드 (WAIT_PROFILING=true): 단계 종료 시 대기/동작 시간을 로그로 출력하고
+  결과 메트릭에 "wait_profile"로 첨부
+- 실패 시 trace (TRACE_ON_FAILURE=true): 단계 시작마다 trace chunk 전환 (utils.tracing)
+- 메트릭: 단계 소요 시간/실패를 test_type, 단계 이름별로 기록 (utils.metrics, GET /metrics)
+- 구간(span): 단계 안의 주요 utils 호출은 span()/timed_span()으로 따로 측정
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from utils.cancellation import RunCancelled, check_cancelled
+from utils.config import STEP_DEADLINE, WAIT_PROFILING
+from utils.logger import log_step
+from utils.metrics import span_duration, step_duration, step_failures
+from utils.run_state import get_run_state
+from utils.tracing import get_failure_trace
+
+
+class StepDeadlineExceeded(Exception):
+    """단계 마감 시간을 넘겨 더 이상 대기할 수 없음"""
+
+
+# =============================================================================
+# 단계 기록
+# =============================================================================
+
+
+@dataclass
+class WaitRecord:
+    """조건 대기 한 번의 기록 (계측 모드에서만 저장)"""
+
+    label: str
+    seconds: float
+    met: bool
+
+    def to_dict(self) -> dict:
+        return {"label": self.label, "seconds": round(self.seconds, 2), "met": self.met}
+
+
+@dataclass
+class StepRecord:
+    """단계 하나의 기록
+
+    Attributes:
+        name: 단계 이름 (STEP 배너 문구)
+        started_at: 시작 시각 (time.monotonic)
+        deadline_at: 마감 시각 (time.monotonic, 제한 없으면 None)
+        duration: 소요 시간 (초, 단계 종료 시 기록)
+        wait_seconds: 조건 대기에 쓴 시간 합계 (초)
+        wait_count: 조건 대기 횟수
+        waits: 조건 대기별 기록 (계측 모드에서만)
+        spans: 구간 이름 -> 소요 시간 합계 (초, span()으로 측정한 utils 호출)
+        status: "running" | "passed" | "failed" | "cancelled"
+    """
+
+    name: str
+    started_at: float
+    deadline_at: Optional[float] = None
+    duration: float = 0.0
+    wait_seconds: float = 0.0
+    wait_count: int = 0
+    waits: List[WaitRecord] = field(default_factory=list)
+    spans: Dict[str, float] = field(default_factory=dict)
+    status: str = "running"
+
+    @property
+    def act_seconds(self) -> float:
+        """대기를 제외한 동작 시간 (초)"""
+        return max(self.duration - self.wait_seconds, 0.0)
+
+    def remaining(self) -> Optional[float]:
+        """마감까지 남은 시간 (초, 제한 없으면 None)"""
+        if self.deadline_at is None:
+            return None
+        return self.deadline_at - time.monotonic()
+
+    def record_wait(self, label: str, seconds: float, met: bool) -> None:
+        self.wait_seconds += seconds
+        self.wait_count += 1
+        if WAIT_PROFILING:
+            self.waits.append(WaitRecord(label, seconds, met))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "duration": round(self.duration, 2),
+            "wait_seconds": round(self.wait_seconds, 2),
+            "act_seconds": round(self.act_seconds, 2),
+            "wait_count": self.wait_count,
+            "waits": [w.to_dict() for w in self.waits],
+            "spans": {name: round(seconds, 2) for name, seconds in self.spans.items()},
+        }
+
+
+@dataclass
+class WaitProfile:
+    """실행 전체의 대기/동작 시간 요약 (run_state.metrics["wait_profile"])"""
+
+    steps: List[StepRecord]
+
+    def to_dict(self) -> dict:
+        return {
+            "wait_seconds": round(sum(s.wait_seconds for s in self.steps), 2),
+            "act_seconds": round(sum(s.act_seconds for s in self.steps), 2),
+            "steps": [s.to_dict() for s in self.steps],
+        }
+
+
+# =============================================================================
+# 단계 실행
+# =============================================================================
+
+
+@asynccontextmanager
+async def run_step(page, log, title: str, deadline: Optional[float] = STEP_DEADLINE):
+    """STEP 배너 출력 + 단계 기록
+
+    Args:
+        page: Playwright page 객체
+        log: 로그 출력 함수
+        title: 단계 이름 (예: "STEP 1: 로그인")
+        deadline: 단계 마감 시간 (초, 0 또는 None이면 제한 없음)
+
+    Yields:
+        StepRecord: 이 단계의 기록
+
+    Raises:
+        RunCancelled: 단계 시작 전에 실행이 취소된 경우
+    """
+    check_cancelled(page)
+
+    trace = get_failure_trace(page)
+    if trace is not None:
+        await trace.rotate(title)
+
+    step_token = log_step.set(title)
+
+    log("\n" + "="*50)
+    log(title)
+    log("="*50)
+
+    state = get_run_state(page)
+    now = time.monotonic()
+    record = StepRecord(
+        name=title,
+        started_at=now,
+        deadline_at=now + deadline if deadline else None,
+    )
+    state.steps.append(record)
+    state.current_step = record
+
+    if WAIT_PROFILING and "wait_profile" not in state.metrics:
+        state.metrics["wait_profile"] = WaitProfile(state.steps)
+
+    try:
+        yield record
+        record.status = "passed"
+    except (RunCancelled, asyncio.CancelledError):
+        record.status = "cancelled"
+        raise
+    except BaseException:
+        record.status = "failed"
+        raise
+    finally:
+        record.duration = time.monotonic() - record.started_at
+        state.current_step = None
+        test_type = state.test_type or "unknown"
+        step_duration.observe(record.duration, test_type, title)
+        if record.status == "failed":
+            step_failures.inc(test_type, title)
+        if WAIT_PROFILING:
+            log(
+                f"  ⏱️ 소요 {record.duration:.1f}초 "
+                f"(대기 {record.wait_seconds:.1f}초 / 동작 {record.act_seconds:.1f}초, "
+                f"대기 {record.wait_count}회)",
+                duration=record.duration,
+            )
+        log_step.reset(step_token)
+
+
+# =============================================================================
+# 구간 (utils 호출 측정)
+# =============================================================================
+
+
+@asynccontextmanager
+async def span(page, name: str):
+    """단계 안의 구간 소요 시간 측정
+
+    메트릭 perso_span_duration_seconds{test_type, span}에 기록하고,
+    진행 중인 단계 기록(StepRecord.spans)에도 더합니다.
+
+    Args:
+        page: Playwright page 객체
+        name: 구간 이름 (예: "login", "upload")
+    """
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        seconds = time.monotonic() - start
+        state = get_run_state(page)
+        span_duration.observe(seconds, state.test_type or "unknown", name)
+        if state.current_step is not None:
+            spans = state.current_step.spans
+            spans[name] = spans.get(name, 0.0) + seconds
+
+
+def timed_span(name: str):
+    """page를 첫 번째 인자로 받는 async utils 함수를 span()으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(page, *args, **kwargs):
+            async with span(page, name):
+                return await func(page, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,17 +1,41 @@
 # utils/teams_notifier.py
-"""Teams Webhook으로 테스트 결과 알림 전송"""
+"""Teams Webhook으로 테스트 결과 알림 전송
+
+알림은 utils.teams_outbox의 outbox에 넣고 바로 반환합니다 (전송/재시도는 백그라운드).
+요약 모드(TEAMS_DIGEST_ENABLED)에서는 결과를 TeamsDigest에 모아 주기적으로 요약 카드 하나를 보내고,
+상태가 바뀐 결과(성공 -> 실패, 실패 -> 성공)만 바로 보냅니다.
+
+카드 JSON은 TEAMS_CARD_MAX_BYTES를 넘지 않도록 실행 로그를 줄여서 넣습니다
+(반복 폴링 로그는 범위로 합치고, 앞/뒤 TEAMS_LOG_KEEP_LINES줄 + 에러 로그만 유지).
+요약 카드는 실패 메시지를 첫 줄 TEAMS_DIGEST_MESSAGE_CHARS자로 자르고, 넘으면 오래된 실패부터 생략합니다.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import math
+import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
-import httpx
 from pydantic import BaseModel, Field
 
-from utils.config import APP_BASE_URL, TEAMS_WEBHOOK_URL
+from utils.config import (
+    APP_BASE_URL,
+    TEAMS_CARD_MAX_BYTES,
+    TEAMS_DIGEST_ENABLED,
+    TEAMS_DIGEST_MESSAGE_CHARS,
+    TEAMS_DIGEST_MAX_RUNS,
+    TEAMS_DIGEST_WINDOW,
+    TEAMS_LOG_KEEP_LINES,
+    TEAMS_SYNC_DRAIN_TIMEOUT,
+    TEAMS_WEBHOOK_URL,
+)
+from utils.teams_outbox import teams_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +106,141 @@ def _get_test_type_korean(test_type: str) -> str:
     return mapping.get(test_type, test_type)
 
 
+# =============================================================================
+# 로그 압축 (카드 크기 제한)
+# =============================================================================
+
+
+# 숫자 (반복 로그 비교 시 무시, 예: "⏳ 30초 경과..." / "⏳ 40초 경과...")
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+# 반드시 남길 에러 로그
+_ERROR_PREFIXES = ("❌",)
+# 카드가 여전히 크면 fact 값을 이 길이(문자)까지 자름
+_MIN_FACT_CHARS = 20
+
+
+def _card_size(card: dict[str, Any]) -> int:
+    """직렬화된 카드 크기 (바이트)"""
+    return len(json.dumps(card, ensure_ascii=False).encode("utf-8"))
+
+
+def _collapse_repeats(lines: List[str], min_run: int = 3) -> List[str]:
+    """숫자만 다른 연속된 로그(폴링 진행 로그 등)를 한 줄 범위로 합침"""
+    collapsed: List[str] = []
+    i = 0
+    while i < len(lines):
+        key = _NUMBER_PATTERN.sub("#", lines[i])
+        j = i + 1
+        while j < len(lines) and _NUMBER_PATTERN.sub("#", lines[j]) == key:
+            j += 1
+        count = j - i
+        if count < min_run:
+            collapsed.extend(lines[i:j])
+        elif lines[i] == lines[j - 1]:
+            collapsed.append(f"{lines[i]} (x{count})")
+        else:
+            collapsed.append(f"{lines[i]} ~ {lines[j - 1].strip()} ({count}줄)")
+        i = j
+    return collapsed
+
+
+def _select_lines(lines: List[str], keep: int) -> List[str]:
+    """앞/뒤 keep줄 + 에러 로그만 남기고 나머지는 생략 표시"""
+    if len(lines) <= keep * 2:
+        return lines
+
+    selected: List[str] = []
+    skipped = 0
+    for i, line in enumerate(lines):
+        if i < keep or i >= len(lines) - keep or line.lstrip().startswith(_ERROR_PREFIXES):
+            if skipped:
+                selected.append(f"… {skipped}줄 생략 …")
+                skipped = 0
+            selected.append(line)
+        else:
+            skipped += 1
+    return selected
+
+
+def _shrink_facts(card: TeamsMessageCard, max_bytes: int) -> dict[str, Any]:
+    """가장 긴 fact 값부터 잘라서 max_bytes 이하인 카드 JSON 반환 (마지막 수단)
+
+    모든 값이 _MIN_FACT_CHARS자 이하가 되어도 크면 그대로 반환합니다.
+    """
+    payload = card.model_dump(exclude_none=True)
+    while (overflow := _card_size(payload) - max_bytes) > 0:
+        facts = [f for s in card.sections for f in s.facts if len(f.value) > _MIN_FACT_CHARS + 1]
+        if not facts:
+            break
+        longest = max(facts, key=lambda f: len(f.value))
+        longest.value = longest.value[:max(len(longest.value) - overflow - 2, _MIN_FACT_CHARS)] + "…"
+        payload = card.model_dump(exclude_none=True)
+    return payload
+
+
+def _short_message(message: str, limit: int) -> str:
+    """첫 줄만 limit자까지 (Playwright 에러의 call log 등 제외)"""
+    lines = (message or "").strip().splitlines()
+    first = lines[0] if lines else ""
+    if len(first) > limit:
+        return first[:limit] + "…"
+    return first + (" …" if len(lines) > 1 else "")
+
+
+def _log_section(lines: List[str]) -> Section:
+    log_text = "\n".join(lines)
+    return Section(
+        activityTitle="실행 로그",
+        facts=[Fact(name="로그", value=f"```\n{log_text}\n```")],
+    )
+
+
+def _fit_card(card: TeamsMessageCard, logs: Optional[List[str]], max_bytes: int) -> dict[str, Any]:
+    """실행 로그를 줄여가며 max_bytes 이하인 카드 JSON 반환
+
+    1. 로그 전체 -> 2. 반복 로그 합치기 -> 3. 앞/뒤 keep줄 + 에러 (keep을 절반씩 줄임)
+    -> 4. 로그 제외 -> 5. 메시지 자르기 -> 6. 그래도 크면 긴 fact 값부터 자르기
+    """
+    base_sections = list(card.sections)
+
+    def build(lines: Optional[List[str]]) -> dict[str, Any]:
+        card.sections = base_sections + ([_log_section(lines)] if lines else [])
+        return card.model_dump(exclude_none=True)
+
+    if logs:
+        lines = list(logs)
+        payload = build(lines)
+        if _card_size(payload) <= max_bytes:
+            return payload
+
+        lines = _collapse_repeats(lines)
+        keep = TEAMS_LOG_KEEP_LINES
+        while True:
+            payload = build(_select_lines(lines, keep))
+            if _card_size(payload) <= max_bytes:
+                return payload
+            if keep == 0:
+                break
+            keep //= 2
+
+    payload = build(None)
+    overflow = _card_size(payload) - max_bytes
+    if overflow > 0:
+        # 로그 없이도 크면 결과 메시지를 자름
+        for fact in card.sections[0].facts:
+            if fact.name == "메시지":
+                fact.value = fact.value[:max(len(fact.value) - overflow - 10, 0)] + "…"
+        payload = build(None)
+    if _card_size(payload) > max_bytes:
+        payload = _shrink_facts(card, max_bytes)
+    return payload
+
+
+# =============================================================================
+# 카드 생성
+# =============================================================================
+
+
 def _build_message_card(
     test_type: str,
     success: bool,
@@ -90,8 +249,10 @@ def _build_message_card(
     end_time: datetime,
     screenshot_url: Optional[str] = None,
     logs: Optional[List[str]] = None,
+    log_url: Optional[str] = None,
+    max_bytes: int = TEAMS_CARD_MAX_BYTES,
 ) -> dict[str, Any]:
-    """Teams MessageCard JSON 생성"""
+    """Teams MessageCard JSON 생성 (직렬화 크기 max_bytes 이하)"""
     status_emoji = "✅" if success else "❌"
     status_text = "성공" if success else "실패"
     theme_color = "00FF00" if success else "FF0000"
@@ -111,16 +272,10 @@ def _build_message_card(
     if screenshot_url:
         facts.append(Fact(name="스크린샷", value=f"[보기]({screenshot_url})"))
 
-    sections = [Section(activityTitle="테스트 결과", facts=facts)]
+    if log_url:
+        facts.append(Fact(name="전체 로그", value=f"[보기]({log_url})"))
 
-    if logs:
-        log_text = "\n".join(logs)
-        sections.append(
-            Section(
-                activityTitle="실행 로그",
-                facts=[Fact(name="로그", value=f"```\n{log_text}\n```")],
-            )
-        )
+    sections = [Section(activityTitle="테스트 결과", facts=facts)]
 
     card = TeamsMessageCard(
         title=f"{status_emoji} PERSO 자동화 테스트 - {test_type_kr} {status_text}",
@@ -129,7 +284,205 @@ def _build_message_card(
         sections=sections,
     )
 
-    return card.model_dump(exclude_none=True)
+    return _fit_card(card, logs, max_bytes)
+
+
+# =============================================================================
+# 요약(digest) 모드
+# =============================================================================
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    if minutes > 0:
+        return f"{minutes}분 {secs}초"
+    return f"{secs}초"
+
+
+def _percentile(values: List[float], p: float) -> float:
+    """백분위수 (nearest-rank)"""
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass
+class DigestEntry:
+    """요약 카드에 들어갈 결과 하나"""
+
+    test_type: str
+    success: bool
+    message: str
+    start_time: datetime
+    end_time: datetime
+    screenshot_url: Optional[str] = None
+    log_url: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time - self.start_time).total_seconds()
+
+
+def _build_digest_card(
+    entries: List[DigestEntry],
+    max_bytes: int = TEAMS_CARD_MAX_BYTES,
+    message_chars: int = TEAMS_DIGEST_MESSAGE_CHARS,
+) -> dict[str, Any]:
+    """요약 MessageCard JSON 생성 (성공/실패 수, 테스트별 p50/p95, 실패한 run 스크린샷)
+
+    직렬화 크기가 max_bytes를 넘으면 오래된 실패부터 빼고 "외 N건"으로 표시합니다.
+    """
+    failed = [e for e in entries if not e.success]
+    passed_count = len(entries) - len(failed)
+    status_emoji = "✅" if not failed else "❌"
+    theme_color = "00FF00" if not failed else "FF0000"
+
+    sections = [
+        Section(
+            activityTitle="요약",
+            facts=[
+                Fact(name="기간", value=(
+                    f"{_format_datetime(min(e.start_time for e in entries))} ~ "
+                    f"{_format_datetime(max(e.end_time for e in entries))}"
+                )),
+                Fact(name="실행", value=f"{len(entries)}회"),
+                Fact(name="성공", value=f"{passed_count}회"),
+                Fact(name="실패", value=f"{len(failed)}회"),
+            ],
+        )
+    ]
+
+    by_type: Dict[str, List[DigestEntry]] = {}
+    for entry in entries:
+        by_type.setdefault(entry.test_type, []).append(entry)
+
+    type_facts = []
+    for test_type, group in by_type.items():
+        durations = [e.duration for e in group]
+        group_failed = sum(1 for e in group if not e.success)
+        type_facts.append(Fact(
+            name=_get_test_type_korean(test_type),
+            value=(
+                f"성공 {len(group) - group_failed} / 실패 {group_failed} · "
+                f"p50 {_format_seconds(_percentile(durations, 50))} · "
+                f"p95 {_format_seconds(_percentile(durations, 95))}"
+            ),
+        ))
+    sections.append(Section(activityTitle="테스트별 결과", facts=type_facts))
+
+    failure_facts = []
+    for e in failed:
+        message = _short_message(e.message, message_chars)
+        failure_facts.append(Fact(
+            name=f"{_get_test_type_korean(e.test_type)} {_format_datetime(e.end_time)}",
+            value=f"{message} ([스크린샷]({e.screenshot_url}))" if e.screenshot_url else message,
+        ))
+
+    card = TeamsMessageCard(
+        title=f"{status_emoji} PERSO 자동화 테스트 요약 - 성공 {passed_count} / 실패 {len(failed)}",
+        summary=f"테스트 요약 (실행 {len(entries)}회, 실패 {len(failed)}회)",
+        themeColor=theme_color,
+        sections=sections,
+    )
+
+    # 크기 제한을 넘으면 오래된 실패부터 생략
+    omitted = 0
+    while True:
+        facts = list(failure_facts[omitted:])
+        if omitted:
+            facts.insert(0, Fact(name="이전 실패", value=f"외 {omitted}건"))
+        card.sections = sections + ([Section(activityTitle="실패한 실행", facts=facts)] if facts else [])
+        payload = card.model_dump(exclude_none=True)
+        if _card_size(payload) <= max_bytes or omitted >= len(failure_facts):
+            break
+        omitted += 1
+
+    if _card_size(payload) > max_bytes:
+        payload = _shrink_facts(card, max_bytes)
+    return payload
+
+
+class TeamsDigest:
+    """결과를 모아서 요약 카드로 보내는 요약 모드
+
+    - 결과는 window초 동안 (또는 max_runs개가 찰 때까지) 모아서 요약 카드 하나로 전송
+    - 테스트 종류별로 직전 결과와 성공/실패가 다르면 (처음 결과는 실패일 때만) 바로 카드 전송
+
+    Args:
+        window: 요약 카드 전송 주기 (초)
+        max_runs: 요약 카드 하나의 최대 결과 수
+    """
+
+    def __init__(self, window: float, max_runs: int):
+        self.window = window
+        self.max_runs = max_runs
+        self._entries: List[DigestEntry] = []
+        self._window_started: Optional[float] = None
+        self._last_success: Dict[str, bool] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, entry: DigestEntry, url: str, logs: Optional[List[str]] = None,
+            timeout: float = 10.0) -> None:
+        """결과 추가 (상태가 바뀌었으면 바로 카드 전송)"""
+        previous = self._last_success.get(entry.test_type)
+        self._last_success[entry.test_type] = entry.success
+        changed = (not entry.success) if previous is None else previous != entry.success
+        if changed:
+            card = _build_message_card(
+                test_type=entry.test_type,
+                success=entry.success,
+                message=entry.message,
+                start_time=entry.start_time,
+                end_time=entry.end_time,
+                screenshot_url=entry.screenshot_url,
+                logs=logs,
+                log_url=entry.log_url,
+            )
+            teams_outbox.enqueue(url, card, timeout=timeout)
+
+        if not self._entries:
+            self._window_started = time.monotonic()
+        self._entries.append(entry)
+        if len(self._entries) >= self.max_runs:
+            self.flush(url)
+
+    def flush(self, url: Optional[str] = None) -> None:
+        """모은 결과를 요약 카드로 전송"""
+        url = url or TEAMS_WEBHOOK_URL
+        if not self._entries or not url:
+            return
+        entries, self._entries = self._entries, []
+        self._window_started = None
+        teams_outbox.enqueue(url, _build_digest_card(entries))
+        logger.info(f"📨 Teams 요약 카드 전송 대기열 추가 (결과 {len(entries)}개)")
+
+    async def start(self) -> None:
+        """주기 전송 시작 (서버 lifespan)"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """주기 전송 종료 (남은 결과는 요약 카드로 전송)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.window, 5.0))
+            started = self._window_started
+            if started is not None and time.monotonic() - started >= self.window:
+                self.flush()
+
+
+# 프로세스 전역 요약 (TEAMS_DIGEST_ENABLED일 때만 사용)
+teams_digest = TeamsDigest(window=TEAMS_DIGEST_WINDOW, max_runs=TEAMS_DIGEST_MAX_RUNS)
+
+
+# =============================================================================
+# 전송
+# =============================================================================
 
 
 async def send_teams_notification(
@@ -142,32 +495,88 @@ async def send_teams_notification(
     logs: Optional[List[str]] = None,
     webhook_url: Optional[str] = None,
     timeout: float = 10.0,
+    log_filename: Optional[str] = None,
 ) -> bool:
     """Teams로 테스트 결과 알림 전송 (async)
 
+    카드를 outbox에 넣고 바로 반환하므로 테스트 완료가 알림 전송을 기다리지 않습니다.
+    요약 모드(TEAMS_DIGEST_ENABLED)에서는 teams_digest에 결과를 추가합니다.
+
     Args:
         test_type: 테스트 타입 ("login", "upload", "translate")
         success: 성공 여부
         message: 결과 메시지
         start_time: 테스트 시작 시간
         end_time: 테스트 종료 시간
-        screenshot_filename: 스크린샷 파일명 (예: "login_success.png")
+        screenshot_filename: 스크린샷 경로 (/screenshots 기준, 예: "<run_id>/login_success.png")
         logs: 실행 로그 목록
         webhook_url: Teams Webhook URL (기본값: 환경변수에서 로드)
         timeout: 요청 타임아웃 (초)
+        log_filename: 전체 로그 경로 (/screenshots 기준, 예: "<run_id>/run_log.jsonl", 카드에 링크)
 
     Returns:
-        bool: 전송 성공 여부
+        bool: outbox/요약 추가 여부 (Webhook URL이 없으면 False)
     """
+    if TEAMS_DIGEST_ENABLED:
+        url = webhook_url or TEAMS_WEBHOOK_URL
+        if not url:
+            logger.warning("❌ TEAMS_WEBHOOK_URL이 설정되지 않았습니다. 알림을 건너뜁니다.")
+            return False
+        teams_digest.add(
+            DigestEntry(
+                test_type=test_type,
+                success=success,
+                message=message,
+                start_time=start_time,
+                end_time=end_time,
+                screenshot_url=_artifact_url(screenshot_filename),
+                log_url=_artifact_url(log_filename),
+            ),
+            url=url,
+            logs=logs,
+            timeout=timeout,
+        )
+        return True
+
+    return _enqueue_notification(
+        test_type=test_type,
+        success=success,
+        message=message,
+        start_time=start_time,
+        end_time=end_time,
+        screenshot_filename=screenshot_filename,
+        logs=logs,
+        webhook_url=webhook_url,
+        timeout=timeout,
+        log_filename=log_filename,
+    ) is not None
+
+
+def _artifact_url(filename: Optional[str]) -> Optional[str]:
+    """아티팩트 경로 (/screenshots 기준) -> 외부 URL"""
+    if not filename:
+        return None
+    return f"{APP_BASE_URL}/screenshots/{filename}"
+
+
+def _enqueue_notification(
+    test_type: str,
+    success: bool,
+    message: str,
+    start_time: datetime,
+    end_time: datetime,
+    screenshot_filename: Optional[str],
+    logs: Optional[List[str]],
+    webhook_url: Optional[str],
+    timeout: float,
+    log_filename: Optional[str] = None,
+) -> Optional[str]:
+    """MessageCard를 만들어 outbox에 추가 (알림 ID 반환, Webhook URL이 없으면 None)"""
     url = webhook_url or TEAMS_WEBHOOK_URL
 
     if not url:
         logger.warning("❌ TEAMS_WEBHOOK_URL이 설정되지 않았습니다. 알림을 건너뜁니다.")
-        return False
-
-    screenshot_url = None
-    if screenshot_filename:
-        screenshot_url = f"{APP_BASE_URL}/screenshots/{screenshot_filename}"
+        return None
 
     card = _build_message_card(
         test_type=test_type,
@@ -175,27 +584,12 @@ async def send_teams_notification(
         message=message,
         start_time=start_time,
         end_time=end_time,
-        screenshot_url=screenshot_url,
+        screenshot_url=_artifact_url(screenshot_filename),
         logs=logs,
+        log_url=_artifact_url(log_filename),
     )
 
-    async with httpx.AsyncClient(timeout=timeout, verify=False) as client:
-        try:
-            resp = await client.post(url, json=card)
-
-            if resp.is_error:
-                logger.error(
-                    f"❌ Teams 알림 전송 실패. "
-                    f"status={resp.status_code} body={resp.text[:200]}"
-                )
-                return False
-
-            logger.info("✅ Teams 알림 전송 성공")
-            return True
-
-        except httpx.RequestError as exc:
-            logger.error(f"❌ Teams 알림 요청 오류: {exc}")
-            return False
+    return teams_outbox.enqueue(url, card, timeout=timeout)
 
 
 def send_teams_notification_sync(
@@ -208,11 +602,13 @@ def send_teams_notification_sync(
     logs: Optional[List[str]] = None,
     webhook_url: Optional[str] = None,
     timeout: float = 10.0,
+    log_filename: Optional[str] = None,
 ) -> bool:
     """Teams로 테스트 결과 알림 전송 (sync wrapper for CLI)
 
-    CLI 환경에서 호출할 때 사용합니다.
-    내부적으로 asyncio.run()을 사용하여 async 함수를 호출합니다.
+    CLI 환경에서 호출할 때 사용합니다 (실행마다 프로세스가 끝나므로 요약 모드와 관계없이 바로 전송).
+    outbox에 넣은 뒤 최대 TEAMS_SYNC_DRAIN_TIMEOUT초 동안 outbox를 비우며 전송합니다.
+    그 안에 보내지 못한 알림은 디스크에 남아 다음 실행(또는 서버)에서 전송됩니다.
 
     Args:
         test_type: 테스트 타입 ("login", "upload", "translate")
@@ -220,24 +616,29 @@ def send_teams_notification_sync(
         message: 결과 메시지
         start_time: 테스트 시작 시간
         end_time: 테스트 종료 시간
-        screenshot_filename: 스크린샷 파일명 (예: "login_success.png")
+        screenshot_filename: 스크린샷 경로 (/screenshots 기준, 예: "<run_id>/login_success.png")
         logs: 실행 로그 목록
         webhook_url: Teams Webhook URL (기본값: 환경변수에서 로드)
         timeout: 요청 타임아웃 (초)
+        log_filename: 전체 로그 경로 (/screenshots 기준, 예: "<run_id>/run_log.jsonl", 카드에 링크)
 
     Returns:
         bool: 전송 성공 여부
     """
-    return asyncio.run(
-        send_teams_notification(
-            test_type=test_type,
-            success=success,
-            message=message,
-            start_time=start_time,
-            end_time=end_time,
-            screenshot_filename=screenshot_filename,
-            logs=logs,
-            webhook_url=webhook_url,
-            timeout=timeout,
-        )
+    message_id = _enqueue_notification(
+        test_type=test_type,
+        success=success,
+        message=message,
+        start_time=start_time,
+        end_time=end_time,
+        screenshot_filename=screenshot_filename,
+        logs=logs,
+        webhook_url=webhook_url,
+        timeout=timeout,
+        log_filename=log_filename,
     )
+    if message_id is None:
+        return False
+
+    asyncio.run(teams_outbox.drain(TEAMS_SYNC_DRAIN_TIMEOUT))
+    return not teams_outbox.is_pending(message_id)
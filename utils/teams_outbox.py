@@ -0,0 +1,390 @@
+# utils/teams_outbox.py
+"""Teams 알림 발송 대기열 (outbox)
+
+알림은 바로 보내지 않고 outbox에 넣은 뒤 백그라운드 전송기가 보냅니다.
+테스트 완료는 알림 전송을 기다리지 않습니다.
+
+- 저장: 알림마다 TEAMS_OUTBOX_DIR/<id>.json (서버 재시작 후 이어서 전송)
+- 전송: 프로세스에서 공유하는 httpx.AsyncClient 하나 (연결 재사용)
+- 재시도: 지수 백오프 + 지터 (TEAMS_RETRY_BASE ~ TEAMS_RETRY_MAX초),
+  429는 Retry-After만큼 대기열 전체를 멈춤, TEAMS_MAX_ATTEMPTS번 실패하면 failed/로 이동
+- 여러 프로세스(서버 + CLI)가 같은 디렉토리를 써도 한 번만 전송: 보내기 전에
+  <id>.json을 <id>.sending.<pid>로 rename해서 선점하고, 선점에 실패하면 다른 프로세스가
+  보낸 것으로 보고 버림 (선점한 프로세스가 죽었으면 다음 시작 때 되돌림)
+- CLI: drain()으로 종료 전에 최대 TEAMS_SYNC_DRAIN_TIMEOUT초 동안 전송
+  (이 프로세스가 추가한 알림이 모두 끝나면 반환)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import httpx
+
+from utils.config import (
+    TEAMS_MAX_ATTEMPTS,
+    TEAMS_OUTBOX_DIR,
+    TEAMS_RETRY_BASE,
+    TEAMS_RETRY_MAX,
+)
+from utils.metrics import retries_total
+
+logger = logging.getLogger(__name__)
+
+# 재시도하는 HTTP 상태 (그 외 4xx는 payload/URL 문제이므로 바로 failed/로 이동)
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class OutboxMessage:
+    """outbox에 있는 알림 하나
+
+    Attributes:
+        id: 알림 ID (파일명, 생성 순서로 정렬됨)
+        url: Webhook URL
+        payload: 전송할 JSON (MessageCard)
+        timeout: 요청 타임아웃 (초)
+        created_at: 추가 시각 (time.time)
+        attempts: 전송 시도 횟수
+        next_attempt_at: 다음 전송 가능 시각 (time.time)
+        last_error: 마지막 실패 이유
+    """
+
+    id: str
+    url: str
+    payload: Dict[str, Any]
+    timeout: float = 10.0
+    created_at: float = 0.0
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    last_error: Optional[str] = None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) -> 대기 시간 (초)"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TeamsOutbox:
+    """디스크에 보관되는 Teams 알림 대기열 + 백그라운드 전송기
+
+    Args:
+        outbox_dir: 알림 파일 저장 디렉토리 (실패한 알림은 failed/ 하위)
+        max_attempts: 최대 전송 시도 횟수
+        retry_base: 재시도 대기 시간 시작값 (초)
+        retry_max: 재시도 대기 시간 최댓값 (초)
+    """
+
+    def __init__(self, outbox_dir: Path, max_attempts: int = 8,
+                 retry_base: float = 2.0, retry_max: float = 300.0):
+        self.outbox_dir = outbox_dir
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._messages: Dict[str, OutboxMessage] = {}
+        # 디스크에 파일이 있는 알림 (선점 대상), 이 프로세스가 추가한 알림
+        self._on_disk: Set[str] = set()
+        self._enqueued: Set[str] = set()
+        self._paused_until = 0.0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        (self.outbox_dir / "failed").mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # -------------------------------------------------------------------------
+    # 저장
+    # -------------------------------------------------------------------------
+
+    def enqueue(self, url: str, payload: Dict[str, Any], timeout: float = 10.0) -> str:
+        """알림을 outbox에 추가 (디스크에 저장 후 전송기 깨움)
+
+        Returns:
+            str: 알림 ID
+        """
+        now = time.time()
+        message = OutboxMessage(
+            id=f"{int(now * 1000):013d}-{uuid.uuid4().hex[:8]}",
+            url=url,
+            payload=payload,
+            timeout=timeout,
+            created_at=now,
+        )
+        self._messages[message.id] = message
+        self._enqueued.add(message.id)
+        self._write(message)
+        self._notify()
+        return message.id
+
+    def is_pending(self, message_id: str) -> bool:
+        return message_id in self._messages
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._messages),
+            "paused_for": round(max(self._paused_until - time.time(), 0.0), 1),
+            "running": self._task is not None,
+        }
+
+    def _path(self, message_id: str) -> Path:
+        return self.outbox_dir / f"{message_id}.json"
+
+    def _sending_path(self, message_id: str) -> Path:
+        return self.outbox_dir / f"{message_id}.sending.{os.getpid()}"
+
+    def _write(self, message: OutboxMessage) -> None:
+        path = self._path(message.id)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            # Webhook URL이 들어있으므로 소유자만 읽을 수 있게 저장
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(message), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._on_disk.add(message.id)
+        except OSError as e:
+            self._on_disk.discard(message.id)
+            logger.warning(f"⚠️ 알림 outbox 저장 실패 (메모리에서만 재시도): {e}")
+
+    def _claim(self, message: OutboxMessage) -> bool:
+        """전송 전에 알림 파일 선점 (다른 프로세스가 이미 가져갔으면 False)"""
+        if message.id not in self._on_disk:
+            return True
+        try:
+            os.replace(self._path(message.id), self._sending_path(message.id))
+        except FileNotFoundError:
+            # 다른 프로세스가 보내는 중이거나 이미 보냄
+            self._forget(message)
+            return False
+        except OSError as e:
+            logger.warning(f"⚠️ 알림 outbox 파일 선점 실패 (그대로 전송): {e}")
+        return True
+
+    def _forget(self, message: OutboxMessage) -> None:
+        self._messages.pop(message.id, None)
+        self._on_disk.discard(message.id)
+        self._enqueued.discard(message.id)
+
+    def _release(self, message: OutboxMessage) -> None:
+        """재시도할 알림을 다시 <id>.json으로 저장하고 선점 파일 삭제"""
+        self._write(message)
+        try:
+            self._sending_path(message.id).unlink()
+        except OSError:
+            pass
+
+    def _remove(self, message: OutboxMessage) -> None:
+        self._forget(message)
+        for path in (self._sending_path(message.id), self._path(message.id)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _dead_letter(self, message: OutboxMessage) -> None:
+        """전송을 포기한 알림은 failed/로 이동 (수동 확인용)"""
+        self._forget(message)
+        source = self._sending_path(message.id)
+        if not source.exists():
+            source = self._path(message.id)
+        try:
+            os.replace(source, self.outbox_dir / "failed" / f"{message.id}.json")
+        except OSError:
+            pass
+        logger.error(
+            f"❌ Teams 알림 전송 포기 ({message.attempts}회 시도): {message.last_error}"
+        )
+
+    def _recover_claims(self) -> None:
+        """전송 중에 종료된 프로세스가 선점한 알림을 <id>.json으로 되돌림"""
+        for path in self.outbox_dir.glob("*.sending.*"):
+            message_id, _, pid = path.name.partition(".sending.")
+            try:
+                os.kill(int(pid), 0)
+                continue  # 아직 실행 중인 프로세스
+            except ProcessLookupError:
+                pass
+            except (ValueError, PermissionError, OSError):
+                continue
+            try:
+                os.replace(path, self._path(message_id))
+            except OSError:
+                pass
+
+    def _load(self) -> None:
+        """재시작 전에 보내지 못한 알림 불러오기"""
+        self._recover_claims()
+        for path in sorted(self.outbox_dir.glob("*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                message = OutboxMessage(**data)
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"⚠️ 알림 outbox 파일 읽기 실패 ({path.name}): {e}")
+                continue
+            self._messages[message.id] = message
+            self._on_disk.add(message.id)
+        if self._messages:
+            logger.info(f"📬 미발송 Teams 알림 {len(self._messages)}개 불러옴")
+
+    # -------------------------------------------------------------------------
+    # 백그라운드 전송
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """전송기 시작 (서버 lifespan)"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._client = httpx.AsyncClient(verify=False)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """전송기 종료 (남은 알림은 디스크에 남아 다음 시작 때 전송)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        self._wake = None
+        self._loop = None
+
+    def _notify(self) -> None:
+        """전송기 깨우기 (어느 스레드에서든 호출 가능)"""
+        if self._wake is None or self._loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                delay = await self._send_due(self._client)
+            except Exception as e:
+                logger.error(f"Teams outbox sender error: {e}")
+                delay = self.retry_base
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self, timeout: float) -> int:
+        """이 프로세스가 추가한 알림이 모두 끝날 때까지 전송 (CLI용, 백그라운드 전송기와 함께 쓰지 않음)
+
+        다른 프로세스가 남긴 알림도 보낼 때가 되었으면 함께 보내지만 (선점해서 중복 없음),
+        그 알림의 재시도를 기다리지는 않습니다.
+
+        Returns:
+            int: 제한 시간 안에 보내지 못한 이 프로세스의 알림 수 (디스크에 남아 다음 실행 때 전송)
+        """
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(verify=False) as client:
+            while self._enqueued:
+                delay = await self._send_due(client)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if delay:
+                    await asyncio.sleep(min(delay, remaining))
+        return len(self._enqueued)
+
+    async def _send_due(self, client: httpx.AsyncClient) -> Optional[float]:
+        """전송할 때가 된 알림을 순서대로 전송
+
+        Returns:
+            float: 다음 알림까지 기다릴 시간 (초, 보낼 알림이 없으면 None)
+        """
+        next_delay: Optional[float] = None
+        for message in sorted(self._messages.values(), key=lambda m: m.id):
+            now = time.time()
+            if self._paused_until > now:
+                return self._paused_until - now
+            if message.next_attempt_at > now:
+                wait = message.next_attempt_at - now
+                next_delay = wait if next_delay is None else min(next_delay, wait)
+                continue
+            await self._send(client, message)
+            if message.id in self._messages:
+                wait = max(message.next_attempt_at - time.time(), 0.0)
+                next_delay = wait if next_delay is None else min(next_delay, wait)
+        return next_delay
+
+    async def _send(self, client: httpx.AsyncClient, message: OutboxMessage) -> None:
+        """알림 하나 전송 (성공하면 삭제, 실패하면 재시도 시각 기록)"""
+        if not self._claim(message):
+            return
+        message.attempts += 1
+        retry_after = None
+        try:
+            resp = await client.post(message.url, json=message.payload, timeout=message.timeout)
+        except httpx.RequestError as exc:
+            message.last_error = f"요청 오류: {exc}"
+        else:
+            if not resp.is_error:
+                self._remove(message)
+                logger.info("✅ Teams 알림 전송 성공")
+                return
+            message.last_error = f"status={resp.status_code} body={resp.text[:200]}"
+            if resp.status_code not in RETRY_STATUS:
+                self._dead_letter(message)
+                return
+            if resp.status_code == 429:
+                retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+
+        if message.attempts >= self.max_attempts:
+            self._dead_letter(message)
+            return
+
+        delay = retry_after if retry_after is not None else self._backoff(message.attempts)
+        message.next_attempt_at = time.time() + delay
+        if retry_after is not None:
+            # 속도 제한은 Webhook 단위이므로 대기열 전체를 멈춤
+            self._paused_until = message.next_attempt_at
+        self._release(message)
+        retries_total.inc("teams_notification")
+        logger.warning(
+            f"⚠️ Teams 알림 전송 실패, {delay:.1f}초 후 재시도 "
+            f"({message.attempts}/{self.max_attempts}): {message.last_error}"
+        )
+
+    def _backoff(self, attempts: int) -> float:
+        """지수 백오프 + 지터 (절반은 고정, 절반은 무작위)"""
+        cap = min(self.retry_max, self.retry_base * (2 ** (attempts - 1)))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+
+# 프로세스 전역 outbox
+teams_outbox = TeamsOutbox(
+    outbox_dir=TEAMS_OUTBOX_DIR,
+    max_attempts=TEAMS_MAX_ATTEMPTS,
+    retry_base=TEAMS_RETRY_BASE,
+    retry_max=TEAMS_RETRY_MAX,
+)
@@ -0,0 +1,197 @@
+# utils/tracing.py
+"""실패한 실행만 Playwright trace 저장 (단계별 chunk 순환 보관)
+
+모든 실행에 전체 trace를 남기면 부하가 클 때 CPU/디스크 비용이 크므로,
+trace는 계속 기록하되 단계(run_step) 시작마다 chunk를 끊어 임시 디렉토리에
+최근 TRACE_KEEP_CHUNKS개만 보관합니다. 실행이 실패했을 때만 보관 중인 chunk를
+run 아티팩트(kind "trace")로 옮기고, 성공하면 컨텍스트를 닫을 때 모두 삭제합니다.
+
+- chunk 하나 = 단계 하나 (첫 chunk는 첫 단계 전 준비 과정), 각각 독립된 trace zip
+  (`playwright show-trace <파일>`로 열기)
+- 측정: run 메트릭 "trace" (trace 처리 시간, 보관 중인 chunk 크기, 저장한 파일)
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, List, Optional
+
+from utils.artifacts import artifact_store
+from utils.config import TRACE_KEEP_CHUNKS, TRACE_SNAPSHOTS
+from utils.run_state import get_run_state
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TraceChunk:
+    """보관 중인 chunk 하나
+
+    Attributes:
+        index: chunk 순번 (0 = 첫 단계 전)
+        title: 단계 이름
+        path: 임시 파일 경로
+        size: 파일 크기 (바이트)
+    """
+
+    index: int
+    title: str
+    path: Path
+    size: int
+
+
+class FailureTrace:
+    """컨텍스트 하나의 순환 trace (run_state.metrics["trace"])
+
+    Args:
+        context: Playwright BrowserContext
+        keep_chunks: 보관할 최근 chunk 수
+
+    Attributes:
+        overhead_seconds: trace 시작/chunk 전환/저장에 쓴 시간 합계 (초)
+        chunks_recorded: 지금까지 끊은 chunk 수
+        saved: 저장한 trace 아티팩트 경로 ("<run_id>/<파일명>", 실패 시에만)
+    """
+
+    def __init__(self, context, keep_chunks: int):
+        self.context = context
+        self.keep_chunks = keep_chunks
+        self.overhead_seconds = 0.0
+        self.chunks_recorded = 0
+        self.saved: List[str] = []
+        self._chunks: Deque[TraceChunk] = deque()
+        self._title = "준비"
+        self._active = False
+        self._temp_dir: Optional[Path] = None
+
+    @property
+    def kept_bytes(self) -> int:
+        return sum(c.size for c in self._chunks)
+
+    def to_dict(self) -> dict:
+        return {
+            "overhead_seconds": round(self.overhead_seconds, 3),
+            "chunks_recorded": self.chunks_recorded,
+            "chunks_kept": len(self._chunks),
+            "kept_bytes": self.kept_bytes,
+            "saved": self.saved,
+        }
+
+    # -------------------------------------------------------------------------
+    # 기록
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """trace 기록 시작 (첫 chunk 시작 포함)"""
+        started = time.monotonic()
+        self._temp_dir = Path(tempfile.mkdtemp(prefix="perso_trace_"))
+        await self.context.tracing.start(
+            screenshots=TRACE_SNAPSHOTS, snapshots=TRACE_SNAPSHOTS, sources=False
+        )
+        self._active = True
+        self.overhead_seconds += time.monotonic() - started
+
+    async def rotate(self, title: str) -> None:
+        """지금까지의 chunk를 임시 파일로 끊고 새 chunk 시작 (단계 시작 시)"""
+        if not self._active:
+            return
+        started = time.monotonic()
+        try:
+            await self._stop_chunk()
+            await self.context.tracing.start_chunk(title=title)
+            self._title = title
+        except Exception as e:
+            logger.warning(f"⚠️ trace chunk 전환 실패 (이후 trace 기록 중지): {e}")
+            self._active = False
+        self.overhead_seconds += time.monotonic() - started
+
+    async def _stop_chunk(self) -> None:
+        index = self.chunks_recorded
+        path = self._temp_dir / f"chunk_{index:03d}.zip"
+        await self.context.tracing.stop_chunk(path=str(path))
+        self.chunks_recorded += 1
+        self._chunks.append(TraceChunk(index, self._title, path, path.stat().st_size))
+        while len(self._chunks) > self.keep_chunks:
+            self._chunks.popleft().path.unlink(missing_ok=True)
+
+    # -------------------------------------------------------------------------
+    # 저장/정리
+    # -------------------------------------------------------------------------
+
+    async def save(self, log=None) -> List[str]:
+        """진행 중인 chunk를 끊고 보관 중인 chunk를 run 아티팩트로 저장 (실패 시)
+
+        Returns:
+            list: 저장한 아티팩트 경로 ("<run_id>/trace_<순번>.zip", /screenshots 기준)
+        """
+        _log = log if log else print
+        if not self._active:
+            return []
+        started = time.monotonic()
+        self._active = False
+        try:
+            await self._stop_chunk()
+            await self.context.tracing.stop()
+        except Exception as e:
+            _log(f"⚠️ trace 마무리 실패 (이전 chunk만 저장): {e}")
+
+        run_id = get_run_state(self.context).run_id or "local"
+        for chunk in self._chunks:
+            name = f"trace_{chunk.index:03d}.zip"
+            try:
+                shutil.move(str(chunk.path), artifact_store.path_for(run_id, name))
+            except (OSError, ValueError) as e:
+                _log(f"⚠️ trace 저장 실패 ({chunk.title}): {e}")
+                continue
+            saved = artifact_store.add(run_id, name, kind="trace")
+            if saved:
+                self.saved.append(saved)
+                _log(f"🧵 trace 저장: {saved} ({chunk.title}, {chunk.size / 1024:.0f}KB)")
+        self.overhead_seconds += time.monotonic() - started
+        self.cleanup()
+        return self.saved
+
+    def cleanup(self) -> None:
+        """임시 chunk 삭제 (컨텍스트 종료 시)"""
+        self._active = False
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+
+# =============================================================================
+# 헬퍼
+# =============================================================================
+
+
+async def start_failure_trace(context) -> FailureTrace:
+    """컨텍스트에 순환 trace 시작 (create_browser_context에서 TRACE_ON_FAILURE일 때)"""
+    trace = FailureTrace(context=context, keep_chunks=TRACE_KEEP_CHUNKS)
+    get_run_state(context).metrics["trace"] = trace
+    context.on("close", lambda _: trace.cleanup())
+    try:
+        await trace.start()
+    except Exception as e:
+        logger.warning(f"⚠️ trace 시작 실패: {e}")
+        trace.cleanup()
+    return trace
+
+
+def get_failure_trace(page_or_context) -> Optional[FailureTrace]:
+    """이 실행의 순환 trace (TRACE_ON_FAILURE가 아니면 None)"""
+    trace = get_run_state(page_or_context).metrics.get("trace")
+    return trace if isinstance(trace, FailureTrace) else None
+
+
+async def save_failure_trace(page_or_context, log=None) -> List[str]:
+    """실패 시 보관 중인 trace 저장 (순환 trace가 없으면 아무것도 하지 않음)"""
+    trace = get_failure_trace(page_or_context)
+    if trace is None:
+        return []
+    return await trace.save(log)
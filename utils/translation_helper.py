@@ -1,10 +1,17 @@
 # utils/translation_helper.py
+import re
+
 from utils.logger import create_logger
-import time
+from utils.wait_engine import wait_for_dom_quiet, wait_for_hidden, wait_for_response, wait_for_visible
+from utils.steps import timed_span
 
 _default_log = create_logger()
 
-def select_language_from_dropdown(page, language_name, dropdown_index=0, log=None):
+# 번역하기 클릭이 보내는 번역/프로젝트 생성 요청 (분석 등 다른 POST 제외)
+_TRANSLATE_REQUEST_PATTERN = re.compile(r"perso\.ai/(?:.*/)?(translat\w*|dubbing|projects?)\b", re.I)
+
+@timed_span("select_language")
+async def select_language_from_dropdown(page, language_name, dropdown_index=0, log=None):
     """드롭다운에서 언어 선택
     
     Args:
@@ -17,31 +24,33 @@ def select_language_from_dropdown(page, language_name, dropdown_index=0, log=Non
     
     log(f"🔍 {language_name} 선택을 위한 드롭다운 열기...")
     dropdown = page.locator('button[role="combobox"]').nth(dropdown_index)
-    dropdown.click(force=True)
-    time.sleep(2)
-    
+    await dropdown.click(force=True)
+
     # 검색 input에 언어 입력
     log(f"⌨️  '{language_name}' 입력 중...")
     search_input = page.locator('input[placeholder*="언어를 검색"]').first
-    search_input.fill(language_name)
-    time.sleep(1.5)
-    
-    # 언어 요소 클릭
+    await wait_for_visible(page, search_input, timeout=5000, label="언어 검색창")
+    await search_input.fill(language_name)
+
+    # 언어 요소 클릭 (검색 결과가 렌더링될 때까지 대기)
     log(f"👆 {language_name} 선택 중...")
-    elements = page.get_by_text(language_name, exact=True).all()
+    await wait_for_visible(page, page.get_by_text(language_name, exact=True).last,
+                           timeout=5000, label=f"{language_name} 검색 결과")
+    elements = await page.get_by_text(language_name, exact=True).all()
     
     # 마지막 요소 선택 (드롭다운 내부 요소)
     target_element = elements[-1] if len(elements) > 0 else elements[0]
     
-    box = target_element.bounding_box()
+    box = await target_element.bounding_box()
     x = box['x'] + box['width'] / 2
     y = box['y'] + box['height'] / 2
-    page.mouse.click(x, y)
-    time.sleep(2)
+    await page.mouse.click(x, y)
+    await wait_for_hidden(page, search_input, timeout=3000, label="언어 드롭다운 닫힘")
     
     log(f"✅ {language_name} 선택 완료!")
 
-def click_translate_button(page, log=None):
+@timed_span("click_translate")
+async def click_translate_button(page, log=None):
     """번역하기 버튼 클릭
     
     Args:
@@ -54,7 +63,15 @@ def click_translate_button(page, log=None):
     translate_button = page.locator('button:has-text("번역하기")').first
     
     log("👆 '번역하기' 버튼 클릭...")
-    translate_button.click()
-    time.sleep(3)
+    response = await wait_for_response(
+        page,
+        lambda r: r.request.method == "POST" and _TRANSLATE_REQUEST_PATTERN.search(r.url) is not None,
+        translate_button.click,
+        timeout=10000,
+        label="번역 요청 응답",
+    )
+    if response is not None:
+        log(f"  ✓ 번역 요청 응답: {response.status}")
+    await wait_for_dom_quiet(page, quiet_ms=500, timeout=3000, label="번역하기 이후 화면")
     
     log("✅ 번역하기 버튼 클릭 완료!")
\ No newline at end of file
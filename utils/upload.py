@@ -1,9 +1,15 @@
-import time
 from pathlib import Path
-from utils.config import VIDEO_FILE_PATH
+from utils.config import VIDEO_FILE_PATH, UPLOAD_START_TIMEOUT, UPLOAD_TIMEOUT
+from utils.upload_monitor import UploadMonitor
+from utils.wait_engine import wait_for_dom_quiet
+from utils.steps import timed_span
 
-def upload_file(page, log):
+@timed_span("upload")
+async def upload_file(page, log):
     """파일 업로드 (검증 제외)
+
+    업로드 요청(청크 포함)이 모두 완료될 때까지 대기하고
+    전송 바이트/시간/속도를 결과 메트릭("upload")에 기록합니다.
     
     Args:
         page: Playwright page
@@ -12,17 +18,48 @@ def upload_file(page, log):
     log("📁 파일 input 찾는 중...")
     file_input = page.locator('input[type="file"]').first
     
-    if not file_input.count():
+    if not await file_input.count():
         log("❌ 파일 input을 찾을 수 없습니다")
         raise Exception("파일 input 없음")
     
     log(f"📤 파일 업로드 중: {Path(VIDEO_FILE_PATH).name}")
-    file_input.set_input_files(VIDEO_FILE_PATH)
-    log("  ✓ 파일 선택 완료")
-    
-    # 업로드 처리 대기 (서버 업로드 시간)
-    log("⏳ 파일 업로드 처리 중...")
-    time.sleep(3)  # 또는 적절한 대기
-    
+    monitor = UploadMonitor(page, VIDEO_FILE_PATH)
+    monitor.start()
+    try:
+        await file_input.set_input_files(VIDEO_FILE_PATH)
+        log("  ✓ 파일 선택 완료")
+
+        # 업로드 처리 대기 (서버가 모든 업로드 요청에 응답할 때까지)
+        log("⏳ 파일 업로드 처리 중...")
+        stats = await monitor.wait_until_complete(
+            start_timeout=UPLOAD_START_TIMEOUT * 1000,
+            timeout=UPLOAD_TIMEOUT * 1000,
+        )
+    finally:
+        monitor.stop()
+
+    if not stats.detected:
+        log("  ⚠️ 업로드 요청을 감지하지 못함 (화면 안정화로 대기)")
+        await wait_for_dom_quiet(page, quiet_ms=500, timeout=5000, label="업로드 처리")
+    elif stats.timed_out:
+        log(
+            f"❌ 업로드 시간 초과 (진행 중인 업로드 요청 {stats.inflight_requests}개, "
+            f"재시도 후에도 실패한 요청 {stats.unresolved_failures}개)"
+        )
+        raise Exception(
+            f"파일 업로드 시간 초과: 업로드 요청 {stats.inflight_requests}개가 "
+            f"{UPLOAD_TIMEOUT}초(또는 단계 마감 시간) 안에 끝나지 않음"
+        )
+    elif not stats.completed:
+        log(f"❌ 업로드 실패 (재시도 후에도 실패한 요청 {stats.unresolved_failures}개, {stats.duration:.1f}초)")
+        raise Exception(f"파일 업로드 요청 실패: 재시도 후에도 실패한 요청 {stats.unresolved_failures}개")
+    else:
+        log(
+            f"  ✓ 업로드 전송 완료: {stats.uploaded_bytes / 1_000_000:.1f}MB, "
+            f"{stats.duration:.1f}초, {stats.mbps:.2f}MB/s (요청 {stats.requests}개)"
+        )
+        if stats.failed_requests:
+            log(f"  ⚠️ 재시도로 복구된 업로드 요청 실패 {stats.failed_requests}개")
+
     log("✅ 파일 업로드 완료!")
     # return 없음!
\ No newline at end of file
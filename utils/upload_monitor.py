@@ -0,0 +1,225 @@
+# utils/upload_monitor.py
+"""파일 업로드 네트워크 감시
+
+set_input_files() 이후 브라우저가 보내는 업로드 요청(POST/PUT/PATCH, multipart 또는
+바이너리 본문)을 request 이벤트로 추적해서 업로드 완료 시점을 판단합니다.
+청크/멀티파트 업로드처럼 요청이 여러 개로 나뉘어도, 진행 중인 업로드 요청이 없고
+idle_ms 동안 새 청크가 시작되지 않으면 서버가 파일을 모두 받은 것으로 봅니다.
+실패한 청크를 업로더가 다시 보내 성공하면 해결된 것으로 보고, 업로드 대상(URL + Content-Range)별
+마지막 시도가 실패한 경우에만 업로드 실패로 판단합니다.
+
+결과(전송 바이트, 소요 시간, MB/s)는 run_state.metrics["upload"]에 기록됩니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from utils.run_state import get_run_state
+from utils.wait_engine import clamp_timeout, record_wait
+
+# 업로드 요청으로 볼 HTTP 메서드
+_UPLOAD_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+# 업로드 요청으로 볼 Content-Type 접두어
+_UPLOAD_CONTENT_TYPES = ("multipart/", "application/octet-stream", "video/", "audio/")
+
+# Content-Type이 일반 API(JSON 등)여도 본문이 이 크기 이상이면 업로드 청크로 간주
+_MIN_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass
+class UploadStats:
+    """실행 하나의 업로드 전송 통계
+
+    Attributes:
+        file_bytes: 업로드한 파일 크기
+        uploaded_bytes: 업로드 요청 본문 합계 (멀티파트 헤더 포함)
+        requests: 완료된 업로드 요청 수 (청크 수)
+        failed_requests: 실패한 업로드 요청 수 (재시도로 해결된 실패 포함)
+        unresolved_failures: 마지막 시도가 실패한 업로드 대상 수
+        duration: 첫 업로드 요청 시작 ~ 마지막 요청 완료 (초)
+        detected: 업로드 요청을 감지했는지 여부
+        completed: 모든 업로드 대상의 마지막 요청이 성공했는지 여부
+        timed_out: 업로드 요청이 끝나기 전에 대기 시간이 초과되었는지 여부
+        inflight_requests: 대기 시간 초과 시점에 진행 중이던 업로드 요청 수
+    """
+
+    file_bytes: int = 0
+    uploaded_bytes: int = 0
+    requests: int = 0
+    failed_requests: int = 0
+    unresolved_failures: int = 0
+    duration: float = 0.0
+    detected: bool = False
+    completed: bool = False
+    timed_out: bool = False
+    inflight_requests: int = 0
+
+    @property
+    def mbps(self) -> float:
+        """전송 속도 (MB/s)"""
+        if self.duration <= 0:
+            return 0.0
+        return self.uploaded_bytes / 1_000_000 / self.duration
+
+    def to_dict(self) -> dict:
+        return {
+            "file_bytes": self.file_bytes,
+            "uploaded_bytes": self.uploaded_bytes,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "unresolved_failures": self.unresolved_failures,
+            "duration": round(self.duration, 2),
+            "mbps": round(self.mbps, 2),
+            "detected": self.detected,
+            "timed_out": self.timed_out,
+            "inflight_requests": self.inflight_requests,
+            "completed": self.completed,
+        }
+
+
+class UploadMonitor:
+    """page의 업로드 요청 추적기
+
+    사용 예:
+        monitor = UploadMonitor(page, file_path)
+        monitor.start()
+        await file_input.set_input_files(file_path)
+        stats = await monitor.wait_until_complete()
+    """
+
+    def __init__(self, page, file_path: Optional[str] = None):
+        self._page = page
+        self._inflight: Dict[object, float] = {}
+        # 업로드 대상(URL + Content-Range) -> 마지막 시도 성공 여부
+        self._targets: Dict[Tuple[str, str], bool] = {}
+        self._first_started: Optional[float] = None
+        self._last_finished: Optional[float] = None
+        self._changed = asyncio.Event()
+        self.stats = UploadStats(file_bytes=os.path.getsize(file_path) if file_path else 0)
+        get_run_state(page).metrics["upload"] = self.stats
+
+    # -------------------------------------------------------------------------
+    # 이벤트 핸들러
+    # -------------------------------------------------------------------------
+
+    def _is_upload(self, request) -> bool:
+        if request.method not in _UPLOAD_METHODS:
+            return False
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith(_UPLOAD_CONTENT_TYPES):
+            return True
+        body = request.post_data_buffer
+        return body is not None and len(body) >= _MIN_CHUNK_BYTES
+
+    def _on_request(self, request) -> None:
+        if not self._is_upload(request):
+            return
+        now = time.monotonic()
+        if self._first_started is None:
+            self._first_started = now
+        self._inflight[request] = now
+        self.stats.detected = True
+        self._changed.set()
+
+    async def _on_request_finished(self, request) -> None:
+        if request not in self._inflight:
+            return
+        try:
+            sizes = await request.sizes()
+            body_bytes = sizes["requestBodySize"]
+        except Exception:
+            body = request.post_data_buffer
+            body_bytes = len(body) if body else 0
+
+        response = await request.response()
+        ok = response is not None and response.ok
+        if ok:
+            self.stats.requests += 1
+            self.stats.uploaded_bytes += body_bytes
+        else:
+            self.stats.failed_requests += 1
+        self._finish(request, ok)
+
+    def _on_request_failed(self, request) -> None:
+        if request not in self._inflight:
+            return
+        self.stats.failed_requests += 1
+        self._finish(request, False)
+
+    def _finish(self, request, ok: bool) -> None:
+        # 같은 대상(청크)의 재시도가 성공하면 이전 실패는 해결된 것으로 봄
+        target = (request.url, request.headers.get("content-range", ""))
+        self._targets[target] = ok
+        self.stats.unresolved_failures = sum(1 for success in self._targets.values() if not success)
+        self._inflight.pop(request, None)
+        self._last_finished = time.monotonic()
+        self.stats.duration = self._last_finished - self._first_started
+        self._changed.set()
+
+    # -------------------------------------------------------------------------
+    # 시작/종료/대기
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """요청 이벤트 구독 (set_input_files 전에 호출)"""
+        self._page.on("request", self._on_request)
+        self._page.on("requestfinished", self._on_request_finished)
+        self._page.on("requestfailed", self._on_request_failed)
+
+    def stop(self) -> None:
+        """요청 이벤트 구독 해제"""
+        self._page.remove_listener("request", self._on_request)
+        self._page.remove_listener("requestfinished", self._on_request_finished)
+        self._page.remove_listener("requestfailed", self._on_request_failed)
+
+    async def wait_until_complete(self, start_timeout: float = 15000, idle_ms: float = 500,
+                                  timeout: float = 300000) -> UploadStats:
+        """업로드 요청이 모두 끝날 때까지 대기
+
+        Args:
+            start_timeout: 첫 업로드 요청을 기다릴 시간 (ms, 넘으면 detected=False로 반환)
+            idle_ms: 마지막 요청 완료 후 다음 청크를 기다릴 시간 (ms)
+            timeout: 전체 최대 대기 시간 (ms, 단계 마감 시간으로 줄어들 수 있음)
+
+        Returns:
+            UploadStats: 업로드 통계 (completed=True면 서버가 모든 요청에 응답함)
+        """
+        timeout = clamp_timeout(self._page, timeout)
+        start = time.monotonic()
+        deadline = start + timeout / 1000
+        start_deadline = start + min(start_timeout, timeout) / 1000
+
+        while True:
+            now = time.monotonic()
+            if not self.stats.detected:
+                wait_until = start_deadline
+            elif self._inflight:
+                wait_until = deadline
+            else:
+                # 마지막 요청 완료 후 idle_ms 동안 새 청크가 없으면 완료
+                idle_until = self._last_finished + idle_ms / 1000
+                if now >= idle_until:
+                    self.stats.completed = self.stats.unresolved_failures == 0
+                    break
+                wait_until = min(idle_until, deadline)
+
+            if now >= wait_until:
+                if self.stats.detected:
+                    self.stats.timed_out = True
+                    self.stats.inflight_requests = len(self._inflight)
+                break
+
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), wait_until - now)
+            except asyncio.TimeoutError:
+                pass
+
+        record_wait(self._page, "업로드 요청 완료", start, self.stats.completed)
+        return self.stats
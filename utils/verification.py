@@ -1,8 +1,11 @@
 """테스트 검증 유틸리티"""
-import time
+from utils.probe import first_visible
+from utils.wait_engine import wait_for_dom_quiet, wait_for_visible
 from utils.video_processing import wait_for_video_processing
+from utils.steps import timed_span
 
-def verify_login_success(page, log):
+@timed_span("verify_login")
+async def verify_login_success(page, log):
     """로그인 성공 여부 검증
     
     프로필 드롭다운 → 로그아웃 버튼 확인
@@ -18,13 +21,13 @@ def verify_login_success(page, log):
         Exception: 검증 실패 시
     """
     log("🔍 로그인 성공 여부 확인 중...")
-    time.sleep(2)  # 화면 안정화
+    await wait_for_dom_quiet(page, quiet_ms=500, timeout=3000, label="화면 안정화")
     
     # 1. 프로필 버튼 찾기
     log("  🔍 프로필 버튼 검색 중...")
     try:
         profile_button = page.locator('text=Plan').first
-        if not profile_button.is_visible(timeout=3000):
+        if not await profile_button.is_visible(timeout=3000):
             raise Exception("프로필 버튼을 찾을 수 없음")
         log("  ✅ 프로필 버튼 발견!")
     except Exception as e:
@@ -33,14 +36,14 @@ def verify_login_success(page, log):
     
     # 2. 드롭다운 열기
     log("  👆 프로필 드롭다운 클릭...")
-    profile_button.click()
-    time.sleep(2)  # 드롭다운 애니메이션 대기
+    await profile_button.click()
+    await wait_for_visible(page, 'text=로그아웃', timeout=3000, label="프로필 드롭다운")
     
     # 3. 로그아웃 버튼 확인
     log("  🔍 로그아웃 버튼 검색 중...")
     try:
         logout_button = page.locator('text=로그아웃').first
-        if not logout_button.is_visible(timeout=3000):
+        if not await logout_button.is_visible(timeout=3000):
             raise Exception("로그아웃 버튼을 찾을 수 없음")
         log("  ✅ 로그아웃 버튼 발견!")
     except Exception as e:
@@ -50,7 +53,8 @@ def verify_login_success(page, log):
     log("✅ 로그인 성공 확인 완료!")
     return True
 
-def verify_upload_success(page, log):
+@timed_span("verify_upload")
+async def verify_upload_success(page, log):
     """업로드 성공 여부 검증
     
     번역 설정 모달 확인
@@ -67,29 +71,18 @@ def verify_upload_success(page, log):
     """
     log("🔍 업로드 성공 여부 확인 중...")
     
-    # 번역 설정 모달 확인
-    try:
-        # 방법 1: "번역 언어" 텍스트
-        modal = page.locator('text=번역 언어').first
-        if modal.is_visible(timeout=3000):
-            log("  ✅ 번역 설정 모달 발견!")
-            return True
-    except:
-        pass
-    
-    # 방법 2: "Auto Detect"
-    try:
-        modal = page.locator('text=Auto Detect').first
-        if modal.is_visible(timeout=2000):
-            log("  ✅ 번역 설정 모달 발견!")
-            return True
-    except:
-        pass
-    
+    # 번역 설정 모달 확인 ("번역 언어" 텍스트 또는 "Auto Detect")
+    probe = await first_visible(page, ['text=번역 언어', 'text=Auto Detect'], timeout=3000,
+                                label="업로드 결과 화면")
+    if probe:
+        log(f"  ✅ 번역 설정 모달 발견! ({probe.selector}, {probe.elapsed:.1f}초)")
+        return True
+
     log("  ❌ 번역 설정 모달 없음")
     raise Exception("번역 설정 모달을 찾을 수 없음")
 
-def verify_translate_success(page, log):
+@timed_span("verify_translate")
+async def verify_translate_success(page, log):
     """번역 성공 여부 검증
     
     비디오 처리가 완료될 때까지 대기하고 성공 확인
@@ -104,6 +97,6 @@ def verify_translate_success(page, log):
     log("🔍 번역 성공 여부 확인 중...")
     
     # 비디오 처리 완료 대기
-    wait_for_video_processing(page, "sample", log)
+    await wait_for_video_processing(page, "sample", log)
     
     log("✅ 번역 성공 확인 완료!")
\ No newline at end of file
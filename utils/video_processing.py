@@ -1,12 +1,20 @@
 # utils/video_processing.py
 from utils.logger import create_logger
 from utils.browser import save_screenshot
+from utils.cancellation import check_cancelled
+from utils.config import VIDEO_PROCESSING_TIMEOUT, VIDEO_STATUS_POLL_INTERVAL
+from utils.metrics import retries_total
+from utils.video_status import VideoStatusWatcher, snapshot_workspace
+from utils.wait_engine import clamp_timeout, record_wait, wait_for_dom_quiet, wait_for_visible
+from utils.web_vitals import collect_web_vitals
+from utils.steps import timed_span
 import time
 
 _default_log = create_logger()
 
 # utils/video_processing.py
-def wait_for_video_processing(page, video_name, log=None):
+@timed_span("video_processing")
+async def wait_for_video_processing(page, video_name, log=None):
     """비디오 처리 전체 플로우
     
     Raises:
@@ -15,17 +23,17 @@ def wait_for_video_processing(page, video_name, log=None):
     log = log or _default_log
     
     # 1. workspace 확인
-    if not _verify_workspace_page(page, log):
-        save_screenshot(page, "translate_error.png", log)
+    if not await _verify_workspace_page(page, log):
+        await save_screenshot(page, "translate_error.png", log)
         raise Exception("workspace 페이지로 이동하지 못함")
     
     # 2. 비디오 찾기
-    video_result = _find_uploaded_video(page, video_name, log)
+    video_result = await _find_uploaded_video(page, video_name, log)
     if not video_result["found"]:
         log("\n" + "="*50)
         log(f"❌ 테스트 실패: {video_name} 영상을 찾을 수 없음")
         log("="*50)
-        save_screenshot(page, "translate_error.png", log)
+        await save_screenshot(page, "translate_error.png", log)
         raise Exception(f"{video_name} 영상을 찾을 수 없음")
     
     # 3. 처리 시작 확인
@@ -33,21 +41,21 @@ def wait_for_video_processing(page, video_name, log=None):
         log("\n" + "="*50)
         log("❌ 테스트 실패: 영상 처리 중 상태를 확인할 수 없음")
         log("="*50)
-        save_screenshot(page, "translate_error.png", log)
+        await save_screenshot(page, "translate_error.png", log)
         raise Exception("영상 처리 중 상태를 확인할 수 없음")
     
     # 4. 처리 완료 대기
-    processing_result = _wait_for_video_processing(page, video_name, log)
+    processing_result = await _wait_for_video_processing(page, video_name, log)
     if not processing_result["success"]:
         log("\n" + "="*50)
         log(f"❌ 테스트 실패: {processing_result['message']}")
         log("="*50)
-        save_screenshot(page, "translate_error.png", log)
+        await save_screenshot(page, "translate_error.png", log)
         raise Exception(processing_result["message"])
     
     log(f"  🎉 영상 처리 성공!")
 
-def _verify_workspace_page(page, log):
+async def _verify_workspace_page(page, log):
     """workspace 페이지 확인 (private)"""
     log("🔍 홈 화면 이동 확인 중...")
     current_url = page.url
@@ -55,9 +63,9 @@ def _verify_workspace_page(page, log):
     
     if "/workspace" in current_url:
         log("  ✓ workspace 페이지에 있음")
-        time.sleep(3)
-        page.wait_for_load_state('networkidle', timeout=10000)
+        await page.wait_for_load_state('networkidle', timeout=10000)
         log("  ✓ 페이지 로딩 완료")
+        await collect_web_vitals(page, "workspace_check", log)
         log("✅ 홈 화면으로 이동 완료!")
         return True
     else:
@@ -65,7 +73,7 @@ def _verify_workspace_page(page, log):
         return False
 
 
-def _find_uploaded_video(page, video_name, log):
+async def _find_uploaded_video(page, video_name, log):
     """업로드된 비디오 찾기 (private)"""
     log(f"\n🔍 업로드된 '{video_name}' 영상 확인 중...")
     
@@ -73,24 +81,19 @@ def _find_uploaded_video(page, video_name, log):
     video_found = False
     
     try:
-        video_element = page.get_by_text(video_name).first
-        
-        if video_element.is_visible(timeout=5000):
+        if await wait_for_visible(page, page.get_by_text(video_name).first, timeout=5000,
+                                  label=f"'{video_name}' 영상"):
             log(f"  ✓ '{video_name}' 영상 발견!")
             video_found = True
-            
-            processing_status_texts = ["대기 중", "영상 처리 중", "음성 추출 중", "번역 중", "음성 생성 중"]
-            
-            for status_text in processing_status_texts:
-                try:
-                    if page.get_by_text(status_text, exact=False).first.is_visible(timeout=2000):
-                        log(f"  ✓ 현재 상태: {status_text}")
-                        processing_started = True
-                        break
-                except:
-                    continue
-            
-            if not processing_started:
+
+            # 상태 문구 렌더링 대기 후 목록 전체를 한 번에 확인
+            await wait_for_dom_quiet(page, quiet_ms=300, timeout=2000, label="영상 목록 렌더링")
+            video = (await snapshot_workspace(page)).status_for(video_name)
+
+            if video.processing:
+                log(f"  ✓ 현재 상태: {video.describe()}")
+                processing_started = True
+            else:
                 log("  ℹ️ 처리 중 텍스트를 찾을 수 없지만 영상은 존재함")
         else:
             log(f"  ⚠️ '{video_name}' 영상을 찾을 수 없음")
@@ -103,75 +106,73 @@ def _find_uploaded_video(page, video_name, log):
     }
 
 
-def _wait_for_video_processing(page, video_name, log):
-    """비디오 처리 완료 대기 (private)"""
+async def _wait_for_video_processing(page, video_name, log):
+    """비디오 처리 완료 대기 (private)
+
+    페이지가 push하는 workspace 스냅샷을 기다리고, VIDEO_STATUS_POLL_INTERVAL초 동안
+    push가 없으면 직접 스냅샷을 읽습니다. VIDEO_PROCESSING_TIMEOUT초가 지나면 실패합니다.
+    """
     log("\n⏳ 영상 처리 완료 대기 중...")
-    
-    processing_complete = False
-    processing_failed = False
-    wait_interval = 10
-    elapsed = 0
+
+    watcher = VideoStatusWatcher(page, video_name)
+    start = time.monotonic()
+    deadline = start + clamp_timeout(page, VIDEO_PROCESSING_TIMEOUT * 1000) / 1000
     last_status_text = ""
-    processing_status_texts = ["대기 중", "영상 처리 중", "음성 추출 중", "번역 중", "음성 생성 중"]
-    
-    while not processing_complete and not processing_failed:
-        time.sleep(wait_interval)
-        elapsed += wait_interval
-        
-        try:
-            # Failed 체크
-            try:
-                if page.get_by_text("Failed", exact=False).first.is_visible(timeout=500):
-                    log(f"  ❌ 'Failed' 감지! 영상 처리 실패")
-                    processing_failed = True
-                    break
-            except:
-                pass
-            
-            # 처리 상태 확인
-            current_status_text = ""
-            still_processing = False
-            
-            for status_text in processing_status_texts:
+    last_progress_log = start
+    result = None
+
+    try:
+        await watcher.start()
+
+        while result is None:
+            check_cancelled(page)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                result = "timeout"
+                break
+
+            snapshot = await watcher.next_snapshot(timeout=min(VIDEO_STATUS_POLL_INTERVAL, remaining))
+            elapsed = time.monotonic() - start
+            if snapshot is None:
                 try:
-                    if page.get_by_text(status_text, exact=False).first.is_visible(timeout=500):
-                        current_status_text = status_text
-                        still_processing = True
-                        break
-                except:
+                    snapshot = await watcher.poll()
+                except Exception as e:
+                    log(f"  ⚠️ 처리 상태 확인 실패: {e} ({elapsed:.0f}초)")
+                    retries_total.inc("status_poll")
                     continue
-            
-            # 상태 변화 로그
-            if still_processing and current_status_text:
-                if current_status_text != last_status_text:
-                    log(f"  🔄 상태 변경: {current_status_text}")
-                    last_status_text = current_status_text
-                else:
-                    log(f"  ⏳ {elapsed}초 경과... ({current_status_text})")
-                continue
-            
+            video = snapshot.status_for(video_name)
+
+            # Failed 체크
+            if video.failed:
+                log(f"  ❌ 'Failed' 감지! 영상 처리 실패")
+                result = "failed"
+
+            # 처리 상태 확인 (상태 변화 로그)
+            elif video.processing:
+                if video.status != last_status_text:
+                    log(f"  🔄 상태 변경: {video.describe()} ({elapsed:.0f}초)")
+                    last_status_text = video.status
+                    last_progress_log = time.monotonic()
+                elif time.monotonic() - last_progress_log >= VIDEO_STATUS_POLL_INTERVAL:
+                    # 진행률 push는 자주 오므로 경과 로그는 폴링 주기마다 한 번만
+                    log(f"  ⏳ {elapsed:.0f}초 경과... ({video.describe()})")
+                    last_progress_log = time.monotonic()
+
             # 완료 확인 (타임스탬프)
-            timestamp_found = False
-            try:
-                if page.get_by_text("초 전").first.is_visible(timeout=500) or \
-                   page.get_by_text("분 전").first.is_visible(timeout=500):
-                    timestamp_found = True
-            except:
-                pass
-            
-            if timestamp_found:
-                log(f"  ✅ 영상 처리 완료! (총 대기 시간: {elapsed}초)")
-                processing_complete = True
-                break
+            elif video.completed:
+                log(f"  ✅ 영상 처리 완료! (총 대기 시간: {elapsed:.0f}초)")
+                result = "completed"
+
             else:
-                log(f"  ⏳ {elapsed}초 경과... (상태 확인 중)")
-        
-        except Exception as e:
-            log(f"  ⚠️ 처리 상태 확인 실패: {e} ({elapsed}초)")
-    
-    if processing_failed:
+                log(f"  ⏳ {elapsed:.0f}초 경과... (상태 확인 중)")
+    finally:
+        await watcher.stop()
+        watcher.stats.result = result
+        record_wait(page, "영상 처리 완료", start, result == "completed")
+
+    if result == "failed":
         return {"success": False, "message": "영상 처리 실패 (Failed)"}
-    elif processing_complete:
+    elif result == "completed":
         return {"success": True, "message": "영상 처리 성공"}
     else:
-        return {"success": False, "message": "처리 상태를 확인할 수 없음"}
\ No newline at end of file
+        return {"success": False, "message": f"영상 처리 시간 초과 ({VIDEO_PROCESSING_TIMEOUT:.0f}초)"}
@@ -0,0 +1,368 @@
+# utils/video_status.py
+"""workspace 영상 목록 스냅샷 + 처리 상태 감시 (push 방식)
+
+- snapshot_workspace(): 한 번의 page.evaluate로 workspace의 영상 목록 전체를 읽어
+  영상별 레코드(제목, 상태, 진행률, 타임스탬프, 실패 여부)를 반환합니다.
+  상태 판단은 모두 Python에서 스냅샷을 대상으로 하므로 상태 문구가 늘어나도
+  확인 비용은 일정합니다.
+- VideoStatusWatcher: 페이지에 MutationObserver를 설치하고 expose_function으로
+  Python 콜백을 연결해서, 스냅샷이 바뀌는 즉시 페이지가 Python으로 보내도록 합니다.
+  push가 끊긴 경우(페이지 이동, observer 누락)를 대비해 일정 주기로 직접 스냅샷을 읽는
+  폴백 폴링을 함께 사용합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from utils.run_state import get_run_state
+
+# =============================================================================
+# 상태 텍스트
+# =============================================================================
+
+# 처리 중 상태 (화면에 하나라도 보이면 처리 중)
+PROCESSING_STATUS_TEXTS = ["대기 중", "영상 처리 중", "음성 추출 중", "번역 중", "음성 생성 중"]
+
+# 처리 실패 표시
+FAILED_TEXT = "Failed"
+
+# 처리 완료 후 표시되는 상대 시간 ("N초 전", "N분 전")
+TIMESTAMP_PATTERN = r"\d+\s*(초|분|시간|일) 전"
+
+# 진행률 표시 ("42%")
+PROGRESS_PATTERN = r"(\d{1,3})\s*%"
+
+# 영상 하나를 감싸는 목록 항목 후보 (상태 문구에서 가장 가까운 조상)
+VIDEO_ITEM_SELECTOR = (
+    'li, tr, [role="row"], [role="listitem"], [class*="card" i], [class*="item" i]'
+)
+
+_BINDING_NAME = "__persoVideoStatusChanged"
+
+# workspace 스냅샷 (push/폴링 공용, 호출 한 번에 목록 전체를 읽음)
+_SNAPSHOT_FN = '''
+(cfg) => {
+    const timestampRe = new RegExp(cfg.timestamp);
+    const progressRe = new RegExp(cfg.progress);
+    const record = (text) => {
+        const lines = text.split('\\n').map(l => l.trim()).filter(Boolean);
+        const isMeta = l => cfg.processing.some(s => l.includes(s)) || l.includes(cfg.failed)
+                         || timestampRe.test(l) || progressRe.test(l);
+        const timestamp = text.match(timestampRe);
+        const progress = text.match(progressRe);
+        return {
+            title: lines.find(l => !isMeta(l)) || '',
+            status: cfg.processing.find(s => text.includes(s)) || null,
+            progress: progress ? Number(progress[1]) : null,
+            timestamp: timestamp ? timestamp[0] : null,
+            failed: text.includes(cfg.failed),
+        };
+    };
+
+    // 상태/실패/타임스탬프 문구를 가진 요소에서 가장 가까운 목록 항목을 영상 하나로 봄
+    const items = new Set();
+    const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const t = node.nodeValue;
+        if (!t || !(cfg.processing.some(s => t.includes(s)) || t.includes(cfg.failed) || timestampRe.test(t))) continue;
+        const item = node.parentElement && node.parentElement.closest(cfg.itemSelector);
+        if (item) items.add(item);
+    }
+    // 중첩된 항목은 바깥쪽만 사용
+    const outer = [...items].filter(el => ![...items].some(o => o !== el && o.contains(el)));
+
+    return {
+        videos: outer.filter(el => el.offsetParent !== null).map(el => record(el.innerText)),
+        page: record(document.body ? document.body.innerText : ''),
+    };
+}
+'''
+
+# observer 설치 (상태가 바뀔 때만 push, debounceMs 동안 변경을 모아서 한 번 계산)
+_WATCH_SCRIPT = '''
+(() => {
+    if (window.__persoStatusWatch) return;
+    const cfg = %(config)s;
+    const compute = () => (%(snapshot_fn)s)(cfg);
+    let last = null;
+    let timer = null;
+    const push = () => {
+        timer = null;
+        const snapshot = compute();
+        const key = JSON.stringify(snapshot);
+        if (key === last) return;
+        last = key;
+        window[cfg.binding](snapshot);
+    };
+    const schedule = () => { if (!timer) timer = setTimeout(push, cfg.debounceMs); };
+    const start = () => {
+        const observer = new MutationObserver(schedule);
+        observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+        window.__persoStatusWatch = {stop: () => { observer.disconnect(); delete window.__persoStatusWatch; }};
+        push();
+    };
+    if (document.body) {
+        start();
+    } else {
+        document.addEventListener('DOMContentLoaded', start, {once: true});
+        window.__persoStatusWatch = {stop: () => {
+            document.removeEventListener('DOMContentLoaded', start);
+            delete window.__persoStatusWatch;
+        }};
+    }
+})()
+'''
+
+
+# =============================================================================
+# 스냅샷
+# =============================================================================
+
+
+@dataclass
+class VideoRecord:
+    """workspace 목록의 영상 하나
+
+    Attributes:
+        title: 영상 제목 (상태/시간 문구가 아닌 첫 줄)
+        status: 처리 중 상태 문구 (처리 중이 아니면 None)
+        progress: 진행률 (%, 표시되지 않으면 None)
+        timestamp: 상대 시간 문구 (예: "3초 전", 처리 완료 후 표시)
+        failed: 처리 실패 표시 여부
+    """
+
+    title: str = ""
+    status: Optional[str] = None
+    progress: Optional[int] = None
+    timestamp: Optional[str] = None
+    failed: bool = False
+
+    @property
+    def processing(self) -> bool:
+        return self.status is not None
+
+    @property
+    def completed(self) -> bool:
+        return self.timestamp is not None and not self.processing and not self.failed
+
+    def describe(self) -> str:
+        """로그용 상태 문자열"""
+        if self.failed:
+            return FAILED_TEXT
+        if self.status:
+            return f"{self.status} ({self.progress}%)" if self.progress is not None else self.status
+        if self.completed:
+            return f"완료 ({self.timestamp})"
+        return "알 수 없음"
+
+    def to_dict(self) -> dict:
+        return {
+            "title": self.title,
+            "status": self.status,
+            "progress": self.progress,
+            "timestamp": self.timestamp,
+            "failed": self.failed,
+        }
+
+
+@dataclass
+class WorkspaceSnapshot:
+    """workspace 영상 목록 스냅샷
+
+    Attributes:
+        videos: 목록 항목별 레코드
+        page: 페이지 전체 텍스트 기준 레코드 (목록 구조를 찾지 못했을 때의 폴백)
+    """
+
+    videos: List[VideoRecord] = field(default_factory=list)
+    page: VideoRecord = field(default_factory=VideoRecord)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WorkspaceSnapshot":
+        return cls(
+            videos=[VideoRecord(**v) for v in data.get("videos", [])],
+            page=VideoRecord(**data["page"]) if data.get("page") else VideoRecord(),
+        )
+
+    def find(self, video_name: str) -> Optional[VideoRecord]:
+        """제목에 video_name이 포함된 첫 영상 (목록 맨 위가 최신)"""
+        for video in self.videos:
+            if video_name in video.title:
+                return video
+        return None
+
+    def status_for(self, video_name: Optional[str]) -> VideoRecord:
+        """video_name의 레코드 (찾지 못하면 페이지 전체 기준 레코드)"""
+        if video_name:
+            video = self.find(video_name)
+            if video is not None:
+                return video
+        return self.page
+
+
+def _snapshot_config() -> dict:
+    return {
+        "processing": PROCESSING_STATUS_TEXTS,
+        "failed": FAILED_TEXT,
+        "timestamp": TIMESTAMP_PATTERN,
+        "progress": PROGRESS_PATTERN,
+        "itemSelector": VIDEO_ITEM_SELECTOR,
+    }
+
+
+async def snapshot_workspace(page) -> WorkspaceSnapshot:
+    """workspace 영상 목록을 한 번의 page.evaluate로 읽기
+
+    Args:
+        page: Playwright page 객체
+
+    Returns:
+        WorkspaceSnapshot: 영상별 레코드 + 페이지 전체 기준 레코드
+    """
+    return WorkspaceSnapshot.from_dict(await page.evaluate(_SNAPSHOT_FN, _snapshot_config()))
+
+
+# =============================================================================
+# push 감시
+# =============================================================================
+
+
+@dataclass
+class VideoStatusStats:
+    """영상 처리 상태 감시 통계 (run_state.metrics["video_status"])
+
+    Attributes:
+        pushes: 페이지에서 push된 스냅샷 수
+        polls: 폴백 폴링 횟수
+        transitions: 상태 변경 기록 [{"status": ..., "at": 감시 시작 후 초, "source": "push"|"poll"}]
+        duration: 감시 시작 ~ 종료 (초)
+        result: "completed" | "failed" | "timeout"
+    """
+
+    pushes: int = 0
+    polls: int = 0
+    transitions: List[Dict[str, Any]] = field(default_factory=list)
+    duration: float = 0.0
+    result: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "pushes": self.pushes,
+            "polls": self.polls,
+            "transitions": list(self.transitions),
+            "duration": round(self.duration, 2),
+            "result": self.result,
+        }
+
+
+# page -> 현재 감시자 (push 콜백이 전달될 대상)
+_watchers: "weakref.WeakKeyDictionary[Any, VideoStatusWatcher]" = weakref.WeakKeyDictionary()
+
+# 바인딩이 등록된 page (expose_function은 page당 한 번만 등록 가능)
+_bound_pages: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+class VideoStatusWatcher:
+    """workspace 스냅샷 push 수신기
+
+    사용 예:
+        watcher = VideoStatusWatcher(page, "sample")
+        await watcher.start()
+        snapshot = await watcher.next_snapshot(timeout=10)   # push 대기
+        snapshot = snapshot or await watcher.poll()          # 폴백
+        video = snapshot.status_for("sample")
+        await watcher.stop()
+    """
+
+    def __init__(self, page, video_name: Optional[str] = None, debounce_ms: int = 100):
+        self._page = page
+        self._video_name = video_name
+        self._debounce_ms = debounce_ms
+        self._queue: "asyncio.Queue[WorkspaceSnapshot]" = asyncio.Queue()
+        self._started_at = time.monotonic()
+        self._last: Optional[str] = None
+        self.stats = VideoStatusStats()
+        get_run_state(page).metrics["video_status"] = self.stats
+
+    def _watch_script(self) -> str:
+        config = {**_snapshot_config(), "binding": _BINDING_NAME, "debounceMs": self._debounce_ms}
+        return _WATCH_SCRIPT % {"config": json.dumps(config), "snapshot_fn": _SNAPSHOT_FN}
+
+    def _observe(self, snapshot: WorkspaceSnapshot, source: str) -> None:
+        """대상 영상 상태가 바뀌었으면 변경 기록 추가"""
+        described = snapshot.status_for(self._video_name).describe()
+        if described == self._last:
+            return
+        self._last = described
+        self.stats.transitions.append({
+            "status": described,
+            "at": round(time.monotonic() - self._started_at, 2),
+            "source": source,
+        })
+
+    async def start(self) -> None:
+        """바인딩 등록 + 현재 문서에 observer 설치
+
+        init script로 등록하지 않으므로 stop() 이후 페이지 이동에는 비용이 들지 않습니다.
+        감시 중 페이지가 이동하면 poll()이 observer를 다시 설치합니다.
+        """
+        if self._page not in _bound_pages:
+            await self._page.expose_function(_BINDING_NAME, _dispatch(self._page))
+            _bound_pages.add(self._page)
+        _watchers[self._page] = self
+        self._started_at = time.monotonic()
+        await self._page.evaluate(self._watch_script())
+
+    async def stop(self) -> None:
+        """observer 해제"""
+        self.stats.duration = time.monotonic() - self._started_at
+        if _watchers.get(self._page) is self:
+            del _watchers[self._page]
+        try:
+            await self._page.evaluate("() => window.__persoStatusWatch && window.__persoStatusWatch.stop()")
+        except Exception:
+            pass
+
+    def _on_push(self, data: dict) -> None:
+        snapshot = WorkspaceSnapshot.from_dict(data)
+        self.stats.pushes += 1
+        self._observe(snapshot, "push")
+        self._queue.put_nowait(snapshot)
+
+    async def next_snapshot(self, timeout: float) -> Optional[WorkspaceSnapshot]:
+        """다음 push 스냅샷 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            WorkspaceSnapshot: push된 스냅샷 (timeout 안에 push가 없으면 None)
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def poll(self) -> WorkspaceSnapshot:
+        """폴백: 스냅샷을 직접 읽기 (observer가 없으면 다시 설치)"""
+        self.stats.polls += 1
+        snapshot = await snapshot_workspace(self._page)
+        self._observe(snapshot, "poll")
+        if not await self._page.evaluate("() => !!window.__persoStatusWatch"):
+            await self._page.evaluate(self._watch_script())
+        return snapshot
+
+
+def _dispatch(page):
+    """expose_function 콜백 (page의 현재 감시자에게 전달)"""
+    def _callback(data):
+        watcher = _watchers.get(page)
+        if watcher is not None:
+            watcher._on_push(data)
+    return _callback
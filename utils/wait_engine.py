@@ -0,0 +1,251 @@
+# utils/wait_engine.py
+"""조건 기반 대기 엔진
+
+고정 asyncio.sleep 대신 "무엇을 기다리는지"를 명시하는 대기 함수 모음입니다.
+조건이 만족되는 즉시 반환하므로 화면이 빨리 준비되면 그만큼 빨리 진행합니다.
+
+- wait_for_visible / wait_for_hidden: 요소 상태
+- wait_for_url: URL 변경
+- wait_for_load_state: 페이지 로드 상태 (networkidle 등)
+- wait_for_response: 동작 직후의 네트워크 응답
+- wait_for_dom_quiet: DOM 변경이 quiet_ms 동안 없을 때 (렌더링/애니메이션 안정화)
+
+타임아웃은 진행 중인 단계(utils.steps.run_step)의 남은 마감 시간과 실행 제한 시간
+(utils.cancellation.CancelToken)을 넘지 않도록 줄어들고,
+대기 시간은 단계 기록에 누적됩니다. 조건이 만족되면 True(또는 응답 객체),
+타임아웃이면 False(또는 None)를 반환하며 실패 처리는 호출하는 쪽에서 결정합니다.
+단계 마감 시간이 이미 지났으면 StepDeadlineExceeded를, 실행이 취소되었으면
+RunCancelled를 발생시킵니다.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.cancellation import check_cancelled
+from utils.run_state import get_run_state
+from utils.steps import StepDeadlineExceeded
+
+# DOM 변경이 quietMs 동안 없으면 true, timeoutMs 안에 조용해지지 않으면 false
+_DOM_QUIET_SCRIPT = '''
+({quietMs, timeoutMs}) => new Promise(resolve => {
+    let quietTimer = null;
+    let hardTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    const done = (quiet) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve(quiet);
+    };
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true,
+    });
+    quietTimer = setTimeout(() => done(true), quietMs);
+    hardTimer = setTimeout(() => done(false), timeoutMs);
+})
+'''
+
+
+def clamp_timeout(page, timeout: float) -> float:
+    """단계/실행 남은 시간에 맞춰 타임아웃(ms) 조정
+
+    대기 시작 전 안전 지점이기도 합니다.
+
+    Raises:
+        RunCancelled: 실행이 취소된 경우
+        StepDeadlineExceeded: 단계 마감 시간이 지난 경우
+    """
+    check_cancelled(page)
+    state = get_run_state(page)
+
+    if state.cancel_token is not None:
+        remaining = state.cancel_token.remaining()
+        if remaining is not None:
+            timeout = min(timeout, max(remaining, 0) * 1000)
+
+    step = state.current_step
+    if step is None:
+        return timeout
+    remaining = step.remaining()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise StepDeadlineExceeded(f"'{step.name}' 단계 마감 시간 초과")
+    return min(timeout, remaining * 1000)
+
+
+def record_wait(page, label: str, start: float, met: bool) -> None:
+    """진행 중인 단계에 대기 시간 기록 (start는 time.monotonic 값)"""
+    step = get_run_state(page).current_step
+    if step is not None:
+        step.record_wait(label, time.monotonic() - start, met)
+
+
+async def _wait_for_state(page, target, state: str, timeout: float, label: Optional[str]) -> bool:
+    locator = page.locator(target).first if isinstance(target, str) else target
+    label = label or f"{state}: {target if isinstance(target, str) else locator}"
+    timeout = clamp_timeout(page, timeout)
+
+    start = time.monotonic()
+    try:
+        await locator.wait_for(state=state, timeout=timeout)
+        met = True
+    except PlaywrightTimeoutError:
+        met = False
+    record_wait(page, label, start, met)
+    return met
+
+
+async def wait_for_visible(page, target: Union[str, Any], timeout: float = 5000,
+                           label: Optional[str] = None) -> bool:
+    """요소가 보일 때까지 대기
+
+    Args:
+        page: Playwright page 객체
+        target: selector 문자열 또는 Locator
+        timeout: 최대 대기 시간 (ms)
+        label: 계측용 대기 이름 (optional)
+
+    Returns:
+        bool: 요소가 보이면 True, 타임아웃이면 False
+    """
+    return await _wait_for_state(page, target, "visible", timeout, label)
+
+
+async def wait_for_hidden(page, target: Union[str, Any], timeout: float = 5000,
+                          label: Optional[str] = None) -> bool:
+    """요소가 사라질 때까지 대기 (없는 요소는 즉시 True)
+
+    Args:
+        page: Playwright page 객체
+        target: selector 문자열 또는 Locator
+        timeout: 최대 대기 시간 (ms)
+        label: 계측용 대기 이름 (optional)
+
+    Returns:
+        bool: 요소가 사라지면 True, 타임아웃이면 False
+    """
+    return await _wait_for_state(page, target, "hidden", timeout, label)
+
+
+async def wait_for_url(page, url: Any, timeout: float = 10000,
+                       label: Optional[str] = None) -> bool:
+    """URL이 패턴과 일치할 때까지 대기
+
+    Args:
+        page: Playwright page 객체
+        url: glob 문자열, 정규식 또는 predicate (page.wait_for_url과 동일)
+        timeout: 최대 대기 시간 (ms)
+        label: 계측용 대기 이름 (optional)
+
+    Returns:
+        bool: URL이 일치하면 True, 타임아웃이면 False
+    """
+    label = label or f"url: {url}"
+    timeout = clamp_timeout(page, timeout)
+
+    start = time.monotonic()
+    try:
+        await page.wait_for_url(url, timeout=timeout)
+        met = True
+    except PlaywrightTimeoutError:
+        met = False
+    record_wait(page, label, start, met)
+    return met
+
+
+async def wait_for_load_state(page, state: str = "load", timeout: float = 30000,
+                              label: Optional[str] = None) -> bool:
+    """페이지가 로드 상태에 도달할 때까지 대기
+
+    Args:
+        page: Playwright page 객체
+        state: "load" | "domcontentloaded" | "networkidle"
+        timeout: 최대 대기 시간 (ms)
+        label: 계측용 대기 이름 (optional)
+
+    Returns:
+        bool: 상태에 도달하면 True, 타임아웃이면 False
+    """
+    label = label or f"load state: {state}"
+    timeout = clamp_timeout(page, timeout)
+
+    start = time.monotonic()
+    try:
+        await page.wait_for_load_state(state, timeout=timeout)
+        met = True
+    except PlaywrightTimeoutError:
+        met = False
+    record_wait(page, label, start, met)
+    return met
+
+
+async def wait_for_response(page, predicate: Any, action: Callable[[], Awaitable[Any]],
+                            timeout: float = 10000, label: Optional[str] = None):
+    """동작을 실행하고 그 동작이 일으킨 네트워크 응답 대기
+
+    응답을 놓치지 않도록 대기를 먼저 걸어둔 뒤 action을 실행합니다.
+    action 실행 시간은 동작 시간으로, 이후 응답까지의 시간만 대기 시간으로 기록됩니다.
+    action 자체의 타임아웃(버튼 없음/비활성 등)은 그대로 전파됩니다.
+
+    Args:
+        page: Playwright page 객체
+        predicate: URL glob/정규식 또는 Response를 받는 predicate
+        action: 실행할 동작 (인자 없는 코루틴 함수, 예: button.click)
+        timeout: 최대 대기 시간 (ms)
+        label: 계측용 대기 이름 (optional)
+
+    Returns:
+        Response: 일치한 응답 (응답 대기 타임아웃이면 None)
+    """
+    label = label or "response"
+    timeout = clamp_timeout(page, timeout)
+
+    start = None
+    try:
+        async with page.expect_response(predicate, timeout=timeout) as response_info:
+            await action()
+            start = time.monotonic()
+        response = await response_info.value
+    except PlaywrightTimeoutError:
+        if start is None:
+            raise
+        response = None
+    record_wait(page, label, start, response is not None)
+    return response
+
+
+async def wait_for_dom_quiet(page, quiet_ms: int = 300, timeout: float = 5000,
+                             label: Optional[str] = None) -> bool:
+    """DOM 변경이 quiet_ms 동안 없을 때까지 대기
+
+    모달 렌더링, 드롭다운 애니메이션처럼 기다릴 특정 요소가 없는 경우에 사용합니다.
+    대기 중 페이지가 이동하면 False를 반환합니다.
+
+    Args:
+        page: Playwright page 객체
+        quiet_ms: 변경이 없어야 하는 시간 (ms)
+        timeout: 최대 대기 시간 (ms)
+        label: 계측용 대기 이름 (optional)
+
+    Returns:
+        bool: 안정화되면 True, 타임아웃/페이지 이동이면 False
+    """
+    label = label or f"dom_quiet: {quiet_ms}ms"
+    timeout = clamp_timeout(page, timeout)
+
+    start = time.monotonic()
+    try:
+        met = await page.evaluate(_DOM_QUIET_SCRIPT, {"quietMs": quiet_ms, "timeoutMs": timeout})
+    except Exception:
+        # 대기 중 페이지 이동 (execution context destroyed)
+        met = False
+    record_wait(page, label, start, met)
+    return met
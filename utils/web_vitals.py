@@ -0,0 +1,196 @@
+# utils/web_vitals.py
+"""PERSO 페이지 성능 측정 (Navigation Timing, Web Vitals)
+
+이 테스터는 PERSO의 synthetic monitor 역할도 하므로, 매 실행에서 어차피 여는
+/ko/login과 workspace 화면의 프론트엔드 성능을 함께 기록합니다.
+
+- 수집: 컨텍스트 init script가 PerformanceObserver(buffered)로 LCP/CLS/long task를
+  누적하고, collect_web_vitals()가 page.evaluate() 한 번으로 Navigation Timing,
+  FCP, JS 힙 크기와 함께 읽음 (측정 지점마다 수 ms)
+- 측정 지점: 로그인 페이지, 로그인 후 workspace, 번역 테스트의 workspace 확인
+- 결과: run 메트릭 "web_vitals" (run 기록 저장소의 vitals 테이블에도 저장)
+- 단위: 시간은 ms (문서 시작 기준), CLS는 점수, JS 힙은 MB (Chromium 전용)
+- SPA 라우트 이동(history.pushState 등, soft navigation): Navigation Timing/FCP/LCP는 이전 문서
+  (예: 로그인 페이지) 값이므로 None으로 두고, CLS/long task는 라우트 이동 시점부터 다시 셈
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+from utils.run_state import get_run_state
+
+logger = logging.getLogger(__name__)
+
+# 최상위 문서에서만 관찰 (HubSpot 등 iframe 제외), 같은 문서에서 두 번 설치하지 않음
+# 경로가 바뀌는 라우트 이동이면 누적 값을 초기화 (LCP는 새로 기록되지 않으므로 null로 남음)
+_OBSERVER_SCRIPT = """
+(() => {
+  if (window !== window.top || window.__persoVitals) return;
+  const vitals = window.__persoVitals = {
+    lcp: null, cls: 0, longTasks: 0, longTaskMs: 0, routeChangedAt: null, path: location.pathname,
+  };
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry))
+        .observe({type, buffered: true});
+    } catch (e) {}
+  };
+  observe('largest-contentful-paint', (e) => {
+    if (vitals.routeChangedAt === null) vitals.lcp = e.renderTime || e.startTime;
+  });
+  observe('layout-shift', (e) => { if (!e.hadRecentInput) vitals.cls += e.value; });
+  observe('longtask', (e) => { vitals.longTasks += 1; vitals.longTaskMs += e.duration; });
+
+  const onRoute = () => {
+    if (location.pathname === vitals.path) return;
+    Object.assign(vitals, {
+      lcp: null, cls: 0, longTasks: 0, longTaskMs: 0,
+      routeChangedAt: performance.now(), path: location.pathname,
+    });
+  };
+  for (const name of ['pushState', 'replaceState']) {
+    const original = history[name];
+    history[name] = function (...args) {
+      const result = original.apply(this, args);
+      onRoute();
+      return result;
+    };
+  }
+  window.addEventListener('popstate', onRoute);
+})();
+"""
+
+_COLLECT_SCRIPT = """
+() => {
+  const vitals = window.__persoVitals || {};
+  const nav = performance.getEntriesByType('navigation')[0];
+  const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+  const memory = performance.memory;
+  // 라우트 이동 후면 Navigation Timing/FCP는 이전 문서 값
+  const path = (url) => { try { return new URL(url).pathname; } catch (e) { return null; } };
+  const soft = vitals.routeChangedAt != null || (!!nav && path(nav.name) !== location.pathname);
+  const docNav = soft ? null : nav;
+  return {
+    url: location.href,
+    soft_navigation: soft,
+    ttfb: docNav ? docNav.responseStart : null,
+    dom_content_loaded: docNav ? docNav.domContentLoadedEventEnd : null,
+    load: docNav && docNav.loadEventEnd ? docNav.loadEventEnd : null,
+    transfer_size: docNav ? docNav.transferSize : null,
+    fcp: fcp && !soft ? fcp.startTime : null,
+    lcp: vitals.lcp ?? null,
+    cls: vitals.cls ?? null,
+    long_tasks: vitals.longTasks ?? null,
+    long_task_ms: vitals.longTaskMs ?? null,
+    js_heap_mb: memory ? memory.usedJSHeapSize / 1048576 : null,
+  };
+}
+"""
+
+
+@dataclass
+class VitalsSample:
+    """측정 지점 하나의 성능 값 (값을 얻지 못하면 None)
+
+    Attributes:
+        label: 측정 지점 ("login_page" | "workspace" | "workspace_check")
+        url: 측정 시점의 URL
+        soft_navigation: 문서 로드 없이 SPA 라우트 이동으로 온 화면인지
+            (True면 ttfb/fcp/lcp/dom_content_loaded/load/transfer_size는 None,
+            cls/long task는 라우트 이동 시점부터)
+        ttfb: 첫 응답 바이트까지 (ms)
+        fcp: First Contentful Paint (ms)
+        lcp: Largest Contentful Paint (ms, 측정 시점까지의 최댓값)
+        dom_content_loaded: DOMContentLoaded 완료 (ms)
+        load: load 이벤트 완료 (ms)
+        transfer_size: 문서 전송 크기 (바이트)
+        cls: Cumulative Layout Shift (사용자 입력 직후 이동 제외)
+        long_tasks: 50ms 이상 걸린 메인 스레드 작업 수
+        long_task_ms: long task 시간 합계 (ms)
+        js_heap_mb: 사용 중인 JS 힙 (MB)
+    """
+
+    label: str
+    url: str
+    soft_navigation: bool = False
+    ttfb: Optional[float] = None
+    fcp: Optional[float] = None
+    lcp: Optional[float] = None
+    dom_content_loaded: Optional[float] = None
+    load: Optional[float] = None
+    transfer_size: Optional[int] = None
+    cls: Optional[float] = None
+    long_tasks: Optional[int] = None
+    long_task_ms: Optional[float] = None
+    js_heap_mb: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            key: round(value, 4 if key == "cls" else 1) if isinstance(value, float) else value
+            for key, value in asdict(self).items()
+        }
+
+
+@dataclass
+class WebVitalsReport:
+    """실행 하나의 성능 측정 결과 (run_state.metrics["web_vitals"])
+
+    Attributes:
+        samples: 측정 지점별 값 (측정 순서)
+        collect_seconds: 측정에 쓴 시간 합계 (초)
+    """
+
+    samples: List[VitalsSample] = field(default_factory=list)
+    collect_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "samples": [s.to_dict() for s in self.samples],
+            "collect_seconds": round(self.collect_seconds, 3),
+        }
+
+
+async def install_web_vitals(context) -> None:
+    """컨텍스트에 성능 관찰 스크립트 설치 (create_browser_context에서 WEB_VITALS_ENABLED일 때)"""
+    await context.add_init_script(script=_OBSERVER_SCRIPT)
+    get_run_state(context).metrics["web_vitals"] = WebVitalsReport()
+
+
+async def collect_web_vitals(page, label: str, log=None) -> Optional[VitalsSample]:
+    """현재 문서의 성능 값 기록 (설치되지 않았으면 아무것도 하지 않음)
+
+    측정 실패는 테스트 결과에 영향을 주지 않습니다.
+
+    Args:
+        page: Playwright page 객체
+        label: 측정 지점 이름
+        log: 로그 출력 함수 (optional)
+
+    Returns:
+        VitalsSample: 측정 값 (설치되지 않았거나 실패하면 None)
+    """
+    report = get_run_state(page).metrics.get("web_vitals")
+    if not isinstance(report, WebVitalsReport):
+        return None
+
+    started = time.monotonic()
+    try:
+        values = await page.evaluate(_COLLECT_SCRIPT)
+    except Exception as e:
+        logger.warning(f"⚠️ 성능 측정 실패 ({label}): {e}")
+        return None
+    finally:
+        report.collect_seconds += time.monotonic() - started
+
+    sample = VitalsSample(label=label, **values)
+    report.samples.append(sample)
+    if log:
+        lcp = f"{sample.lcp:.0f}ms" if sample.lcp is not None else "-"
+        cls = f"{sample.cls:.3f}" if sample.cls is not None else "-"
+        soft = " (라우트 이동)" if sample.soft_navigation else ""
+        log(f"  📈 성능 ({label}){soft}: LCP {lcp}, CLS {cls}, long task {sample.long_tasks or 0}개")
+    return sample